@@ -0,0 +1,67 @@
+"""
+Measure the speedup of the parallel batch statistics runner.
+
+Builds a synthetic corpus of habits files (one per user) in a temp
+directory, then reports on it with 1 worker and with --workers workers.
+
+Run from the project root:
+    python benchmarks/bench_batch.py [--files 40] [--habits 50] [--years 5] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generator import make_data
+
+from habit_tracker import batch
+from habit_tracker.storage.json_backend import encode_document
+
+
+def make_corpus(directory, n_files, n_habits, years):
+    paths = []
+    for index in range(n_files):
+        path = directory / f"user{index:04d}.json"
+        path.write_bytes(encode_document(make_data(n_habits, years, seed=index)))
+        paths.append(path)
+    return paths
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--habits", type=int, default=50)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(Path(tmp), args.files, args.habits, args.years)
+        print(f"{args.files} files x {args.habits} habits x {args.years} years, {os.cpu_count()} CPUs\n")
+
+        scenarios = [
+            ("per file", paths),
+            ("per habit (one file)", paths[:1]),
+        ]
+        for label, scenario_paths in scenarios:
+            serial, serial_time = timed(lambda: batch.run_batch(scenario_paths, workers=1))
+            parallel, parallel_time = timed(lambda: batch.run_batch(scenario_paths, workers=args.workers))
+            check = "" if parallel == serial else "  RESULTS DIFFER"
+            print(
+                f"   {label:22} 1 worker {serial_time:7.2f} s   {args.workers} workers {parallel_time:7.2f} s"
+                f"  ({serial_time / parallel_time:4.1f}x){check}"
+            )
+
+
+if __name__ == "__main__":
+    main()
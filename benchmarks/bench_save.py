@@ -0,0 +1,68 @@
+"""
+Compare save latency of the original save path with the atomic, compact one.
+
+Run from the project root:
+    python benchmarks/bench_save.py [--habits 500] [--years 5] [--repeat 5]
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from generator import make_data
+
+from habit_tracker import config
+from habit_tracker.storage.json_backend import JsonBackend, encode_value
+
+
+def legacy_save(path, data):
+    """The original save path: truncate in place and stream indented JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=encode_value)
+
+
+def time_it(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=500)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_data(args.habits, args.years)
+    total = sum(len(h.completed_days) for h in data["habits"])
+    print(f"{args.habits} habits, {total} completions, best of {args.repeat}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "habits.json"
+        backend = JsonBackend(path, Path(tmp) / "habits.journal")
+
+        variants = [
+            ("indent=2 (original format)", 2, False, False),
+            ("compact", None, False, False),
+            ("compact + bitmap days", None, False, True),
+            ("compact + gzip", None, True, False),
+            ("compact + bitmap + gzip", None, True, True),
+        ]
+
+        legacy = time_it(lambda: legacy_save(path, data), args.repeat)
+        print(f"   {'original in-place save':36} {legacy * 1000:8.1f} ms  {path.stat().st_size / 1024:9.0f} KiB")
+
+        for label, indent, use_gzip, bitmap in variants:
+            config.JSON_INDENT, config.GZIP_DATA, config.COMPACT_COMPLETIONS = indent, use_gzip, bitmap
+            elapsed = time_it(lambda: backend.save(data), args.repeat)
+            size = path.stat().st_size
+            print(f"   {'atomic, ' + label:36} {elapsed * 1000:8.1f} ms  {size / 1024:9.0f} KiB  ({legacy / elapsed:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compare the pure-Python and NumPy statistics engines.
+
+Run from the project root (the NumPy engine needs numpy installed):
+    python benchmarks/bench_stats.py [--habits 2000] [--years 20] [--repeat 3]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bench_save import time_it
+from generator import make_data
+
+from habit_tracker import config
+from habit_tracker.analysis import numpy_engine, statistics
+from habit_tracker.models.streak_state import StreakState
+
+
+def rebuild_streaks(data):
+    return [StreakState.compute(habit).to_dict() for habit in data["habits"]]
+
+
+def weekly_summary(data):
+    # iter_weekly_summary rather than statistics.weekly_summary: the latter goes
+    # through the stats cache, whose keys don't depend on the engine
+    return dict(statistics.iter_weekly_summary(data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not numpy_engine.available():
+        sys.exit("NumPy is not installed: pip install numpy")
+
+    data = make_data(args.habits, args.years)
+    total = sum(len(h.completed_days) for h in data["habits"])
+    print(f"{args.habits} habits, {total} completions, best of {args.repeat}\n")
+
+    scenarios = [
+        ("streaks (full rebuild)", lambda: rebuild_streaks(data)),
+        ("weekly summary", lambda: weekly_summary(data)),
+    ]
+
+    for label, fn in scenarios:
+        config.STATS_ENGINE = "python"
+        python_time = time_it(fn, args.repeat)
+        expected = fn()
+
+        config.STATS_ENGINE = "numpy"
+        numpy_time = time_it(fn, args.repeat)
+        check = "" if fn() == expected else "  RESULTS DIFFER"
+
+        print(
+            f"   {label:24} python {python_time * 1000:8.1f} ms   numpy {numpy_time * 1000:8.1f} ms"
+            f"  ({python_time / numpy_time:4.1f}x){check}"
+        )
+
+
+if __name__ == "__main__":
+    main()
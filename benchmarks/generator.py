@@ -0,0 +1,68 @@
+"""
+Seeded synthetic habit data for the benchmarks.
+
+The same (n_habits, years, seed) always produces the same habits. Completion
+bitmaps are drawn as random bytes rather than day by day; for the large
+presets most of the build time is HabitData computing its rollups, just as
+when an old data file without stored rollups is loaded.
+"""
+import random
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from habit_tracker.models.day_set import DaySet
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData
+
+# name -> (habits, years)
+PRESETS = {
+    "tiny": (10, 1),
+    "small": (100, 2),
+    "medium": (1_000, 5),
+    "large": (10_000, 20),
+    "huge": (100_000, 20),
+}
+
+# Completion rates as random-bit levels: k > 0 ANDs k random bitmaps
+# (rate 1/2**k), k < 0 ORs -k of them (rate 1 - 1/2**-k)
+RATE_LEVELS = (4, 2, 1, 1, -2, -3)
+
+FREQUENCIES = (("daily", 1), ("daily", 1), ("weekly", 1), ("weekly", 3), ("weekly", 5), ("monthly", 1), ("monthly", 10))
+
+
+def random_bits(rng, n_bits, level):
+    n_bytes = (n_bits + 7) // 8
+    bits = int.from_bytes(rng.randbytes(n_bytes), "little")
+    for _ in range(abs(level) - 1):
+        other = int.from_bytes(rng.randbytes(n_bytes), "little")
+        bits = bits & other if level > 0 else bits | other
+    bits &= (1 << n_bits) - 1
+    return bits.to_bytes(n_bytes, "little")
+
+
+def make_habit(rng, habit_id, first_day, n_days):
+    # Habits start at different points in the first half of the period
+    offset = rng.randrange(n_days // 2 + 1)
+    bits = random_bits(rng, n_days - offset, rng.choice(RATE_LEVELS))
+    freq_type, times = rng.choice(FREQUENCIES)
+    return Habit(
+        habit_id, f"habit {habit_id}", "", freq_type, times,
+        DaySet.from_bitmap(first_day + offset, bits),
+    )
+
+
+def make_data(n_habits, years, seed=42, end=None):
+    """Return HabitData with n_habits habits covering `years` years up to end (default today)."""
+    rng = random.Random(seed)
+    n_days = 365 * years
+    first_day = (end or date.today()).toordinal() - n_days + 1
+    habits = [make_habit(rng, habit_id, first_day, n_days) for habit_id in range(1, n_habits + 1)]
+    return HabitData({"next_id": n_habits + 1, "habits": habits})
+
+
+def preset(name, seed=42):
+    n_habits, years = PRESETS[name]
+    return make_data(n_habits, years, seed)
@@ -0,0 +1,202 @@
+"""
+Load-test the HTTP API server with many concurrent keep-alive clients.
+
+Without --url, a server is started in a subprocess on a synthetic dataset
+in a temp directory. Each client loops over a mix of reads (habit details,
+completions, statistics) and check-ins for --seconds, then requests per
+second, latency percentiles and errors are reported per request kind.
+
+Run from the project root:
+    python benchmarks/load_test.py [--clients 50] [--seconds 10] [--habits 200] [--years 2] [--writes 0.1]
+    python benchmarks/load_test.py --url http://127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from generator import make_data
+
+from habit_tracker.storage.json_backend import encode_document
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+SERVER_SCRIPT = """
+import sys
+from pathlib import Path
+sys.path.insert(0, {src!r})
+from habit_tracker import config
+from habit_tracker.utils import logger
+tmp = Path({tmp!r})
+config.DATA_PATH, config.JOURNAL_PATH = tmp / "habits.json", tmp / "habits.journal"
+logger.configure_console(level=logger.logging.WARNING)
+from habit_tracker import server
+server.run("127.0.0.1", {port})
+"""
+
+# =========================
+# Server
+# =========================
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(n_habits, years, tmp):
+    (tmp / "habits.json").write_bytes(encode_document(make_data(n_habits, years)))
+    port = free_port()
+    script = SERVER_SCRIPT.format(src=str(SRC), tmp=str(tmp), port=port)
+    process = subprocess.Popen([sys.executable, "-c", script])
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, port
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise SystemExit("server did not start")
+
+# =========================
+# Client
+# =========================
+
+async def request(reader, writer, host, method, path, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+def next_request(rng, habit_ids, write_share, days):
+    """Pick (kind, method, path, payload) from the request mix."""
+    habit_id = rng.choice(habit_ids)
+    if rng.random() < write_share:
+        return "done", "POST", f"/habits/{habit_id}/done", {"date": rng.choice(days)}
+
+    kind = rng.choice(("habit", "habit", "completions", "list", "overview", "streaks", "weekly"))
+    if kind == "habit":
+        return kind, "GET", f"/habits/{habit_id}", None
+    if kind == "completions":
+        return kind, "GET", f"/habits/{habit_id}/completions?from={days[0]}", None
+    if kind == "list":
+        return kind, "GET", "/habits", None
+    if kind == "weekly":
+        return kind, "GET", f"/stats/weekly?since={days[0]}&top=5", None
+    return kind, "GET", f"/stats/{kind}", None
+
+async def client(host, port, seed, stop_at, habit_ids, write_share, days, latencies, errors):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            kind, method, path, payload = next_request(rng, habit_ids, write_share, days)
+            t0 = time.perf_counter()
+            status = await request(reader, writer, host, method, path, payload)
+            latencies[kind].append(time.perf_counter() - t0)
+            if status >= 400:
+                errors[kind] += 1
+    finally:
+        writer.close()
+
+async def load(host, port, clients, seconds, write_share):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /habits HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    response = await reader.read()
+    writer.close()
+    habit_ids = [h["id"] for h in json.loads(response.split(b"\r\n\r\n", 1)[1])]
+    if not habit_ids:
+        raise SystemExit("the server has no habits to test with")
+
+    # Check-ins go to the last 90 days, so some are new and some already done
+    days = [(date.today() - timedelta(days=n)).isoformat() for n in range(90, -1, -1)]
+    latencies, errors = defaultdict(list), defaultdict(int)
+    stop_at = time.perf_counter() + seconds
+    await asyncio.gather(*(
+        client(host, port, seed, stop_at, habit_ids, write_share, days, latencies, errors)
+        for seed in range(clients)
+    ))
+    return latencies, errors
+
+# =========================
+# Report
+# =========================
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def report(latencies, errors, seconds):
+    print(f"   {'request':12} {'count':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    everything = []
+    for kind in sorted(latencies):
+        values = sorted(latencies[kind])
+        everything.extend(values)
+        print(
+            f"   {kind:12} {len(values):8} {len(values) / seconds:8.0f} {percentile(values, 0.5) * 1000:8.2f}"
+            f" {percentile(values, 0.95) * 1000:8.2f} {percentile(values, 0.99) * 1000:8.2f} {errors[kind]:7}"
+        )
+    everything.sort()
+    if everything:
+        print(
+            f"   {'total':12} {len(everything):8} {len(everything) / seconds:8.0f} {percentile(everything, 0.5) * 1000:8.2f}"
+            f" {percentile(everything, 0.95) * 1000:8.2f} {percentile(everything, 0.99) * 1000:8.2f} {sum(errors.values()):7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--habits", type=int, default=200)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--writes", type=float, default=0.1, help="share of requests that are check-ins")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        process = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            process, port = start_server(args.habits, args.years, Path(tmp))
+            host = "127.0.0.1"
+            print(f"Server: {args.habits} habits x {args.years} years on port {port}")
+
+        try:
+            print(f"{args.clients} clients for {args.seconds:g}s, {args.writes:.0%} check-ins\n")
+            latencies, errors = asyncio.run(load(host, port, args.clients, args.seconds, args.writes))
+            report(latencies, errors, args.seconds)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
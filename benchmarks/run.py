@@ -0,0 +1,259 @@
+"""
+Benchmark suite for the load, save and statistics hot paths.
+
+Every scenario runs on seeded synthetic data (see generator.py) and reports
+its best time and its peak memory (tracemalloc). Results are compared with
+benchmarks/baseline.json; the run fails if a scenario got slower or uses more
+memory than the baseline by more than --tolerance.
+
+Run from the project root:
+    python benchmarks/run.py                          # tiny, small and medium
+    python benchmarks/run.py --sizes large --only streak
+    python benchmarks/run.py --update-baseline        # after an intended change
+
+Timings depend on the machine: refresh the baseline when you switch machines.
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+from generator import PRESETS, preset
+
+from habit_tracker import config, data_store
+from habit_tracker.analysis import statistics
+from habit_tracker.habit_crud import mark_done
+from habit_tracker.repository import repository
+from habit_tracker.utils import logger
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = ("tiny", "small", "medium")
+
+# Differences below these are noise, whatever the percentage
+MIN_SECONDS_DELTA = 0.005
+MIN_KIB_DELTA = 256
+
+# =========================
+# Scenarios
+# =========================
+# Each scenario takes the dataset and returns the function to time. Setup
+# done before returning is not measured.
+
+SCENARIOS = {}
+
+def scenario(name):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+def use_fresh_backend():
+    data_store.reset_backend()
+    repository.invalidate()
+
+def close_backend():
+    """Flush and close the scenario's store before its directory is removed."""
+    repository.invalidate()
+    close = getattr(data_store.get_backend(), "close", None)
+    if close is not None:
+        close()
+
+
+@scenario("load_habits")
+def bench_load(data):
+    data_store.save_habits(data)
+
+    def run():
+        use_fresh_backend()
+        data_store.load_habits()
+    return run
+
+@scenario("save_habits")
+def bench_save(data):
+    return lambda: data_store.save_habits(data)
+
+@scenario("find_habit_by_id")
+def bench_find(data):
+    rng = random.Random(1)
+    ids = [rng.randint(1, data["next_id"] - 1) for _ in range(100_000)]
+
+    def run():
+        for habit_id in ids:
+            data_store.find_habit_by_id(data, habit_id)
+    return run
+
+@scenario("mark_habit_done")
+def bench_mark_done(data):
+    data_store.save_habits(data)
+    use_fresh_backend()
+    session = repository.get()
+
+    habits = random.Random(2).sample(session["habits"], min(200, len(session["habits"])))
+    day = [date.today()]
+
+    def run():
+        # A new day each round, so every call records a completion
+        day[0] += timedelta(days=1)
+        target = day[0].isoformat()
+        for habit in habits:
+            mark_done(habit, target)
+    return run
+
+@scenario("mark_habit_done (write-behind)")
+def bench_mark_done_batched(data):
+    run = bench_mark_done(data)
+
+    def batched():
+        # As in an interactive session: stored in batches, flushed on leaving the menu
+        repository.write_behind = True
+        try:
+            run()
+            repository.flush()
+        finally:
+            repository.write_behind = False
+    return batched
+
+def streak_scenario(name, fn, rebuild=False):
+    @scenario(name)
+    def bench(data):
+        def run():
+            for habit in data["habits"]:
+                if rebuild:
+                    habit.streak = None         # force the full-history path
+                fn(habit)
+        return run
+
+for _name in ("daily_streak", "weekly_streak", "monthly_streak",
+              "best_daily_streak", "best_weekly_streak", "best_monthly_streak"):
+    streak_scenario(_name, getattr(statistics, _name))
+streak_scenario("current_streak (rebuild)", statistics.current_streak, rebuild=True)
+streak_scenario("best_streak (rebuild)", statistics.best_streak, rebuild=True)
+streak_scenario("current_streak (stored)", statistics.current_streak)
+
+@scenario("weekly_summary")
+def bench_weekly(data):
+    def run():
+        statistics.get_stats_cache().clear()
+        statistics.weekly_summary(data)
+    return run
+
+@scenario("habit_blocks")
+def bench_blocks(data):
+    habits = data["habits"][:100]
+
+    def run():
+        statistics.get_stats_cache().clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for habit in habits:
+                statistics.habit_blocks(habit, months=3)
+    return run
+
+# =========================
+# Measuring
+# =========================
+
+def measure(run, repeat):
+    """Return (best seconds, peak KiB). Memory is traced in a separate run."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1024
+
+def compare(result, base, tolerance):
+    """Return the regressions of result against base as messages."""
+    problems = []
+    if base is None:
+        return problems
+
+    seconds, base_seconds = result["seconds"], base["seconds"]
+    if seconds > base_seconds * (1 + tolerance) and seconds - base_seconds > MIN_SECONDS_DELTA:
+        problems.append(f"time {base_seconds * 1000:.1f} -> {seconds * 1000:.1f} ms")
+
+    kib, base_kib = result["peak_kib"], base["peak_kib"]
+    if kib > base_kib * (1 + tolerance) and kib - base_kib > MIN_KIB_DELTA:
+        problems.append(f"memory {base_kib:.0f} -> {kib:.0f} KiB")
+    return problems
+
+# =========================
+# Main
+# =========================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help=f"comma-separated, from: {', '.join(PRESETS)}")
+    parser.add_argument("--only", help="run only scenarios whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown / memory growth (0.25 = 25%%)")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in PRESETS]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    logger.configure_console(level=logger.logging.WARNING)
+    config.STORAGE_BACKEND = args.backend
+    config.STATS_CACHE_PERSIST = False
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results, failures = {}, []
+
+    for size in sizes:
+        n_habits, years = PRESETS[size]
+        print(f"\n{size}: {n_habits} habits, {years} years ({args.backend})")
+
+        for name, make_run in SCENARIOS.items():
+            if args.only and args.only not in name:
+                continue
+
+            # Each scenario gets its own copy of the data and its own files
+            with tempfile.TemporaryDirectory() as tmp:
+                tmp = Path(tmp)
+                config.DATA_PATH, config.JOURNAL_PATH, config.SQLITE_PATH = tmp / "habits.json", tmp / "habits.journal", tmp / "habits.db"
+                use_fresh_backend()
+
+                run = make_run(preset(size))
+                seconds, peak_kib = measure(run, args.repeat)
+                close_backend()
+
+            key = f"{args.backend}/{size}/{name}"
+            results[key] = {"seconds": round(seconds, 6), "peak_kib": round(peak_kib, 1)}
+            problems = compare(results[key], baseline.get(key), args.tolerance)
+            failures.extend(f"{key}: {p}" for p in problems)
+
+            status = "REGRESSION" if problems else ("new" if key not in baseline else "ok")
+            print(f"   {name:26} {seconds * 1000:10.2f} ms {peak_kib:10.0f} KiB   {status}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline updated: {BASELINE_PATH}")
+        return 0
+
+    if failures:
+        print("\nRegressions against the baseline:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Measure how long the program takes to start.
+
+Each scenario starts a fresh interpreter on a small synthetic dataset in a
+temp directory through the habit-tracker entry point (habit_tracker.__main__),
+with the paths pointed at the temp directory first: the time to the main
+menu's first prompt, and the full run time of a few command-line calls as
+scripts make them. The median over
+--repeat runs is compared with a bare `python -c pass`; the difference is
+what the program itself costs. The run fails if the time to the first
+prompt exceeds that of the bare interpreter by more than --target-ms.
+
+With --importtime, every scenario is run once more under `python -X importtime`
+and the modules that took longest to import are listed.
+
+Run from the project root:
+    python benchmarks/startup.py [--repeat 15] [--target-ms 80] [--importtime] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from generator import preset
+
+from habit_tracker.storage.json_backend import encode_document
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+PROMPT = b"Choose an option"
+
+SETUP = """
+import sys
+from pathlib import Path
+sys.path.insert(0, {src!r})
+from habit_tracker import config
+tmp = Path({tmp!r})
+config.PROJECT_ROOT = tmp
+config.DATA_PATH, config.JOURNAL_PATH = tmp / "habits.json", tmp / "habits.journal"
+sys.argv = ["habit-tracker", *{args!r}]
+from habit_tracker.__main__ import run
+run()
+"""
+
+# name -> command-line arguments (None: bare interpreter); menu scenarios are timed to the first prompt
+SCENARIOS = {
+    "python -c pass": None,
+    "menu: first prompt": [],
+    "cli: list --json": ["list", "--json"],
+    "cli: done": ["done", "1", "--date", "2000-01-01"],
+    "cli: stats streaks": ["stats", "streaks"],
+}
+
+# =========================
+# Runs
+# =========================
+
+def command(name, tmp, flags=()):
+    args = SCENARIOS[name]
+    script = "pass" if args is None else SETUP.format(src=str(SRC), tmp=str(tmp), args=args)
+    return [sys.executable, *flags, "-c", script]
+
+def run_once(name, tmp):
+    """Seconds until the first prompt (menu) or until the process exits."""
+    t0 = time.perf_counter()
+    process = subprocess.Popen(
+        command(name, tmp), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    if not name.startswith("menu"):
+        process.communicate()
+        elapsed = time.perf_counter() - t0
+    else:
+        output = b""
+        while PROMPT not in output:
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if not chunk:
+                raise SystemExit(f"{name}: exited before showing the prompt")
+            output += chunk
+        elapsed = time.perf_counter() - t0
+        process.communicate(b"0\n")     # Exit
+    if process.returncode:
+        raise SystemExit(f"{name}: exited with status {process.returncode}")
+    return elapsed
+
+def import_times(name, tmp, top):
+    """The top modules by self time as (self µs, cumulative µs, module) from -X importtime."""
+    process = subprocess.run(
+        command(name, tmp, ("-X", "importtime")), input=b"0\n", stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    rows = []
+    for line in process.stderr.decode("utf-8", "replace").splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    total = sum(row[0] for row in rows)
+    return total, sorted(rows, reverse=True)[:top]
+
+
+def measure(args, tmp):
+    """Print the median times (and import times) of the scenarios; 1 if the target is missed."""
+    (tmp / "habits.json").write_bytes(encode_document(preset("tiny")))
+
+    medians = {}
+    print(f"   {'scenario':22} {'median ms':>10} {'min ms':>8} {'program ms':>11}")
+    for name in SCENARIOS:
+        run_once(name, tmp)            # warm the OS file cache and .pyc files
+        times = [run_once(name, tmp) for _ in range(args.repeat)]
+        medians[name] = statistics.median(times)
+        own = medians[name] - medians["python -c pass"]
+        print(f"   {name:22} {medians[name] * 1000:10.1f} {min(times) * 1000:8.1f} {own * 1000:11.1f}")
+
+    if args.importtime:
+        for name in SCENARIOS:
+            if SCENARIOS[name] is None:
+                continue
+            total, rows = import_times(name, tmp, args.top)
+            print(f"\n   {name}: {total / 1000:.1f} ms importing")
+            print(f"   {'self ms':>9} {'cumul. ms':>9}  module")
+            for self_us, cumulative_us, module in rows:
+                print(f"   {self_us / 1000:9.2f} {cumulative_us / 1000:9.2f}  {module}")
+
+    overhead = (medians["menu: first prompt"] - medians["python -c pass"]) * 1000
+    if overhead > args.target_ms:
+        print(f"\nFAILED: first prompt after {overhead:.1f} ms of program startup (target {args.target_ms:g} ms)")
+        return 1
+    print(f"\nOK: first prompt after {overhead:.1f} ms of program startup (target {args.target_ms:g} ms)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--target-ms", type=float, default=80,
+                        help="allowed time to the first prompt on top of a bare interpreter")
+    parser.add_argument("--importtime", action="store_true", help="list the slowest imports of each scenario")
+    parser.add_argument("--top", type=int, default=15, help="modules listed with --importtime")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        return measure(args, Path(tmp))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Stress-test concurrent writers: many processes check habits off (and add
+new habits) in the same store at once, each working from its own, mostly
+outdated, copy of the data. Afterwards every completion and habit written
+must be there exactly once, with unique IDs and the expected version.
+
+Run from the project root:
+    python benchmarks/stress_writes.py [--processes 8] [--writes 200] [--habits 20] [--backend json|sqlite]
+
+Exits with status 1 if anything was lost.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from habit_tracker import config, data_store
+from habit_tracker.habit_crud import build_habit
+from habit_tracker.utils import logger
+
+ADD_SHARE = 0.05        # share of writes that add a habit instead of a completion
+RELOAD_SHARE = 0.05     # share of writes after which a writer reloads on its own
+
+
+def use_store(directory, backend):
+    config.DATA_PATH = directory / "habits.json"
+    config.JOURNAL_PATH = directory / "habits.journal"
+    config.SQLITE_PATH = directory / "habits.db"
+    config.STORAGE_BACKEND = backend
+    data_store.reset_backend()
+    logger.configure_console(level=logger.logging.WARNING)
+
+
+def writer(index, directory, backend, writes, n_habits):
+    """Make `writes` changes; return the (habit ID, day) completions and habit names written."""
+    use_store(directory, backend)
+    rng = random.Random(index)
+    data = data_store.load_habits()     # loaded once; other writers soon make it outdated
+
+    # Days are unique per writer and write, so no two completions coincide
+    first_day = date(2000, 1, 1).toordinal() + index * writes
+    completions, names = [], []
+
+    for n in range(writes):
+        if rng.random() < ADD_SHARE:
+            habit = build_habit(data, f"writer {index} habit {n}")
+            data_store.record_events(data, [{"op": "add", "habit": habit}])
+            names.append(habit.name)
+        else:
+            habit_id = rng.randint(1, n_habits)
+            day = date.fromordinal(first_day + n).isoformat()
+            data_store.record_events(data, [{"op": "done", "id": habit_id, "day": day}])
+            completions.append((habit_id, day))
+
+        if rng.random() < RELOAD_SHARE:
+            data = data_store.load_habits()
+
+    return completions, names
+
+
+def verify(data, seeded, results, total_writes):
+    """Return a list of problems found in the final data."""
+    problems = []
+
+    ids = Counter(h.id for h in data["habits"])
+    problems += [f"habit ID {habit_id} used {count} times" for habit_id, count in ids.items() if count > 1]
+
+    names = Counter(h.name for h in data["habits"])
+    expected_names = [name for _, written in results for name in written]
+    problems += [f"habit '{name}' stored {names[name]} times" for name in expected_names if names[name] != 1]
+
+    missing = [
+        (habit_id, day)
+        for completions, _ in results
+        for habit_id, day in completions
+        if day not in data.by_id[habit_id].completed_days
+    ]
+    problems += [f"completion lost: habit {habit_id} on {day}" for habit_id, day in missing[:20]]
+    if len(missing) > 20:
+        problems.append(f"... {len(missing) - 20} more completions lost")
+
+    expected_version = seeded + total_writes
+    if data["version"] != expected_version:
+        problems.append(f"version {data['version']}, expected {expected_version}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="changes per process")
+    parser.add_argument("--habits", type=int, default=20, help="habits to check off")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            return run(args, Path(tmp))
+        finally:
+            close = getattr(data_store.get_backend(), "close", None)
+            if close is not None:
+                close()
+
+
+def run(args, directory):
+    use_store(directory, args.backend)
+
+    data = data_store.load_habits()
+    data_store.record_events(data, [
+        {"op": "add", "habit": build_habit(data, f"habit {n}")} for n in range(1, args.habits + 1)
+    ])
+    seeded = data["version"]
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        futures = [
+            pool.submit(writer, index, directory, args.backend, args.writes, args.habits)
+            for index in range(args.processes)
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - t0
+
+    data_store.reset_backend()
+    final = data_store.load_habits()
+    total_writes = args.processes * args.writes
+    problems = verify(final, seeded, results, total_writes)
+
+    completions = sum(len(c) for c, _ in results)
+    added = sum(len(n) for _, n in results)
+    print(
+        f"{args.processes} processes x {args.writes} writes ({args.backend}): "
+        f"{completions} completions, {added} new habits in {elapsed:.2f}s "
+        f"({total_writes / elapsed:.0f} writes/s)"
+    )
+    if problems:
+        print("FAILED:")
+        for problem in problems:
+            print(f"   {problem}")
+        return 1
+    print("OK: nothing lost, IDs unique, version", final["version"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+import sys
+
+"""Entry point of the habit-tracker command (and python -m habit_tracker).
+
+Kept apart from main.py so command-line calls don't import the interactive
+menu and its dependencies (colorama) just to be dispatched to cli.
+"""
+
+def run():
+    """Interactive menu without arguments, command-line mode with them."""
+    if len(sys.argv) > 1:
+        from habit_tracker import cli
+        sys.exit(cli.main(sys.argv[1:]))
+
+    from habit_tracker.main import main
+    main()
+
+if __name__ == "__main__":
+    run()
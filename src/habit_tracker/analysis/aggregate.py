@@ -0,0 +1,112 @@
+from collections import Counter
+from datetime import date
+
+# =========================
+# SINGLE-PASS PERIOD AGGREGATION
+# =========================
+# Every statistic works on per-period completion counts. They are built here
+# in one pass over a habit's (sorted) completion ordinals and then shared.
+#
+# Periods are numbered so that consecutive periods have consecutive keys,
+# which makes every streak a run of consecutive integers:
+#   day   -> date ordinal
+#   week  -> ISO week index, (monday ordinal - 1) // 7
+#   month -> year * 12 + month - 1
+
+
+class PeriodCounts:
+    """Completion counts per day, ISO week and month for one habit."""
+
+    __slots__ = ("days", "weeks", "months")
+
+    def __init__(self, days, weeks, months):
+        self.days = days
+        self.weeks = weeks
+        self.months = months
+
+    def for_type(self, frequency_type):
+        """Return the count table matching a habit frequency type."""
+        if frequency_type == "daily":
+            return self.days
+        if frequency_type == "weekly":
+            return self.weeks
+        if frequency_type == "monthly":
+            return self.months
+        raise ValueError(f"Unknown frequency type: {frequency_type}")
+
+
+def aggregate(habit):
+    """Build the day/week/month count tables for a habit in one pass."""
+    days, weeks, months = Counter(), Counter(), Counter()
+
+    month = None
+    next_month_start = 0                # first ordinal after the current month
+
+    for ordinal in habit.completed_days.ordinals():
+        days[ordinal] += 1
+        weeks[(ordinal - 1) // 7] += 1
+
+        # Ordinals arrive sorted, so a date is only built when the month changes
+        if ordinal >= next_month_start:
+            month = month_key(date.fromordinal(ordinal))
+            next_month_start = month_start_ordinal(month + 1)
+        months[month] += 1
+
+    return PeriodCounts(days, weeks, months)
+
+# =========================
+# PERIOD KEYS
+# =========================
+
+def week_key(ordinal):
+    return (ordinal - 1) // 7
+
+def month_key(d):
+    return d.year * 12 + d.month - 1
+
+def period_key(ordinal, frequency_type):
+    """Key of the day/week/month period containing ordinal for a frequency type."""
+    if frequency_type == "daily":
+        return ordinal
+    if frequency_type == "weekly":
+        return week_key(ordinal)
+    if frequency_type == "monthly":
+        return month_key(date.fromordinal(ordinal))
+    raise ValueError(f"Unknown frequency type: {frequency_type}")
+
+def month_start_ordinal(key):
+    return date(key // 12, key % 12 + 1, 1).toordinal()
+
+def week_label(key):
+    """ISO week label such as '2025-W07' for a week key."""
+    year, week, _ = date.fromordinal(key * 7 + 1).isocalendar()
+    return f"{year}-W{week:02d}"
+
+# =========================
+# RUNS
+# =========================
+
+def current_run(counts, times_required):
+    """Length of the qualifying run ending at the latest period with any completion."""
+    if not counts:
+        return 0
+
+    key = max(counts)
+    run = 0
+    while counts.get(key, 0) >= times_required:
+        run += 1
+        key -= 1
+    return run
+
+
+def best_run(counts, times_required):
+    """Length of the longest run of consecutive qualifying periods."""
+    best = current = 0
+    previous = None
+
+    for key in sorted(k for k, count in counts.items() if count >= times_required):
+        current = current + 1 if previous is not None and key == previous + 1 else 1
+        best = max(best, current)
+        previous = key
+
+    return best
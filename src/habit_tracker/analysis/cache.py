@@ -0,0 +1,102 @@
+import json
+from collections import OrderedDict
+
+from habit_tracker.storage import atomic_write
+from habit_tracker.utils import logger
+
+# =========================
+# STATISTICS CACHE
+# =========================
+# Computed statistics keyed by strings that embed habit revisions (see
+# habit_key / data_key), so a changed habit simply produces a new key and
+# its old entries age out of the LRU. Values must be JSON-serializable so
+# the cache can be persisted between runs.
+
+CACHE_VERSION = 1
+
+
+class StatsCache:
+    """LRU cache of computed statistics with hit/miss counters."""
+
+    def __init__(self, max_entries=256, path=None):
+        self.max_entries = max_entries
+        self.path = path                # where load() / save() persist it; None keeps it in memory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._dirty = False
+
+    def get(self, key):
+        """Return the cached value or None, counting a hit or a miss."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self._dirty = True
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+    # ----- Persistence -----
+
+    def load(self):
+        """Read persisted entries from path, if any. A bad file is ignored."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            document = json.loads(self.path.read_text(encoding="utf-8"))
+            if document.get("version") != CACHE_VERSION:
+                return
+            for key, value in document["entries"][-self.max_entries:]:
+                self._entries[key] = value
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable statistics cache %s: %s", self.path, e)
+            self._entries.clear()
+            return
+        logger.debug("Loaded %d cached statistics from %s", len(self._entries), self.path)
+
+    def save(self):
+        """Write the entries to path (least recently used first) if anything changed."""
+        if self.path is None or not self._dirty:
+            return
+        document = {"version": CACHE_VERSION, "entries": list(self._entries.items())}
+        atomic_write(self.path, json.dumps(document, separators=(",", ":")).encode("utf-8"))
+        self._dirty = False
+        logger.debug("Saved %d cached statistics (%d hits, %d misses).", len(self._entries), self.hits, self.misses)
+
+# ----- Keys -----
+
+def habit_key(kind, habit, *args):
+    """Key for a statistic of one habit; changes whenever the habit does."""
+    return ":".join(map(str, (kind, habit.id, habit.revision, *args)))
+
+def data_key(kind, data, *args):
+    """Key for a statistic over all habits; changes when any habit is added, removed or changed."""
+    # hash() of a tuple of ints is stable across runs, unlike hash() of strings
+    fingerprint = hash(tuple((h.id, h.revision) for h in data["habits"]))
+    return ":".join(map(str, (kind, len(data["habits"]), fingerprint, *args)))
@@ -0,0 +1,74 @@
+from calendar import month_name, monthcalendar
+from datetime import date
+
+from colorama import Fore, Style
+
+from habit_tracker.analysis.aggregate import month_key, month_start_ordinal
+
+# =========================
+# CALENDAR RENDERING
+# =========================
+# Block calendars for the habit details screen. The colored glyphs are built
+# once, the completions of the shown range are collected once, and the whole
+# grid is built as one string so it can be written (and cached) in one piece.
+
+BLOCK_FILLED = "█"
+BLOCK_EMPTY = "░"
+
+GLYPH_BLANK = Fore.LIGHTBLACK_EX + BLOCK_EMPTY + Style.RESET_ALL      # outside the month or in the future
+GLYPH_TODAY = Fore.YELLOW + BLOCK_FILLED + Style.RESET_ALL
+GLYPH_DONE = Fore.GREEN + BLOCK_FILLED + Style.RESET_ALL
+GLYPH_MISSED = Fore.RED + BLOCK_FILLED + Style.RESET_ALL
+
+LEGEND = f"   Legend: {GLYPH_DONE} completed   {GLYPH_MISSED} missed   {GLYPH_TODAY} today\n"
+WEEKDAY_HEADER = "   M T W T F S S"
+
+# ----- Month ranges -----
+# Months are (year, month) tuples, listed oldest first.
+
+def month_range(first, last):
+    """All months from first to last, inclusive."""
+    return [
+        (key // 12, key % 12 + 1)
+        for key in range(first[0] * 12 + first[1] - 1, last[0] * 12 + last[1])
+    ]
+
+def last_months(months, today=None):
+    """The last `months` months up to and including the current one."""
+    current = month_key(today or date.today())
+    return [(key // 12, key % 12 + 1) for key in range(current - months + 1, current + 1)]
+
+# ----- Rendering -----
+
+def render_calendar(habit, shown_months, today=None):
+    """Return the block calendars of shown_months as one string."""
+    if not shown_months:
+        return ""
+
+    today = (today or date.today()).toordinal()
+    first = date(*shown_months[0], 1).toordinal()
+    last = month_start_ordinal(month_key(date(*shown_months[-1], 1)) + 1) - 1
+    done = set(habit.completed_days.ordinals(first, last))
+
+    lines = []
+    for year, month in shown_months:
+        lines.append(f"\n   {month_name[month]} {year}")
+        lines.append(WEEKDAY_HEADER)
+
+        day_zero = date(year, month, 1).toordinal() - 1
+        for week in monthcalendar(year, month):
+            cells = []
+            for day in week:
+                ordinal = day_zero + day
+                if day == 0 or ordinal > today:
+                    cells.append(GLYPH_BLANK)
+                elif ordinal == today:
+                    cells.append(GLYPH_TODAY)
+                elif ordinal in done:
+                    cells.append(GLYPH_DONE)
+                else:
+                    cells.append(GLYPH_MISSED)
+            lines.append("   " + " ".join(cells))
+
+    lines.append("")
+    return "\n".join(lines)
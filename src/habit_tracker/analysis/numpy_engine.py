@@ -0,0 +1,166 @@
+from datetime import date
+
+from habit_tracker import config
+from habit_tracker.utils import logger
+
+_numpy = None               # imported by _np() on first use; optional: pip install habit-tracker[numpy]
+
+# =========================
+# NUMPY STATISTICS ENGINE
+# =========================
+# Vectorized streak and weekly summary computations for datasets with
+# thousands of habits and decades of history. Selected with
+# config.STATS_ENGINE = "numpy"; results are identical to the pure-Python
+# path in analysis.aggregate, using the same period keys.
+
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_warned = False
+_missing = False
+
+def _np():
+    """
+    The numpy module, imported on the first call. Importing it takes longer
+    than starting the rest of the program, so this only happens once the
+    NumPy engine is actually used. Raises ImportError if it isn't installed.
+    """
+    global _numpy
+    if _numpy is None:
+        import numpy
+        _numpy = numpy
+    return _numpy
+
+def available():
+    """True if NumPy is installed (importing it if that hasn't happened yet)."""
+    global _missing
+    if not _missing:
+        try:
+            _np()
+        except ImportError:
+            _missing = True
+    return not _missing
+
+def enabled():
+    """True if config selects the NumPy engine and NumPy is installed."""
+    global _warned
+    if config.STATS_ENGINE != "numpy":
+        return False
+    if not available():
+        if not _warned:
+            logger.warning("STATS_ENGINE is 'numpy' but NumPy is not installed. Using the Python engine.")
+            _warned = True
+        return False
+    return True
+
+# =========================
+# ARRAYS
+# =========================
+
+def ordinals(days, first=None, last=None):
+    """
+    Sorted int64 array of the day ordinals in a DaySet, optionally only
+    first <= day <= last. Only the bitmap bytes covering the window are unpacked.
+    """
+    np = _np()
+    start, bits = days.bitmap()
+    if start is None:
+        return np.empty(0, dtype=np.int64)
+
+    lo_index = 0 if first is None else max((first - start) >> 3, 0)
+    hi_index = len(bits) if last is None else min(((last - start) >> 3) + 1, len(bits))
+    if lo_index >= hi_index:
+        return np.empty(0, dtype=np.int64)
+
+    flags = np.unpackbits(np.frombuffer(bits, dtype=np.uint8, count=hi_index - lo_index, offset=lo_index), bitorder="little")
+    result = np.flatnonzero(flags).astype(np.int64) + (start + lo_index * 8)
+
+    # Drop the bits of the edge bytes that fall outside the window
+    if first is not None:
+        result = result[result >= first]
+    if last is not None:
+        result = result[result <= last]
+    return result
+
+def period_keys(ordinals, frequency_type):
+    """Map day ordinals to the day/week/month keys used by analysis.aggregate."""
+    np = _np()
+    if frequency_type == "daily":
+        return ordinals
+    if frequency_type == "weekly":
+        return (ordinals - 1) // 7
+    if frequency_type == "monthly":
+        months = (ordinals - UNIX_EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+        return months.astype(np.int64) + 1970 * 12
+    raise ValueError(f"Unknown frequency type: {frequency_type}")
+
+# =========================
+# STREAKS
+# =========================
+
+def run_summary(keys, times_required):
+    """
+    Streak fields for sorted period keys, in StreakState order:
+    (latest period, its count, run ending at the last qualifying period,
+    last qualifying period, best run).
+    """
+    np = _np()
+    if keys.size == 0:
+        return None, 0, 0, None, 0
+
+    periods, counts = np.unique(keys, return_counts=True)
+    qualifying = periods[counts >= times_required]
+    if qualifying.size == 0:
+        return int(periods[-1]), int(counts[-1]), 0, None, 0
+
+    # A run ends wherever the next qualifying period isn't the consecutive one
+    ends = np.flatnonzero(np.diff(qualifying) != 1)
+    lengths = np.diff(np.concatenate(([-1], ends, [qualifying.size - 1])))
+
+    return int(periods[-1]), int(counts[-1]), int(lengths[-1]), int(qualifying[-1]), int(lengths.max())
+
+def streak_fields(habit):
+    """run_summary for a habit, using its frequency type and required count."""
+    keys = period_keys(ordinals(habit.completed_days), habit.frequency.type)
+    return run_summary(keys, habit.frequency.times)
+
+def streaks(habit):
+    """Return (current streak, best streak) for a habit."""
+    period, _, run, last_qualifying, best = streak_fields(habit)
+    current = run if period is not None and last_qualifying == period else 0
+    return current, best
+
+# =========================
+# WEEKLY SUMMARY
+# =========================
+
+def iter_weekly_summary(data, first=None, last=None):
+    """
+    Yield (week key, {habit ID: count}) like statistics.iter_weekly_summary,
+    for completions between the ordinals first and last (inclusive).
+    """
+    np = _np()
+    weeks, positions = [], []
+    for position, habit in enumerate(data["habits"]):
+        days = ordinals(habit.completed_days, first, last)
+        weeks.append((days - 1) // 7)
+        positions.append(np.full(days.size, position, dtype=np.int64))
+
+    if not weeks:
+        return
+    weeks = np.concatenate(weeks)
+    if weeks.size == 0:
+        return
+
+    # Count each (week, habit) pair; unique() sorts by week, then habit position
+    stride = len(data["habits"])
+    pairs, counts = np.unique(weeks * stride + np.concatenate(positions), return_counts=True)
+    pair_weeks, pair_positions = np.divmod(pairs, stride)
+    ids = np.array([habit.id for habit in data["habits"]], dtype=np.int64)[pair_positions]
+
+    # Split into one group per week
+    starts = np.flatnonzero(np.diff(pair_weeks, prepend=pair_weeks[0] - 1))
+    bounds = starts.tolist() + [pairs.size]
+    pair_weeks, ids, counts = pair_weeks.tolist(), ids.tolist(), counts.tolist()
+
+    for lo, hi in zip(bounds, bounds[1:]):
+        yield pair_weeks[lo], dict(zip(ids[lo:hi], counts[lo:hi]))
@@ -1,12 +1,40 @@
-from datetime import date, timedelta
-from colorama import Fore, Style
-from collections import Counter
-from calendar import month_name, monthcalendar
+import heapq
+import sys
+from datetime import date
+from operator import itemgetter
 
-from habit_tracker.habit_crud import list_habits
-from habit_tracker.utils.input_handler import prompt_for_existing_habit
+from habit_tracker import config
+from habit_tracker.analysis import numpy_engine
+from habit_tracker.analysis.cache import StatsCache, data_key, habit_key
+from habit_tracker.analysis.aggregate import aggregate, best_run, current_run, month_key, week_key, week_label
+from habit_tracker.models.day_set import to_ordinal
+from habit_tracker.models.streak_state import streak_state
+from habit_tracker.utils.input_handler import prompt_for_month_range
 
 
+# =========================
+# CACHE
+# =========================
+# Results are cached by habit ID + revision (see analysis.cache), so a menu
+# visit only recomputes what changed since the last one. The overview needs
+# no cache: it is a lookup in the rollups.
+
+_stats_cache = None
+
+def get_stats_cache():
+    """Return the statistics cache, creating (and loading, if persisted) it on first use."""
+    global _stats_cache
+    if _stats_cache is None:
+        path = config.DATA_PATH.with_name("stats_cache.json") if config.STATS_CACHE_PERSIST else None
+        _stats_cache = StatsCache(config.STATS_CACHE_SIZE, path)
+        _stats_cache.load()
+    return _stats_cache
+
+def save_stats_cache():
+    """Persist the cache if enabled and changed; a no-op if it was never used."""
+    if _stats_cache is not None:
+        _stats_cache.save()
+
 # =========================
 # OVERVIEW
 # =========================
@@ -16,16 +44,16 @@ def show_overview(data):
 
     print(f"   Total habits: {stats['total_habits']}")
     print(f"   Total completions: {stats['total_completions']}")
+    print(f"   This week: {stats['completions_this_week']}, this month: {stats['completions_this_month']}")
 
     if stats["most_completed_habit"]:
         print(f"   Most completed habit: {stats['most_completed_habit']}")
         print(f"   Least completed habit: {stats['least_completed_habit']}")
 
 def overview(data):
+    """Dataset totals, read from the rollups kept in data (no pass over the habits)."""
     habits = data["habits"]
-
-    total_habits = len(habits)
-    total_completions = sum(len(h["completed_days"]) for h in habits)
+    rollups = data.rollups
 
     if not habits:
         return{
@@ -33,370 +61,276 @@ def overview(data):
             "total_completions": 0,
             "most_completed_habit": None,
             "least_completed_habit": None,
+            "completions_this_week": 0,
+            "completions_this_month": 0,
         }
-    
-    sorted_habits = sorted(habits, key=lambda h: len(h["completed_days"]))
+
+    today = date.today()
 
     return {
-        "total_habits": total_habits,
-        "total_completions": total_completions,
-        "most_completed_habit": sorted_habits[-1]["name"],
-        "least_completed_habit": sorted_habits[0]["name"],
+        "total_habits": len(habits),
+        "total_completions": rollups.total,
+        "most_completed_habit": data.by_id[rollups.most_completed()].name,
+        "least_completed_habit": data.by_id[rollups.least_completed()].name,
+        "completions_this_week": rollups.weeks.get(week_key(today.toordinal()), 0),
+        "completions_this_month": rollups.months.get(month_key(today), 0),
     }
 
 # =========================
 # STREAKS
 # =========================
+# current_streak / best_streak read the habit's persisted StreakState, which
+# is kept up to date on every check-in. Passing PeriodCounts (analysis.aggregate)
+# instead computes them from the full history.
 
 def show_current_streaks(data):
+    today = date.today()
     for habit in data["habits"]:
-        streak = current_streak(habit)
+        streak = habit_streaks(habit)[0]
         label = streak_label(habit, streak)
-        print(f"   {habit['name']}: {label}")
-
-def current_streak(habit):
-    if habit["frequency"]["type"] == "daily":
-        return daily_streak(habit)
-    elif habit["frequency"]["type"] == "weekly":
-        return weekly_streak(habit)
-    elif habit["frequency"]["type"] == "monthly":
-        return monthly_streak(habit)
-
-def daily_streak(habit):
-    times_required = habit["frequency"]["times"]
-
-    if not habit["completed_days"]:
-        return 0
-
-    counts = Counter(date.fromisoformat(d) for d in habit["completed_days"])
-
-    current = max(counts)   # ← start from last completed day
-    streak = 0
-
-    while counts.get(current, 0) >= times_required:
-        streak += 1
-        current -= timedelta(days=1)
-
-    return streak
-
-def weekly_streak(habit):
-    times_required = habit["frequency"]["times"]
-
-    if not habit["completed_days"]:
-        return 0
-
-    weeks = Counter(
-        date.fromisoformat(d).isocalendar()[:2]
-        for d in habit["completed_days"]
-    )
-
-    current_year, current_week = max(weeks)
-    streak = 0
-
-    while weeks.get((current_year, current_week), 0) >= times_required:
-        streak += 1
-        current_week -= 1
-
-        if current_week == 0:
-            current_year -= 1
-            current_week = date(current_year, 12, 28).isocalendar()[1]
-
-    return streak
-
-def monthly_streak(habit):
-    times_required = habit["frequency"]["times"]
-
-    if not habit["completed_days"]:
-        return 0
+        progress = f"{period_count(habit, today)}/{habit.frequency.times} {CURRENT_PERIOD[habit.frequency.type]}"
+        print(f"   {habit.name}: {label}, {progress}")
 
-    months = Counter(
-        (date.fromisoformat(d).year, date.fromisoformat(d).month)
-        for d in habit["completed_days"]
+def habit_streaks(habit):
+    """[current streak, best streak] of a habit, cached."""
+    return get_stats_cache().get_or_compute(
+        habit_key("streaks", habit), lambda: [current_streak(habit), best_streak(habit)]
     )
 
-    year, month = max(months)
-    streak = 0
+CURRENT_PERIOD = {"daily": "today", "weekly": "this week", "monthly": "this month"}
 
-    while months.get((year, month), 0) >= times_required:
-        streak += 1
-        month -= 1
+def period_count(habit, day=None):
+    """
+    Completions in the period of the habit's frequency (the day, its ISO week
+    or its month) containing day (default: today), i.e. the progress towards
+    the current period of the streak. A popcount over the DaySet bitmap.
+    """
+    ordinal = to_ordinal(day if day is not None else date.today())
+    days = habit.completed_days
+    freq_type = habit.frequency.type
 
-        if month == 0:
-            month = 12
-            year -= 1
-
-    return streak
+    if freq_type == "daily":
+        return int(ordinal in days)
+    if freq_type == "weekly":
+        return days.count_week(ordinal)
+    if freq_type == "monthly":
+        d = date.fromordinal(ordinal)
+        return days.count_month(d.year, d.month)
+    raise ValueError(f"Unknown frequency type: {freq_type}")
+
+def current_streak(habit, counts=None):
+    if counts is None:
+        return streak_state(habit).current
+
+    if habit.frequency.type == "daily":
+        return daily_streak(habit, counts)
+    elif habit.frequency.type == "weekly":
+        return weekly_streak(habit, counts)
+    elif habit.frequency.type == "monthly":
+        return monthly_streak(habit, counts)
+
+def daily_streak(habit, counts=None):
+    counts = counts if counts is not None else aggregate(habit)
+    return current_run(counts.days, habit.frequency.times)       # counted back from the last completed day
+
+def weekly_streak(habit, counts=None):
+    counts = counts if counts is not None else aggregate(habit)
+    return current_run(counts.weeks, habit.frequency.times)
+
+def monthly_streak(habit, counts=None):
+    counts = counts if counts is not None else aggregate(habit)
+    return current_run(counts.months, habit.frequency.times)
 
 def streak_label(habit, streak):
-    freq = habit["frequency"]
+    freq = habit.frequency
 
     unit = {
         "daily": "day",
         "weekly": "week",
         "monthly": "month"
-    }[freq["type"]]
+    }[freq.type]
 
     plural = "" if streak == 1 else "s"
 
-    return f"{streak} {unit}{plural} ({freq['times']}x {freq['type']})"
-
-def best_streak(habit):
-    #convert iso strings to date objects in chronological order
-    dates = sorted(date.fromisoformat(d) for d in habit["completed_days"])
-    if not dates:
-        return 0
-    
-    best = 1
-    current = 1
-
-    for i in range(1, len(dates)):
-        if dates[i] == dates[i - 1] + timedelta(days=1):        # check if day is the day before
-            current += 1
-            best = max(best, current)
-        else:
-            current = 1                                         # streak breaks
-
-    return best
+    return f"{streak} {unit}{plural} ({freq.times}x {freq.type})"
 
 # ----- Best Streaks
 
 def show_best_streaks(data):
     for habit in data["habits"]:
-        best = best_streak(habit)
+        best = habit_streaks(habit)[1]
         label = streak_label(habit, best)
-        print(f"   {habit['name']}: {label}")
+        print(f"   {habit.name}: {label}")
+
+def best_streak(habit, counts=None):
+    if counts is None:
+        return streak_state(habit).best
 
-def best_streak(habit):
-    freq_type = habit["frequency"]["type"]
+    freq_type = habit.frequency.type
 
     if freq_type == "daily":
-        return best_daily_streak(habit)
+        return best_daily_streak(habit, counts)
     elif freq_type == "weekly":
-        return best_weekly_streak(habit)
+        return best_weekly_streak(habit, counts)
     elif freq_type == "monthly":
-        return best_monthly_streak(habit)
-    
-def best_daily_streak(habit):
-    times_required = habit["frequency"]["times"]
-
-    if not habit["completed_days"]:
-        return 0
-
-    counts = Counter(date.fromisoformat(d) for d in habit["completed_days"])
-
-    valid_days = sorted(
-        day for day, count in counts.items()
-        if count >= times_required
-    )
-
-    best = current = 1
-
-    for i in range(1, len(valid_days)):
-        if valid_days[i] == valid_days[i - 1] + timedelta(days=1):
-            current += 1
-            best = max(best, current)
-        else:
-            current = 1
+        return best_monthly_streak(habit, counts)
 
-    return best
+def best_daily_streak(habit, counts=None):
+    counts = counts if counts is not None else aggregate(habit)
+    return best_run(counts.days, habit.frequency.times)
 
-def best_weekly_streak(habit):
-    times_required = habit["frequency"]["times"]
-
-    weeks = Counter(
-        date.fromisoformat(d).isocalendar()[:2]
-        for d in habit["completed_days"]
-    )
-
-    valid_weeks = sorted(
-        (year, week) for (year, week), count in weeks.items()
-        if count >= times_required
-    )
-
-    best = current = 1
-
-    for i in range(1, len(valid_weeks)):
-        y1, w1 = valid_weeks[i - 1]
-        y2, w2 = valid_weeks[i]
-
-        # handle ISO week rollover
-        if (y2, w2) == next_week(y1, w1):
-            current += 1
-            best = max(best, current)
-        else:
-            current = 1
-
-    return best
-
-def best_monthly_streak(habit):
-    times_required = habit["frequency"]["times"]
-
-    months = Counter(
-        (date.fromisoformat(d).year, date.fromisoformat(d).month)
-        for d in habit["completed_days"]
-    )
-
-    valid_months = sorted(
-        (y, m) for (y, m), count in months.items()
-        if count >= times_required
-    )
-
-    best = current = 1
-
-    for i in range(1, len(valid_months)):
-        y1, m1 = valid_months[i - 1]
-        y2, m2 = valid_months[i]
-
-        if (y2, m2) == next_month(y1, m1):
-            current += 1
-            best = max(best, current)
-        else:
-            current = 1
-
-    return best
-
-# =========================
-# HELPERS
-# =========================
-
-def next_week(year, week):
-    if week < date(year, 12, 28).isocalendar()[1]:
-        return year, week + 1
-    return year + 1, 1
-
-
-def next_month(year, month):
-    if month < 12:
-        return year, month + 1
-    return year + 1, 1
+def best_weekly_streak(habit, counts=None):
+    counts = counts if counts is not None else aggregate(habit)
+    return best_run(counts.weeks, habit.frequency.times)      # ISO week rollover is handled by the week keys
 
+def best_monthly_streak(habit, counts=None):
+    counts = counts if counts is not None else aggregate(habit)
+    return best_run(counts.months, habit.frequency.times)
 
 # =========================
 # WEEKLY SUMMARY
 # =========================
 
-def weekly_summary(data):
-    habits = [h["name"] for h in data["habits"]]
-    summary = {}
-
-    # First pass: find all weeks
-    for habit in data["habits"]:
-        for d in habit["completed_days"]:
-            dt = date.fromisoformat(d)
-            year, week, _ = dt.isocalendar()
-            week_key = f"{year}-W{week:02d}"
-
-            if week_key not in summary:
-                summary[week_key] = {name: 0 for name in habits}
-
-            summary[week_key][habit["name"]] += 1
+# Sparse: a week lists only the habits done in it, keyed by habit ID. Weeks
+# come oldest first from the completions per week and habit kept in the
+# rollups, so only the weeks asked for are read; a week cut by since/until
+# is recounted from the habits' bitmaps.
+
+def iter_weekly_summary(data, since=None, until=None, top=None):
+    """
+    Yield (week key, {habit ID: count}) for each week with any completion.
+
+    since/until limit the days counted (inclusive; dates, ISO strings or
+    ordinals). top keeps only the N habits done most often in each week.
+    """
+    first = to_ordinal(since) if since is not None else None
+    last = to_ordinal(until) if until is not None else None
+
+    if numpy_engine.enabled():
+        weeks = numpy_engine.iter_weekly_summary(data, first, last)
+    else:
+        weeks = rollup_weeks(data, first, last)
+
+    for week, counts in weeks:
+        if top is not None:
+            # nlargest keeps ID order between equal counts
+            counts = dict(heapq.nlargest(top, counts.items(), key=itemgetter(1)))
+        yield week, counts
+
+def rollup_weeks(data, first=None, last=None):
+    """Yield (week key, {habit ID: count}) between the ordinals first and last from the rollups."""
+    week_habits = data.rollups.habit_weeks(data["habits"])
+    first_week = week_key(first) if first is not None else None
+    last_week = week_key(last) if last is not None else None
+
+    for week in sorted(week_habits):
+        if first_week is not None and week < first_week:
+            continue
+        if last_week is not None and week > last_week:
+            break
+
+        counts = week_habits[week]
+        monday, sunday = week * 7 + 1, week * 7 + 7
+        lo = max(monday, first) if first is not None else monday
+        hi = min(sunday, last) if last is not None else sunday
+        if (lo, hi) != (monday, sunday):
+            counts = {
+                habit_id: data.by_id[habit_id].completed_days.count_between(lo, hi) for habit_id in counts
+            }
+            counts = {habit_id: count for habit_id, count in counts.items() if count}
+        if counts:
+            yield week, dict(sorted(counts.items()))
+
+def cached_weekly_summary(data, since=None, until=None, top=None):
+    """
+    iter_weekly_summary through the cache: replays a cached result, or
+    streams a fresh one and caches it once it has been read to the end.
+    """
+    cache = get_stats_cache()
+    key = data_key("weekly", data, since, until, top)
+
+    cached = cache.get(key)
+    if cached is not None:
+        for week, counts in cached:
+            yield week, dict(counts)
+        return
 
-    return summary
+    collected = []      # as [week, [[habit ID, count], ...]] so it survives JSON
+    for week, counts in iter_weekly_summary(data, since, until, top):
+        collected.append([week, list(counts.items())])
+        yield week, counts
+    cache.put(key, collected)
 
+def weekly_summary(data, since=None, until=None, top=None):
+    """Collect the weekly summary into {week label: {habit ID: count}}."""
+    return {week_label(week): counts for week, counts in cached_weekly_summary(data, since, until, top)}
 
-def show_weekly_summary(data):
-    summary = weekly_summary(data)
 
+def show_weekly_summary(data, since=None, until=None, top=None):
     print("   Shows only weeks with activity. Weeks start on Monday.\n")
 
-    if not summary:
-        print("   No data yet.")
-        return
+    empty = True
+    for week, counts in cached_weekly_summary(data, since, until, top):
+        empty = False
+        print(f"\n   {week_label(week)}")
+        for habit_id, count in counts.items():
+            print(f"     • {data.by_id[habit_id].name}: {count}")
 
-    for week, habits in sorted(summary.items()):
-        print(f"\n   {week}")
-        for habit, count in habits.items():
-            print(f"     • {habit}: {count}")
+    if empty:
+        print("   No data yet.")
 
 
 # =========================
 # HABIT DETAILS
 # =========================
-
-BLOCK_FILLED = "█"
-BLOCK_EMPTY = "░"
-
-def render_day_block(day, habit, today, start):
-    completed_days = {date.fromisoformat(d) for d in habit["completed_days"]}
-
-    # OUTSIDE SELECTED RANGE
-    if day < start:
-        return Fore.LIGHTBLACK_EX + "░" + Style.RESET_ALL           
-
-    # FUTURE
-    if day > today:
-        return Fore.LIGHTBLACK_EX + "░" + Style.RESET_ALL           
-
-    # TODAY
-    if day == today:
-        return Fore.YELLOW + "█" + Style.RESET_ALL                  
-
-    # DONE
-    if day in completed_days:
-        return Fore.GREEN + "█" + Style.RESET_ALL                   
-
-    # MISSED (in range, past, not completed)
-    return Fore.RED + "░" + Style.RESET_ALL
-
+# calendar_view (and with it calendar and colorama) is imported by the
+# functions below, so the CLI and the server don't load it just to compute numbers.
 
 def habit_blocks(habit, months=3):
-    today = date.today()
-    completed_days = {
-        date.fromisoformat(d) for d in habit["completed_days"]
-    }
-
-    # figure out which months to show
-    shown_months = []
-    y, m = today.year, today.month
-    for _ in range(months):
-        shown_months.append((y, m))
-        m -= 1
-        if m == 0:
-            m = 12
-            y -= 1
-
-    shown_months.reverse()  # oldest → newest
-
-    for year, month in shown_months:
-        print(f"\n   {month_name[month]} {year}")
-        print("   M T W T F S S")
+    from habit_tracker.analysis.calendar_view import last_months
+    print_calendar(habit, last_months(months))
 
-        cal = monthcalendar(year, month)
+def habit_blocks_between(habit, first, last):
+    """Show the calendars from month first to month last, both (year, month)."""
+    from habit_tracker.analysis.calendar_view import month_range
+    print_calendar(habit, month_range(first, last))
 
-        for week in cal:
-            row = []
-            for day in week:
-                if day == 0:
-                    row.append(Fore.LIGHTBLACK_EX + "░" + Style.RESET_ALL)
-                else:
-                    d = date(year, month, day)
+def print_calendar(habit, shown_months):
+    """Write the rendered calendars in one call, reusing a cached rendering."""
+    from habit_tracker.analysis.calendar_view import render_calendar
 
-                    if d > today:
-                        row.append(Fore.LIGHTBLACK_EX + "░" + Style.RESET_ALL)
-                    elif d == today:
-                        row.append(Fore.YELLOW + "█" + Style.RESET_ALL)
-                    elif d in completed_days:
-                        row.append(Fore.GREEN + "█" + Style.RESET_ALL)
-                    else:
-                        row.append(Fore.RED + "█" + Style.RESET_ALL)
+    today = date.today()
+    (y1, m1), (y2, m2) = shown_months[0], shown_months[-1]
+    key = habit_key("calendar", habit, today.isoformat(), f"{y1}-{m1:02d}", f"{y2}-{m2:02d}")
 
-            print("   " + " ".join(row))
+    text = get_stats_cache().get_or_compute(key, lambda: render_calendar(habit, shown_months, today))
+    sys.stdout.write(text)
+    sys.stdout.flush()
 
 
 def print_block_legend():
-    print(f"   Legend: {Fore.GREEN}█{Style.RESET_ALL} completed   {Fore.RED}█{Style.RESET_ALL} missed   {Fore.YELLOW}█{Style.RESET_ALL} today\n")
+    from habit_tracker.analysis.calendar_view import LEGEND
+    print(LEGEND)
 
 
 def show_habit_details(habit):
-    print(f"\n   {Style.BRIGHT}{Fore.CYAN}{habit['name']}{Style.RESET_ALL}")
-    freq = habit["frequency"]
-    print(f"   {Style.BRIGHT}{Fore.CYAN}Frequency: {freq['times']}x {freq['type']}{Style.RESET_ALL}")
+    from colorama import Fore, Style
+
+    print(f"\n   {Style.BRIGHT}{Fore.CYAN}{habit.name}{Style.RESET_ALL}")
+    freq = habit.frequency
+    print(f"   {Style.BRIGHT}{Fore.CYAN}Frequency: {freq.times}x {freq.type}{Style.RESET_ALL}")
+
+    days = habit.completed_days
+    if days:
+        first, last = date.fromordinal(days.first()), date.fromordinal(days.last())
+        print(f"   Completions: {len(days)} (first {first}, last {last})")
 
     while True:
         print(f"\n   {Fore.CYAN}Show:{Style.RESET_ALL}")
         print(f"   {Fore.CYAN}1{Style.RESET_ALL}. Last month")
         print(f"   {Fore.CYAN}2{Style.RESET_ALL}. Last 2 months")
         print(f"   {Fore.CYAN}3{Style.RESET_ALL}. Last 3 months")
+        print(f"   {Fore.CYAN}4{Style.RESET_ALL}. Choose months")
         print("   " + ("-" * 20) + "\n")
         print(f"   {Fore.CYAN}0{Style.RESET_ALL}. Back\n")
 
@@ -414,14 +348,12 @@ def show_habit_details(habit):
             print_block_legend()
             habit_blocks(habit, months=3)
             input("\n   Press Enter to continue...")
+        elif choice == "4":
+            first, last = prompt_for_month_range()
+            print_block_legend()
+            habit_blocks_between(habit, first, last)
+            input("\n   Press Enter to continue...")
         elif choice == "0":
             return
         else:
             print("   Invalid choice.")
-
-
-
-# =========================
-# REPORTS?
-# =========================
-
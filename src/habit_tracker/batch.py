@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from pathlib import Path
+
+from habit_tracker.analysis import statistics
+from habit_tracker.utils import logger
+
+"""Batch statistics over many habits files, e.g. for nightly reports.
+
+With several files, each worker process loads and summarizes whole files.
+With a single large file, its habits are split into chunks instead. Results
+always come back in input order, so the output doesn't depend on which
+worker finishes first.
+"""
+
+# =========================
+# Per-habit / per-file work
+# =========================
+# These run inside worker processes, so they live at module level (picklable).
+
+def habit_report(habit):
+    return {
+        "id": habit.id,
+        "name": habit.name,
+        "frequency": habit.frequency.to_dict(),
+        "completions": len(habit.completed_days),
+        "current_streak": statistics.current_streak(habit),
+        "best_streak": statistics.best_streak(habit),
+    }
+
+def habit_reports(habits):
+    return [habit_report(habit) for habit in habits]
+
+def load_file(path):
+    """
+    Load a habits file without touching the app's configured storage: a
+    JSON file (plus its journal, if any) or an SQLite database (.db).
+    """
+    path = Path(path)
+    if not path.is_file():
+        # Backends create missing files on load; a report must not
+        raise FileNotFoundError(f"No such habits file: {path}")
+
+    if path.suffix == ".db":
+        from habit_tracker.storage.sqlite_backend import SqliteBackend
+        backend = SqliteBackend(path)
+        try:
+            return backend.load()
+        finally:
+            backend.close()
+
+    from habit_tracker.storage.json_backend import JsonBackend
+    return JsonBackend(path, path.with_suffix(".journal")).load()
+
+def report_file(path):
+    return file_report(path, habit_reports(load_file(path)["habits"]))
+
+# =========================
+# Merging
+# =========================
+
+def file_report(path, habits):
+    return {"path": str(path), "overview": overview(habits), "habits": habits}
+
+def overview(habits):
+    """Totals and most/least completed habit from habit reports (same tie-breaking as statistics.overview)."""
+    if not habits:
+        return {
+            "total_habits": 0,
+            "total_completions": 0,
+            "most_completed_habit": None,
+            "least_completed_habit": None,
+        }
+
+    ordered = sorted(habits, key=itemgetter("completions"))
+    return {
+        "total_habits": len(habits),
+        "total_completions": sum(h["completions"] for h in habits),
+        "most_completed_habit": ordered[-1]["name"],
+        "least_completed_habit": ordered[0]["name"],
+    }
+
+# =========================
+# Runner
+# =========================
+
+def run_batch(paths, workers=None, chunk_size=None):
+    """
+    Return one report per path, in the order given.
+
+    workers=None uses every CPU; workers=1 runs in this process. chunk_size
+    is the number of files (or, for a single file, habits) per task.
+    """
+    paths = [Path(p) for p in paths]
+    workers = workers or os.cpu_count() or 1
+    logger.debug("Batch statistics for %d file(s) with %d worker(s).", len(paths), workers)
+
+    if len(paths) == 1:
+        return [report_habits_in_parallel(paths[0], workers, chunk_size)]
+
+    if workers == 1:
+        return [report_file(path) for path in paths]
+
+    chunk_size = chunk_size or max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map yields results in input order
+        return list(pool.map(report_file, paths, chunksize=chunk_size))
+
+def report_habits_in_parallel(path, workers, chunk_size=None):
+    """Report on one file, fanning its habits out to the workers in chunks."""
+    habits = load_file(path)["habits"]
+    if workers == 1 or len(habits) < 2:
+        return file_report(path, habit_reports(habits))
+
+    chunk_size = chunk_size or max(1, -(-len(habits) // (workers * 4)))
+    chunks = [habits[i:i + chunk_size] for i in range(0, len(habits), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        reports = [report for chunk in pool.map(habit_reports, chunks) for report in chunk]
+    return file_report(path, reports)
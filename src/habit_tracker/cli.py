@@ -0,0 +1,383 @@
+import argparse
+import json
+import logging
+import sys
+from datetime import date
+
+from habit_tracker import data_store
+from habit_tracker.analysis.aggregate import week_label
+from habit_tracker.habit_crud import FREQUENCY_TYPES, build_habit
+from habit_tracker.utils import logger
+from habit_tracker.utils.input_handler import parse_date
+
+"""Non-interactive command-line mode for scripts and cron jobs.
+
+Every command loads the data once and persists all of its changes in a
+single write (one journal append or one transaction).
+"""
+
+# =========================
+# Helpers
+# =========================
+
+def emit(args, payload, text_lines):
+    """Print payload as JSON with --json, otherwise the human-readable lines."""
+    if args.json:
+        json.dump(payload, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        for line in text_lines:
+            print(line)
+
+def fail(message):
+    print(f"error: {message}", file=sys.stderr)
+    return 1
+
+def habit_summary(habit):
+    return {
+        "id": habit.id,
+        "name": habit.name,
+        "description": habit.description,
+        "frequency": habit.frequency.to_dict(),
+        "completions": len(habit.completed_days),
+        "first_completion": _iso(habit.completed_days.first()),
+        "last_completion": _iso(habit.completed_days.last()),
+    }
+
+def _iso(ordinal):
+    return date.fromordinal(ordinal).isoformat() if ordinal is not None else None
+
+def done_events(data, entries):
+    """
+    Turn (habit_id, day) pairs into 'done' events.
+
+    Returns (events, skipped, errors) where skipped counts days that were
+    already marked and errors lists messages for unknown habits.
+    """
+    events, errors = [], []
+    pending = set()
+    skipped = 0
+
+    for habit_id, day in entries:
+        habit = data_store.find_habit_by_id(data, habit_id)
+        if habit is None:
+            errors.append(f"habit {habit_id} not found")
+            continue
+        if day in habit.completed_days or (habit_id, day) in pending:
+            skipped += 1
+            continue
+        pending.add((habit_id, day))
+        events.append({"op": "done", "id": habit_id, "day": day})
+
+    return events, skipped, errors
+
+def weekly_lines(data, weeks):
+    """Text lines for (week key, {habit ID: count}) pairs, generated lazily."""
+    for week, counts in weeks:
+        yield week_label(week)
+        for habit_id, count in counts.items():
+            yield f"  {data.by_id[habit_id].name}: {count}"
+
+# =========================
+# Commands
+# =========================
+
+def cmd_add(args):
+    data = data_store.load_habits()
+    try:
+        habit = build_habit(data, args.name, args.description, args.type, args.times)
+    except ValueError as e:
+        return fail(e)
+
+    data_store.record_events(data, [{"op": "add", "habit": habit}])
+    emit(args, habit_summary(habit), [f"Added habit {habit.id}: {habit.name}"])
+    return 0
+
+def cmd_done(args):
+    try:
+        day = parse_date(args.date) if args.date else date.today().isoformat()
+    except ValueError as e:
+        return fail(e)
+
+    data = data_store.load_habits()
+    events, skipped, errors = done_events(data, [(args.id, day)])
+    if errors:
+        return fail(errors[0])
+
+    data_store.record_events(data, events)
+    status = "already done" if skipped else "marked"
+    emit(args, {"id": args.id, "date": day, "status": status.replace(" ", "_")}, [f"Habit {args.id} {status} on {day}"])
+    return 0
+
+def cmd_done_batch(args):
+    """Read 'ID [YYYY-MM-DD]' lines (date defaults to today); '#' starts a comment."""
+    today = date.today().isoformat()
+    entries, errors = [], []
+
+    for line_no, line in enumerate(args.file, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+
+        parts = line.replace(",", " ").split()
+        try:
+            habit_id = int(parts[0])
+            day = parse_date(parts[1]) if len(parts) > 1 else today
+        except ValueError as e:
+            errors.append(f"line {line_no}: {e}")
+            continue
+        entries.append((habit_id, day))
+
+    data = data_store.load_habits()
+    events, skipped, lookup_errors = done_events(data, entries)
+    errors.extend(lookup_errors)
+
+    data_store.record_events(data, events)
+
+    for message in errors:
+        print(f"error: {message}", file=sys.stderr)
+    emit(
+        args,
+        {"marked": len(events), "already_done": skipped, "errors": errors},
+        [f"Marked {len(events)} completions ({skipped} already done, {len(errors)} errors)"],
+    )
+    return 1 if errors else 0
+
+def cmd_import(args):
+    from habit_tracker import importer
+
+    data = data_store.load_habits()
+    try:
+        report = importer.import_file(data, args.file, fmt=args.format, chunk_size=args.chunk_size)
+    except OSError as e:
+        return fail(e)
+
+    for message in report["error_messages"]:
+        print(f"error: {message}", file=sys.stderr)
+    emit(
+        args,
+        report,
+        [
+            f"Imported {report['imported']} completions from {report['rows']} rows "
+            f"({report['duplicates']} duplicates, {report['errors']} errors) "
+            f"in {report['seconds']:.2f}s ({report['rows_per_second']:.0f} rows/s)"
+        ],
+    )
+    return 1 if report["errors"] else 0
+
+def cmd_report(args):
+    from habit_tracker import batch, profiles
+
+    files = list(args.files)
+    if args.all_profiles:
+        files.extend(profiles.shard_paths())
+    if not files:
+        return fail("no habits files given (name files or use --all-profiles)")
+
+    try:
+        reports = batch.run_batch(files, workers=args.workers, chunk_size=args.chunk_size)
+    except (OSError, ValueError) as e:
+        return fail(e)
+
+    lines = []
+    for report in reports:
+        stats = report["overview"]
+        lines.append(f"{report['path']}: {stats['total_habits']} habits, {stats['total_completions']} completions")
+        lines.extend(
+            f"  {h['name']}: current {h['current_streak']}, best {h['best_streak']}" for h in report["habits"]
+        )
+    emit(args, reports, lines)
+    return 0
+
+def cmd_list(args):
+    data = data_store.load_habits()
+    habits = [habit_summary(h) for h in data["habits"]]
+    emit(
+        args,
+        habits,
+        [f"{h['id']}: {h['name']} ({h['frequency']['times']}x {h['frequency']['type']})" for h in habits],
+    )
+    return 0
+
+def cmd_profiles(args):
+    from habit_tracker import profiles
+
+    listed = profiles.list_profiles()
+    emit(
+        args,
+        [dict(entry, name=name) for name, entry in listed],
+        [f"{name} ({entry['backend']}, since {entry['created']}): {entry['path']}" for name, entry in listed],
+    )
+    return 0
+
+def cmd_serve(args):
+    from habit_tracker import server
+
+    # The server reports its address and failures through the logger
+    logger.configure_console(level=logging.INFO, stream=sys.stderr)
+    server.run(args.host, args.port)
+    return 0
+
+def cmd_show(args):
+    try:
+        start = parse_date(args.since) if args.since else date.min.isoformat()
+        end = parse_date(args.until) if args.until else date.max.isoformat()
+    except ValueError as e:
+        return fail(e)
+
+    # Only this habit is read (through the indexes on the SQLite backend)
+    habit = data_store.load_habit(args.id)
+    if habit is None:
+        return fail(f"habit {args.id} not found")
+
+    freq = habit.frequency
+    if args.count:
+        count = data_store.count_between(args.id, start, end)
+        emit(args, dict(habit_summary(habit), completions_in_range=count), [f"{habit.id}: {habit.name}, {count} completions"])
+        return 0
+
+    days = data_store.completions_between(args.id, start, end)
+    emit(
+        args,
+        dict(habit_summary(habit), completed_days=days),
+        [f"{habit.id}: {habit.name} ({freq.times}x {freq.type}), {len(days)} of {len(habit.completed_days)} completions shown", *days],
+    )
+    return 0
+
+def cmd_stats(args):
+    from habit_tracker.analysis import statistics
+
+    data = data_store.load_habits()
+
+    if args.report == "overview":
+        stats = statistics.overview(data)
+        emit(args, stats, [f"{key}: {value}" for key, value in stats.items()])
+
+    elif args.report == "streaks":
+        rows = []
+        today = date.today()
+        for habit in data["habits"]:
+            current, best = statistics.habit_streaks(habit)
+            rows.append({
+                "id": habit.id,
+                "name": habit.name,
+                "frequency": habit.frequency.to_dict(),
+                "current": current,
+                "best": best,
+                "this_period": statistics.period_count(habit, today),
+            })
+        emit(args, rows, [
+            f"{r['name']}: current {r['current']}, best {r['best']}, "
+            f"{r['this_period']}/{r['frequency']['times']} {statistics.CURRENT_PERIOD[r['frequency']['type']]}"
+            for r in rows
+        ])
+
+    elif args.report == "weekly":
+        try:
+            since = parse_date(args.since) if args.since else None
+            until = parse_date(args.until) if args.until else None
+        except ValueError as e:
+            return fail(e)
+
+        if args.json:
+            emit(args, statistics.weekly_summary(data, since, until, args.top), [])
+        else:
+            # Text output is printed week by week as the summary is produced
+            weeks = statistics.cached_weekly_summary(data, since, until, args.top)
+            emit(args, None, weekly_lines(data, weeks))
+
+    statistics.save_stats_cache()
+    return 0
+
+# =========================
+# Parser
+# =========================
+
+def build_parser():
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true", help="print machine-readable JSON")
+
+    parser = argparse.ArgumentParser(
+        prog="habit-tracker",
+        description="Track habits. Run without a command for the interactive menu (of --profile, if given).",
+    )
+    parser.add_argument("--profile", help="use this user's profile (created on first use)")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("add", parents=[output], help="add a habit")
+    p.add_argument("name")
+    p.add_argument("--description", default="")
+    p.add_argument("--type", choices=FREQUENCY_TYPES, default="daily")
+    p.add_argument("--times", type=int, default=1)
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("done", parents=[output], help="mark a habit done")
+    p.add_argument("id", type=int)
+    p.add_argument("--date", help="YYYY-MM-DD (default: today)")
+    p.set_defaults(func=cmd_done)
+
+    p = sub.add_parser("done-batch", parents=[output], help="mark many completions from 'ID [DATE]' lines")
+    p.add_argument("file", nargs="?", type=argparse.FileType("r", encoding="utf-8"), default=sys.stdin,
+                   help="input file (default: stdin)")
+    p.set_defaults(func=cmd_done_batch)
+
+    p = sub.add_parser("import", parents=[output], help="bulk import completions from CSV or JSONL")
+    p.add_argument("file", help="CSV with habit,date columns or JSONL of {\"habit\": ..., \"date\": ...}")
+    p.add_argument("--format", choices=("csv", "jsonl"), help="default: guessed from the file name")
+    p.add_argument("--chunk-size", type=int, help="commit every N new completions instead of once at the end")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("report", parents=[output], help="statistics for many habits files in parallel")
+    p.add_argument("files", nargs="*", help="habits JSON files (a sibling .journal is replayed if present) or .db files")
+    p.add_argument("--all-profiles", action="store_true", help="also report on every profile's shard")
+    p.add_argument("--workers", type=int, help="worker processes (default: one per CPU; 1 = no pool)")
+    p.add_argument("--chunk-size", type=int, help="files per task, or habits per task for a single file")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("list", parents=[output], help="list habits")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("profiles", parents=[output], help="list profiles")
+    p.set_defaults(func=cmd_profiles)
+
+    p = sub.add_parser("serve", help="serve the HTTP/JSON API")
+    p.add_argument("--host", help="default: config.SERVER_HOST (127.0.0.1)")
+    p.add_argument("--port", type=int, help="default: config.SERVER_PORT (8765)")
+    p.set_defaults(func=cmd_serve, json=False)
+
+    p = sub.add_parser("show", parents=[output], help="show one habit and its completions")
+    p.add_argument("id", type=int)
+    p.add_argument("--since", help="first completion listed, YYYY-MM-DD")
+    p.add_argument("--until", help="last completion listed, YYYY-MM-DD")
+    p.add_argument("--count", action="store_true", help="only count the completions in the range")
+    p.set_defaults(func=cmd_show)
+
+    p = sub.add_parser("stats", parents=[output], help="show statistics")
+    p.add_argument("report", choices=("streaks", "overview", "weekly"))
+    p.add_argument("--since", help="weekly: first day counted, YYYY-MM-DD")
+    p.add_argument("--until", help="weekly: last day counted, YYYY-MM-DD")
+    p.add_argument("--top", type=int, help="weekly: only the N habits done most each week")
+    p.set_defaults(func=cmd_stats)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.profile:
+        from habit_tracker import profiles
+        try:
+            profiles.use_profile(args.profile)
+        except (OSError, ValueError) as e:
+            return fail(e)
+
+    if args.command is None:
+        # Only a profile was given: open the interactive menu for it
+        from habit_tracker.main import main as menu
+        menu()
+        return 0
+
+    # stdout is for command output; keep only warnings and errors, on stderr
+    logger.configure_console(level=logging.WARNING, stream=sys.stderr)
+    logger.debug("Command-line mode: %s", args.command)
+    return args.func(args)
@@ -8,3 +8,58 @@ DATA_DIR = PROJECT_ROOT/"data"
 
 # Habits file
 DATA_PATH = PROJECT_ROOT/"data"/"habits.json"
+
+# Append-only journal of changes since the last snapshot of DATA_PATH
+JOURNAL_PATH = PROJECT_ROOT/"data"/"habits.journal"
+
+# Write changes to the journal instead of rewriting DATA_PATH every time
+JOURNAL_ENABLED = True
+
+# Fold the journal back into DATA_PATH once it holds this many events
+JOURNAL_COMPACT_EVERY = 200
+
+# Per-user profiles: each one keeps its own shard of the files above in
+# PROFILES_DIR/<name>/ (see profiles.py). None uses DATA_PATH etc. as they are.
+PROFILE = None
+PROFILES_DIR = PROJECT_ROOT/"data"/"profiles"
+
+# List of known profiles, so listing them doesn't open every shard
+PROFILES_MANIFEST = PROJECT_ROOT/"data"/"profiles.json"
+
+# Interactive sessions store changes in batches (write-behind): once this many
+# are pending or the oldest is this many seconds old, on leaving a menu and on exit
+WRITE_BEHIND = True
+WRITE_BEHIND_MAX_EVENTS = 20
+WRITE_BEHIND_MAX_SECONDS = 30
+
+# Storage backend: "json" (DATA_PATH + JOURNAL_PATH) or "sqlite" (SQLITE_PATH)
+STORAGE_BACKEND = "json"
+
+# SQLite database used by the "sqlite" backend
+SQLITE_PATH = PROJECT_ROOT/"data"/"habits.db"
+
+# Store completed_days on disk as a base64 bitmap instead of a list of dates
+COMPACT_COMPLETIONS = False
+
+# Indentation for DATA_PATH; None writes compact single-line JSON
+JSON_INDENT = None
+
+# Gzip DATA_PATH on save (loading detects gzip automatically)
+GZIP_DATA = False
+
+# Statistics engine: "python", or "numpy" for large datasets (needs numpy installed)
+STATS_ENGINE = "python"
+
+# Number of computed statistics kept in the in-memory LRU cache
+STATS_CACHE_SIZE = 256
+
+# Keep the statistics cache in stats_cache.json next to DATA_PATH between runs
+STATS_CACHE_PERSIST = False
+
+# Lowest level written to logs/HabitTracker_<date>.log. "DEBUG" also records
+# every load, save and change, at the cost of formatting all those messages
+LOG_LEVEL = "INFO"
+
+# Address of the HTTP API server (habit-tracker serve); keep it on localhost
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
@@ -1,69 +1,198 @@
-import json
-from habit_tracker.config import DATA_PATH
+from habit_tracker import config
+from habit_tracker.models.day_set import DaySet, to_ordinal
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData, name_key
+from habit_tracker.models.streak_state import StreakState, note_completion
+from habit_tracker.storage import create_backend
 from habit_tracker.utils import logger
 
 # Data access and persistence layer. #
+# The actual storage lives in habit_tracker.storage; config.STORAGE_BACKEND
+# selects which backend the functions below delegate to.
 
-# ----- JSON / Data helpers ----- 
+_backend = None
 
-def load_habits():
-    if not DATA_PATH.exists():
-        logger.warning("Habits file not found. Creating new file.")
-
-        DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-        initial_data = {"next_id": 1, "habits": []}
-        with open(DATA_PATH, "w", encoding="utf-8") as f:
-            json.dump(initial_data, f, indent=2)
-
-        return initial_data
-    
-    try:
-        if DATA_PATH.stat().st_size == 0:
-            logger.warning("Habits file is empty. Reinitializing.")
+def get_backend():
+    """Return the storage backend selected in config, creating it on first use."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend(config.STORAGE_BACKEND)
+        logger.debug("Using '%s' storage backend.", config.STORAGE_BACKEND)
+    return _backend
 
-            initial_data = {"next_id": 1, "habits": []}
-            with open(DATA_PATH, "w", encoding="utf-8") as f:
-                json.dump(initial_data, f, indent=2)
+def reset_backend():
+    """Drop the current backend so the next call uses the paths now in config."""
+    global _backend
+    _backend = None
 
-            return initial_data
+# ----- Load / Save -----
 
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
-            logger.debug(f"Loaded habits data: {json_data}")
-
-        # ----- Backward compatibility -----
-        if "habits" not in json_data:
-            json_data["habits"] = []
-            logger.warning("Missing 'habits' key. Initialized empty list.")
-
-        if "next_id" not in json_data:
-            max_id = max((h["id"] for h in json_data.get("habits", [])), default=0)
-            json_data["next_id"] = max_id + 1
-            logger.debug(f"Added missing next_id field (starting at {json_data['next_id']})")
-
-        return json_data
+def load_habits():
+    data = get_backend().load()
+    if not isinstance(data, HabitData):
+        data = HabitData(data)
+    return data
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Habits file is corrupted: {e}")                  ### Logger ERROR example - corrupted file ###
-        raise
-    
 def save_habits(data):
-    try:
-        # Ensure data directory exists
-        DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-        logger.debug(f"Saving habits to {DATA_PATH}")
-        logger.debug(f"Data to save: {data}")
-
-        with open(DATA_PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-
-        logger.info("Habits saved successfully.")
-
-    except Exception as e:
-        logger.error(f"Failed to save habits: {e}")
-        raise
+    get_backend().save(data)
+
+def record_event(data, event):
+    """Apply a single change to data and persist it without a full rewrite where possible."""
+    get_backend().record_event(data, event)
+
+def record_events(data, events, applied=False):
+    """
+    Apply and persist several changes in one write (one journal append or one
+    transaction). applied=True means they are already applied to data and
+    only need storing (they are re-applied only when merging, see below).
+    """
+    get_backend().record_events(data, events, applied)
+
+# ----- Habit codecs -----
+# Habits are Habit objects in memory and plain dicts on disk / in events.
+
+def habit_from_dict(d):
+    """Build a Habit from its stored dict form."""
+    freq = d.get("frequency") or {}
+    return Habit(
+        d["id"],
+        d["name"],
+        d.get("description", ""),
+        freq.get("type", "daily"),
+        freq.get("times", 1),
+        DaySet.from_json(d.get("completed_days", [])),
+        StreakState.from_dict(d["streak"]) if d.get("streak") else None,
+        d.get("revision", 0),
+    )
+
+# ----- Events -----
+# Every change is described as a small event dict:
+#   {"op": "add", "habit": Habit or its dict form}
+#   {"op": "edit", "id": 1, "name": "...", "description": "..."}
+#   {"op": "delete", "id": 1}
+#   {"op": "done", "id": 1, "day": "YYYY-MM-DD"}
+#   {"op": "reserve", "next_id": 3}     IDs below next_id were handed out
+#                                       (left by coalesce_events for a habit
+#                                       added and deleted in one batch)
+
+def apply_event(data, event, replay=False):
+    """
+    Apply a single event to loaded data (a HabitData, so the indexes stay in
+    sync). New events go through rebase_events first, so an added habit's ID
+    is free; replay=True is for events read back from the journal.
+    """
+    op = event["op"]
+
+    if op == "add":
+        habit = event["habit"]
+        if not isinstance(habit, Habit):
+            habit = habit_from_dict(habit)
+        if habit.id in data.by_id:
+            if replay:
+                # Already in the snapshot (e.g. a crash between snapshot and journal cleanup)
+                return
+            raise ValueError(f"Habit ID {habit.id} is already taken by '{data.by_id[habit.id].name}'")
+        data.add(habit)
+        data["next_id"] = max(data["next_id"], habit.id + 1)
+        return
+
+    if op == "reserve":
+        data["next_id"] = max(data["next_id"], event["next_id"])
+        return
+
+    habit = find_habit_by_id(data, event["id"])
+    if habit is None:
+        logger.warning("Event for unknown habit ID %s ignored.", event["id"])
+        return
+
+    if op == "edit":
+        data.rename(habit, event["name"])
+        habit.description = event["description"]
+        habit.revision += 1
+    elif op == "delete":
+        data.remove(habit)
+    elif op == "done":
+        add_completion(data, habit, event["day"])
+    else:
+        logger.warning("Unknown event '%s' ignored.", op)
+
+def add_completion(data, habit, day):
+    """
+    Add a completed day to a habit in memory, keeping its streak state,
+    revision and the dataset rollups up to date. Returns False if it was
+    already done that day. Persisting it is up to the caller.
+    """
+    ordinal = to_ordinal(day)
+    if not habit.completed_days.add(ordinal):
+        return False
+    note_completion(habit, ordinal)
+    habit.revision += 1
+    data.completion_added(habit, ordinal)
+    return True
+
+# ----- Merging -----
+# A process writing with an outdated copy (another process wrote since it
+# loaded) has its events replayed on top of the stored data instead of
+# overwriting it. Events are changes, not snapshots, so most of them merge
+# as they are: two completions just both get added.
+#
+# Events may also be older than the copy they are applied to, e.g. a habit
+# built at the add prompt while the session reloaded its data, so every
+# batch of new events is rebased before it is applied.
+
+def rebase_events(data, events):
+    """
+    Adapt events made against an older copy to data, the current one, and
+    return them. A new habit whose ID was taken meanwhile gets the next free
+    ID (updated in place, and in later events of the batch). Events for
+    habits deleted meanwhile are dropped by apply_event, and of two edits
+    of one habit the later one wins. Events that fit data already are
+    returned as they are.
+    """
+    moved = {}
+    rebased = []
+    for event in events:
+        if event["op"] == "add":
+            habit = event["habit"]
+            if not isinstance(habit, Habit):
+                habit = habit_from_dict(habit)
+                event = dict(event, habit=habit)
+            if habit.id in data.by_id:
+                new_id = get_new_id(data)
+                logger.info("Habit ID %d was taken by another process; '%s' gets ID %d.", habit.id, habit.name, new_id)
+                moved[habit.id] = new_id
+                habit.id = new_id
+        elif event.get("id") in moved:
+            event = dict(event, id=moved[event["id"]])
+        rebased.append(event)
+    return rebased
+
+def coalesce_events(events):
+    """
+    Drop events that later ones in the list make redundant: an edit followed
+    by another edit of the same habit, and everything about a habit that is
+    both added and deleted within the list. The IDs of such habits stay
+    used, through a "reserve" event at the end.
+    """
+    added = {event_habit_id(e) for e in events if e["op"] == "add"}
+    deleted = {e["id"] for e in events if e["op"] == "delete"}
+    never_stored = added & deleted
+    last_edit = {e["id"]: pos for pos, e in enumerate(events) if e["op"] == "edit"}
+
+    coalesced = [
+        event for pos, event in enumerate(events)
+        if event_habit_id(event) not in never_stored
+        and (event["op"] != "edit" or last_edit[event["id"]] == pos)
+    ]
+    if never_stored:
+        coalesced.append({"op": "reserve", "next_id": max(never_stored) + 1})
+    return coalesced
+
+def event_habit_id(event):
+    if event["op"] == "add":
+        habit = event["habit"]
+        return habit.id if isinstance(habit, Habit) else habit["id"]
+    return event.get("id")
 
 # ----- ID Management -----
 
@@ -72,11 +201,24 @@ def get_new_id(data):
     data["next_id"] += 1
     return new_id
 
-# ----- Lookup Helper -----
+# ----- Lookup Helpers -----
 
 def find_habit_by_id(data, habit_id):
-    """Return habit dictionary with matching ID if found, or None if it doesn't exist."""
-    for habit in data['habits']:
-        if habit['id'] == habit_id:
-            return habit
-    return None
\ No newline at end of file
+    """Return the Habit with matching ID if found, or None if it doesn't exist."""
+    return data.by_id.get(habit_id)
+
+def find_habits_by_name(data, name):
+    """Return the habits whose name matches (case-insensitive), in ID order."""
+    return list(data.by_name.get(name_key(name), {}).values())
+
+def load_habit(habit_id):
+    """Fetch a single Habit straight from storage (indexed on the SQLite backend)."""
+    return get_backend().load_habit(habit_id)
+
+def completions_between(habit_id, start, end):
+    """Return sorted ISO dates completed for habit_id between start and end (inclusive)."""
+    return get_backend().completions_between(habit_id, start, end)
+
+def count_between(habit_id, start, end):
+    """Number of days completed for habit_id between start and end (inclusive)."""
+    return get_backend().count_between(habit_id, start, end)
@@ -1,18 +1,33 @@
 from habit_tracker.utils import logger
-from colorama import Fore, Style
 
 from habit_tracker.models.habit import Habit
 from habit_tracker.utils.input_handler import(get_non_empty_string, get_optional_string, get_valid_date, prompt_for_existing_habit, prompt_for_frequency, confirm_action)
-from habit_tracker.data_store import(load_habits, get_new_id, save_habits)
+from habit_tracker.data_store import(get_new_id, find_habits_by_name)
+from habit_tracker.repository import repository
 from habit_tracker.utils import logger
 
 """handles basic CRUD functions for instances of habits"""
 
 ### Add a Habit ###
 
+FREQUENCY_TYPES = ("daily", "weekly", "monthly")
+
+def build_habit(data, name, description="", frequency_type="daily", frequency_times=1):
+    """Validate the fields of a new habit and return it as a Habit with a fresh ID. Raises ValueError on invalid input."""
+    name = name.strip()
+    if not name:
+        raise ValueError("Input cannot be empty!")
+    if frequency_type not in FREQUENCY_TYPES:
+        raise ValueError(f"Frequency type must be one of: {', '.join(FREQUENCY_TYPES)}")
+    if frequency_times < 1:
+        raise ValueError("Please enter a number greater than 0.")
+    if find_habits_by_name(data, name):
+        raise ValueError(f"A habit named '{name}' already exists.")
+
+    return Habit(get_new_id(data), name, description.strip(), frequency_type, frequency_times)
+
 def add_habit():
-    data = load_habits()
-    new_id = get_new_id(data)
+    data = repository.get()
 
     try:
         name = get_non_empty_string("   Habit name: ")                     #input_handler.py checks for valid input
@@ -21,18 +36,28 @@ def add_habit():
         print(e)
         return
 
+    if find_habits_by_name(data, name):
+        print(f"   A habit named '{name}' already exists.")
+        logger.info(f"Duplicate habit name '{name}' rejected.")
+        return
+
     frequency_type, frequency_times = prompt_for_frequency()
 
-    new_habit = Habit(new_id, name, description, frequency_type, frequency_times)
+    try:
+        new_habit = build_habit(data, name, description, frequency_type, frequency_times)
+    except ValueError as e:
+        print(f"   {e}")
+        return
 
-    data["habits"].append(new_habit.to_dict())
-    save_habits(data)
+    repository.record({"op": "add", "habit": new_habit})
 
     logger.info(f"Habit '{name}' added successfully.")
 
 ### List Habits ###
 
 def list_habits(data):
+    from colorama import Fore, Style     # only the interactive menu needs colours; the CLI imports this module too
+
     if not data["habits"]:
         print("No habits found.")
         return False
@@ -50,12 +75,12 @@ def list_habits(data):
     print("   " + ("-"*47) + "\n")
 
     for habit in data["habits"]:
-        freq = habit["frequency"]
+        freq = habit.frequency
 
         print(
-            f"   {Fore.YELLOW}{habit['id']}{Style.RESET_ALL}: "
-            f"{Fore.LIGHTMAGENTA_EX}{habit['name']}{Style.RESET_ALL} - {Fore.LIGHTRED_EX}{habit['description']}{Style.RESET_ALL} "
-            f"{Fore.CYAN}({freq['times']}x {freq['type']}){Style.RESET_ALL}\n"
+            f"   {Fore.YELLOW}{habit.id}{Style.RESET_ALL}: "
+            f"{Fore.LIGHTMAGENTA_EX}{habit.name}{Style.RESET_ALL} - {Fore.LIGHTRED_EX}{habit.description}{Style.RESET_ALL} "
+            f"{Fore.CYAN}({freq.times}x {freq.type}){Style.RESET_ALL}\n"
         )
 
     return True
@@ -63,7 +88,7 @@ def list_habits(data):
 ### Edit Habit ###
 
 def edit_habit():
-    data = load_habits()
+    data = repository.get()
     list_habits(data)
     logger.debug("User entered edit-habit menu.")
 
@@ -76,22 +101,27 @@ def edit_habit():
         return
 
     try:
-        habit["name"] = get_non_empty_string("   New name: ")                              #input_handler.py checks for valid input
-        habit["description"] = get_optional_string("   New description (optional): ")      #input_handler.py checks for valid input
+        name = get_non_empty_string("   New name: ")                                     #input_handler.py checks for valid input
+        description = get_optional_string("   New description (optional): ")             #input_handler.py checks for valid input
     except ValueError as e:
         print(e)
         logger.info("Invalid input while editing habit.")
         return
 
-    save_habits(data)
-    logger.info(f"Habit '{habit['name']}' updated.")                                    ### Logger INFO example
+    if any(other is not habit for other in find_habits_by_name(data, name)):
+        print(f"   A habit named '{name}' already exists.")
+        logger.info(f"Duplicate habit name '{name}' rejected.")
+        return
+
+    repository.record({"op": "edit", "id": habit.id, "name": name, "description": description})
+    logger.info(f"Habit '{habit.name}' updated.")                                    ### Logger INFO example
     logger.debug("User exited edit-habit menu.")
     return
 
 ### Mark Habit Done ###
 
 def mark_habit_done_for_date(target_date=None):
-    data = load_habits()
+    data = repository.get()
     list_habits(data)
     logger.debug("User entered mark-habit-done menu.")
 
@@ -103,21 +133,23 @@ def mark_habit_done_for_date(target_date=None):
     if target_date is None:
         target_date = get_valid_date("Enter date (YYYY-MM-DD): ")
 
-    if target_date in habit["completed_days"]:
-        logger.info(
-            f"Habit '{habit['name']}' was already marked as done on {target_date}."
-        )
-        return
+    mark_done(habit, target_date)
+
+def mark_done(habit, target_date):
+    """Mark habit done on target_date (YYYY-MM-DD) without prompting. Returns False if it already was."""
+    if target_date in habit.completed_days:
+        logger.info("Habit '%s' was already marked as done on %s.", habit.name, target_date)
+        return False
 
-    habit["completed_days"].append(target_date)
-    save_habits(data)
+    repository.record({"op": "done", "id": habit.id, "day": target_date})
 
-    logger.info(f"Habit '{habit['name']}' marked done on {target_date}.")
+    logger.info("Habit '%s' marked done on %s.", habit.name, target_date)
+    return True
 
 ### Delete Habit ###
 
 def delete_habit():
-    data = load_habits()
+    data = repository.get()
     list_habits(data)
     logger.debug("User entered delete-habit menu.")
 
@@ -127,10 +159,9 @@ def delete_habit():
         return
 
     # Confirmation
-    if confirm_action(f"   Are you sure you want to delete '{habit['name']}'"):
-        data["habits"].remove(habit)
-        save_habits(data)
-        logger.info(f"Habit '{habit['name']}' deleted.")
+    if confirm_action(f"   Are you sure you want to delete '{habit.name}'"):
+        repository.record({"op": "delete", "id": habit.id})
+        logger.info(f"Habit '{habit.name}' deleted.")
     else:
-        logger.info(f"Deletion cancelled for habit '{habit['name']}'.")
+        logger.info(f"Deletion cancelled for habit '{habit.name}'.")
 
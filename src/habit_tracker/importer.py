@@ -0,0 +1,162 @@
+import csv
+import json
+import time
+from datetime import date
+
+from habit_tracker import data_store
+from habit_tracker.utils import logger
+
+"""Streaming bulk import of historical completions from CSV or JSONL.
+
+Rows name a habit (by ID or by name) and a date:
+
+    CSV:   habit,date              JSONL: {"habit": 3, "date": "2024-01-31"}
+           3,2024-01-31                   {"habit": "read", "date": "2024-02-01"}
+           read,2024-02-01
+
+The file is read row by row, so its size doesn't matter. Days already
+recorded are skipped (set semantics), and everything is committed in a
+single write, or in chunks of chunk_size completions if given.
+"""
+
+MAX_ERRORS_KEPT = 20
+
+# =========================
+# Readers
+# =========================
+
+def iter_csv(f):
+    """Yield (line_no, habit, day) from a CSV file with 'habit' and 'date' columns."""
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    columns = [c.strip().lower() for c in header]
+    if "habit" in columns and "date" in columns:
+        habit_col, date_col = columns.index("habit"), columns.index("date")
+    else:
+        # No header row: the first row is already data, in habit,date order
+        habit_col, date_col = 0, 1
+        yield 1, *_pick(header, habit_col, date_col)
+
+    for row in reader:
+        if row:
+            yield reader.line_num, *_pick(row, habit_col, date_col)
+
+def _pick(row, habit_col, date_col):
+    habit = row[habit_col].strip() if habit_col < len(row) else ""
+    day = row[date_col].strip() if date_col < len(row) else ""
+    return habit, day
+
+def iter_jsonl(f):
+    """Yield (line_no, habit, day) from a JSON-lines file of {"habit": ..., "date": ...} objects."""
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+            yield line_no, obj.get("habit", obj.get("habit_id")), obj.get("date", "")
+        except (json.JSONDecodeError, AttributeError):
+            yield line_no, None, None
+
+def iter_rows(f, fmt):
+    if fmt == "csv":
+        return iter_csv(f)
+    if fmt == "jsonl":
+        return iter_jsonl(f)
+    raise ValueError(f"Unknown import format: {fmt}")
+
+def detect_format(path):
+    """Guess the format from the file name (.jsonl / .ndjson -> jsonl, otherwise csv)."""
+    return "jsonl" if str(path).lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+# =========================
+# Import
+# =========================
+
+def parse_day(value):
+    """Return the ordinal of a strict YYYY-MM-DD string, or raise ValueError."""
+    if not isinstance(value, str) or len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"invalid date {value!r}")
+    return date.fromisoformat(value).toordinal()
+
+def resolve_habit(data, key):
+    """Find a habit by ID (int or digit string) or by unique name. Raises ValueError."""
+    if isinstance(key, int) or (isinstance(key, str) and key.strip().isdigit()):
+        habit = data_store.find_habit_by_id(data, int(key))
+        if habit is None:
+            raise ValueError(f"habit {key} not found")
+        return habit
+
+    if not isinstance(key, str) or not key.strip():
+        raise ValueError("missing habit")
+
+    matches = data_store.find_habits_by_name(data, key)
+    if not matches:
+        raise ValueError(f"habit '{key}' not found")
+    if len(matches) > 1:
+        raise ValueError(f"habit name '{key}' is ambiguous")
+    return matches[0]
+
+def import_completions(data, rows, chunk_size=None):
+    """
+    Add completions from rows of (line_no, habit, day) to data and persist them.
+
+    Returns a report dict with rows, imported, duplicates, errors (count),
+    error_messages (the first few), seconds and rows_per_second.
+    """
+    started = time.perf_counter()
+    habits = {}                     # row key -> Habit, so each key is resolved once
+    report = {"rows": 0, "imported": 0, "duplicates": 0, "errors": 0, "error_messages": []}
+    pending = []                    # events of the current chunk
+
+    def error(line_no, message):
+        report["errors"] += 1
+        if len(report["error_messages"]) < MAX_ERRORS_KEPT:
+            report["error_messages"].append(f"line {line_no}: {message}")
+
+    for line_no, key, value in rows:
+        report["rows"] += 1
+        try:
+            habit = habits.get(key) if isinstance(key, (int, str)) else None
+            if habit is None:
+                habit = resolve_habit(data, key)
+                habits[key] = habit
+            ordinal = parse_day(value)
+        except ValueError as e:
+            error(line_no, e)
+            continue
+
+        if not data_store.add_completion(data, habit, ordinal):
+            report["duplicates"] += 1
+            continue
+        report["imported"] += 1
+
+        # Already applied above, so later rows see it as a duplicate; the event
+        # persists it, and merges it should another process write meanwhile
+        pending.append({"op": "done", "id": habit.id, "day": value})
+        if chunk_size and len(pending) >= chunk_size:
+            data_store.record_events(data, pending, applied=True)
+            pending = []
+            # Merging with another process's write replaces data's habits
+            # with reloaded ones, so resolve the keys again from here on
+            habits.clear()
+
+    data_store.record_events(data, pending, applied=True)
+
+    report["seconds"] = time.perf_counter() - started
+    report["rows_per_second"] = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+
+    logger.info(
+        "Imported %d completions from %d rows (%d duplicates, %d errors) at %.0f rows/s.",
+        report["imported"], report["rows"], report["duplicates"], report["errors"], report["rows_per_second"],
+    )
+    return report
+
+def import_file(data, path, fmt=None, chunk_size=None):
+    """Stream a CSV or JSONL file into data. See import_completions for the report."""
+    fmt = fmt or detect_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return import_completions(data, iter_rows(f, fmt), chunk_size=chunk_size)
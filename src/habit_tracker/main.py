@@ -1,18 +1,16 @@
 from datetime import date
 from colorama import Fore, Style, init
 
+from habit_tracker import config
 from habit_tracker.utils import logger
 from habit_tracker.habit_crud import(add_habit, list_habits, edit_habit, delete_habit, mark_habit_done_for_date)
-from habit_tracker.data_store import(load_habits)
-from habit_tracker.utils.input_handler import(prompt_for_existing_habit)
-from habit_tracker.analysis.statistics import(print_block_legend, show_habit_details, show_overview, show_current_streaks, show_best_streaks, show_weekly_summary)
+from habit_tracker.repository import repository
+from habit_tracker.utils.input_handler import(get_optional_date, prompt_for_existing_habit)
 
 # =========================
 # Formatting helpers (UI)
 # =========================
 
-init(autoreset=True)
-
 def title(text):
     print(Fore.CYAN + "\n" + "   " + ("-" * 20) + Style.RESET_ALL)
     print(Style.BRIGHT + Fore.CYAN + f"   {text}" + Style.RESET_ALL)
@@ -40,10 +38,15 @@ def prompt(text="\n   Choose an option: "):
 # =========================
 
 def main():
+    init(autoreset=True)
     logger.debug("Habit Tracker started")
+    if config.WRITE_BEHIND:
+        repository.start_write_behind()
     
+    heading = f"Habit Tracker ({config.PROFILE})" if config.PROFILE else "Habit Tracker"
+
     while True:
-        title("Habit Tracker")
+        title(heading)
 
         option("1", "Manage habits")
         option("2", "Track habits")
@@ -60,6 +63,7 @@ def main():
         elif choice == "3":
             stats_menu()
         elif choice == "0":
+            repository.flush()
             title("Goodbye!")
             logger.debug("Habit Tracker stopped")
             break
@@ -84,7 +88,7 @@ def manage_habits_menu():
         choice = prompt()
 
         if choice == "1":
-            data = load_habits()
+            data = repository.get()
             list_habits(data)
         elif choice == "2":
             add_habit()
@@ -93,6 +97,7 @@ def manage_habits_menu():
         elif choice == "4":
             delete_habit()
         elif choice == "0":
+            repository.flush()
             return
         else:
             logger.info(f"Invalid menu choice: {choice}. Try again.")
@@ -117,6 +122,7 @@ def track_habits_menu():
         elif choice == "2":
             mark_habit_done_for_date()
         elif choice == "0":
+            repository.flush()
             return
         else:
             logger.info(f"Invalid menu choice: {choice}. Try again.")
@@ -126,6 +132,9 @@ def track_habits_menu():
 # =========================
 
 def stats_menu():
+    # Imported on first use: the statistics and calendar rendering aren't needed to show the main menu
+    from habit_tracker.analysis.statistics import(save_stats_cache, show_overview, show_current_streaks, show_best_streaks, show_weekly_summary)
+
     while True:
         smalltitle("Habit Statistics")
 
@@ -138,9 +147,11 @@ def stats_menu():
         option("0", "Back")
 
         choice = prompt()
-        data = load_habits()
+        data = repository.get()
 
         if choice == "0":
+            save_stats_cache()
+            repository.flush()
             return
 
         if not data["habits"]:
@@ -159,6 +170,7 @@ def stats_menu():
         elif choice == "3":
             smalltitle("Streaks")
 
+            # Both lists read the streak state kept on each habit
             smallertitle("Current Streaks")
             show_current_streaks(data)
 
@@ -169,7 +181,9 @@ def stats_menu():
         
         elif choice == "4":
             title("Weekly Summary")
-            show_weekly_summary(data)
+            since = get_optional_date("   From date (YYYY-MM-DD, Enter for all): ")
+            until = get_optional_date("   To date (YYYY-MM-DD, Enter for all): ")
+            show_weekly_summary(data, since, until)
             input("\n   Press Enter to continue...")
 
         elif choice == "5":
@@ -187,12 +201,10 @@ def show_habit_details_menu(data):
     if not habit:
         return
 
+    from habit_tracker.analysis.statistics import show_habit_details
     show_habit_details(habit)
 
 
-def run():
-    main()
-
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,212 @@
+import base64
+from datetime import date
+
+# Compact set of calendar days, used for a habit's completed_days.
+
+def to_ordinal(day):
+    """Accept an ISO string, a date or an ordinal and return the day ordinal."""
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        return date.fromisoformat(day).toordinal()
+    return day.toordinal()
+
+
+# Set bit positions for every possible byte value, for fast iteration
+_BIT_OFFSETS = tuple(
+    tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256)
+)
+
+
+class DaySet:
+    """
+    Set of days stored as a bitmap: bit k is day (start + k), where start is
+    the earliest day added so far.
+
+    Membership and insert are O(1), and counting the days in any window is a
+    popcount over the bytes covering it. It iterates in date order as ISO
+    strings, so code written for the old list of ISO strings keeps working.
+    """
+
+    __slots__ = ("_start", "_bits", "_count")
+
+    def __init__(self, days=()):
+        self._start = None          # ordinal of bit 0
+        self._bits = bytearray()
+        self._count = 0
+        for day in days:
+            self.add(day)
+
+    # ----- Set operations -----
+
+    def add(self, day):
+        """Add a day. Returns True if it was not in the set before."""
+        ordinal = to_ordinal(day)
+
+        if self._start is None:
+            self._start = ordinal
+        elif ordinal < self._start:
+            # Grow to the left by whole bytes so existing bit positions stay valid
+            shift_bytes = (self._start - ordinal + 7) // 8
+            self._bits[0:0] = bytes(shift_bytes)
+            self._start -= shift_bytes * 8
+
+        offset = ordinal - self._start
+        index, mask = offset >> 3, 1 << (offset & 7)
+
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index - len(self._bits) + 1))
+        elif self._bits[index] & mask:
+            return False
+
+        self._bits[index] |= mask
+        self._count += 1
+        return True
+
+    def __contains__(self, day):
+        if self._start is None:
+            return False
+        try:
+            offset = to_ordinal(day) - self._start
+        except (TypeError, ValueError):
+            return False
+        if offset < 0 or (offset >> 3) >= len(self._bits):
+            return False
+        return bool(self._bits[offset >> 3] & (1 << (offset & 7)))
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        fromordinal = date.fromordinal
+        return (fromordinal(ordinal).isoformat() for ordinal in self.ordinals())
+
+    def __eq__(self, other):
+        if isinstance(other, DaySet):
+            return list(self.ordinals()) == list(other.ordinals())
+        return NotImplemented
+
+    def __repr__(self):
+        return f"DaySet({list(self)!r})"
+
+    def ordinals(self, first=None, last=None):
+        """Yield the day ordinals in ascending order, optionally only first <= day <= last."""
+        start = self._start
+        if start is None:
+            return
+
+        if first is None and last is None:
+            for index, byte in enumerate(self._bits):
+                if byte:
+                    base = start + (index << 3)
+                    for bit in _BIT_OFFSETS[byte]:
+                        yield base + bit
+            return
+
+        # Only visit the bytes covering the window; filter the edge bits
+        lo = start if first is None else to_ordinal(first)
+        hi = start + len(self._bits) * 8 - 1 if last is None else to_ordinal(last)
+        lo_index = max((lo - start) >> 3, 0)
+        hi_index = min((hi - start) >> 3, len(self._bits) - 1)
+
+        for index in range(lo_index, hi_index + 1):
+            byte = self._bits[index]
+            if byte:
+                base = start + (index << 3)
+                for bit in _BIT_OFFSETS[byte]:
+                    if lo <= base + bit <= hi:
+                        yield base + bit
+
+    def bitmap(self):
+        """Return (start ordinal, bytes) of the raw bitmap; bit k is day start + k."""
+        return self._start, bytes(self._bits)
+
+    @classmethod
+    def from_bitmap(cls, start, bits):
+        """Build a DaySet from the (start ordinal, bytes) form returned by bitmap()."""
+        days = cls()
+        if start is not None and any(bits):
+            days._start = start
+            days._bits = bytearray(bits)
+            days._count = int.from_bytes(days._bits, "little").bit_count()
+        return days
+
+    # ----- Range queries -----
+    # The bitmap is ordered by date, so every query below only touches the
+    # bytes covering the requested window.
+
+    def between(self, first, last):
+        """Yield the days with first <= day <= last as ISO strings, in date order."""
+        fromordinal = date.fromordinal
+        return (fromordinal(ordinal).isoformat() for ordinal in self.ordinals(first, last))
+
+    def first(self):
+        """Earliest day in the set as an ordinal, or None if it is empty."""
+        for index, byte in enumerate(self._bits):
+            if byte:
+                return self._start + (index << 3) + _BIT_OFFSETS[byte][0]
+        return None
+
+    def last(self):
+        """Latest day in the set as an ordinal, or None if it is empty."""
+        bits = self._bits
+        for index in range(len(bits) - 1, -1, -1):
+            if bits[index]:
+                return self._start + (index << 3) + _BIT_OFFSETS[bits[index]][-1]
+        return None
+
+    def count_between(self, first, last):
+        """Number of days in the set with first <= day <= last (inclusive)."""
+        if self._start is None:
+            return 0
+
+        lo = max(to_ordinal(first) - self._start, 0)
+        hi = min(to_ordinal(last) - self._start, len(self._bits) * 8 - 1)
+        if lo > hi:
+            return 0
+
+        lo_index, hi_index = lo >> 3, hi >> 3
+        window = int.from_bytes(self._bits[lo_index:hi_index + 1], "little")
+
+        # Drop the bits outside [lo, hi] in the first and last byte
+        window >>= lo & 7
+        window &= (1 << (hi - lo + 1)) - 1
+        return window.bit_count()
+
+    def count_week(self, day):
+        """Number of days in the set in the ISO week (Monday-Sunday) containing day."""
+        ordinal = to_ordinal(day)
+        monday = ordinal - date.fromordinal(ordinal).weekday()
+        return self.count_between(monday, monday + 6)
+
+    def count_month(self, year, month):
+        """Number of days in the set in the given calendar month."""
+        first = date(year, month, 1).toordinal()
+        next_first = date(year + month // 12, month % 12 + 1, 1).toordinal()
+        return self.count_between(first, next_first - 1)
+
+    # ----- JSON codec -----
+
+    def to_json(self, compact=False):
+        """Return the JSON form: a list of ISO dates, or a base64 bitmap when compact."""
+        if not compact:
+            return list(self)
+        if self._start is None:
+            return {"start": None, "bits": ""}
+
+        # Trim any trailing empty bytes
+        bits = bytes(self._bits).rstrip(b"\0")
+        return {
+            "start": date.fromordinal(self._start).isoformat(),
+            "bits": base64.b64encode(bits).decode("ascii"),
+        }
+
+    @classmethod
+    def from_json(cls, value):
+        """Build a DaySet from either JSON form produced by to_json."""
+        if isinstance(value, dict):
+            if not value.get("start"):
+                return cls()
+            start = date.fromisoformat(value["start"]).toordinal()
+            return cls.from_bitmap(start, base64.b64decode(value["bits"]))
+        return cls(value)
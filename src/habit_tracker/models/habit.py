@@ -1,21 +1,54 @@
-# describes the structure of the Habit class 
-    
+# describes the structure of the Habit class
+from collections import namedtuple     # not typing.NamedTuple: importing typing slows down every start
+
+from habit_tracker.models.day_set import DaySet
+
+
+class Frequency(namedtuple("Frequency", ("type", "times"), defaults=("daily", 1))):
+    """How often a habit should be done, e.g. 3x weekly. Immutable value type."""
+    __slots__ = ()
+
+    def to_dict(self):
+        return {"type": self.type, "times": self.times}
+
+
 class Habit:
-    def __init__(self, id, name, description="", frequency_type="daily", frequency_times=1):
+    __slots__ = ("id", "name", "description", "frequency", "completed_days", "streak", "revision")
+
+    def __init__(self, id, name, description="", frequency_type="daily", frequency_times=1, completed_days=None, streak=None, revision=0):
         self.id = id
         self.name = name
         self.description = description
-        self.frequency = {
-            "type": frequency_type,
-            "times": frequency_times
-        }
-        self.completed_days = []
+        self.frequency = Frequency(frequency_type, frequency_times)
+        self.completed_days = completed_days if completed_days is not None else DaySet()
+        self.streak = streak        # StreakState, maintained by data_store; None until first needed
+        self.revision = revision    # bumped on every change, so cached statistics can tell they are stale
+
+    def __repr__(self):
+        return f"Habit(id={self.id!r}, name={self.name!r}, frequency={self.frequency.times}x {self.frequency.type})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Habit):
+            return NotImplemented
+        return (
+            self.id == other.id
+            and self.name == other.name
+            and self.description == other.description
+            and self.frequency == other.frequency
+            and self.completed_days == other.completed_days
+        )
+
+    __hash__ = None
 
     def to_dict(self):
-        return {
+        d = {
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "frequency": self.frequency,
-            "completed_days": self.completed_days
+            "frequency": self.frequency.to_dict(),
+            "completed_days": self.completed_days,
+            "revision": self.revision,
         }
+        if self.streak is not None:
+            d["streak"] = self.streak.to_dict()
+        return d
@@ -0,0 +1,118 @@
+import threading
+from bisect import bisect_left
+from datetime import date
+
+from habit_tracker.analysis.aggregate import month_key, week_key
+from habit_tracker.models.rollups import Rollups
+
+# In-memory container for loaded habit data with lookup indexes.
+
+def name_key(name):
+    """Normalize a habit name for duplicate checks (case-insensitive, trimmed)."""
+    return name.strip().casefold()
+
+
+class HabitData(dict):
+    """
+    The loaded {"next_id": ..., "habits": [Habit, ...]} document plus two indexes:
+
+    - by_id:   habit ID -> Habit
+    - by_name: normalized name -> {habit ID: Habit}
+
+    and data["rollups"], the dataset-wide totals (see Rollups), which are
+    saved with the document. data["version"] counts committed changes and is
+    maintained by the storage backends.
+
+    It is still a plain dict to the rest of the app. Use add(), remove(),
+    rename() and completion_added() so the indexes and rollups stay in sync.
+
+    lock is for data shared between threads (the HTTP server stores changes
+    on a separate thread): the storage backends hold it while they change
+    data in memory, never during file or database I/O, and readers on other
+    threads hold it while they look at the data.
+    """
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.lock = threading.RLock()
+        self.reindex()
+
+    def reindex(self):
+        self.by_id = {}
+        self.by_name = {}
+        for habit in self["habits"]:
+            self.by_id[habit.id] = habit
+            self.by_name.setdefault(name_key(habit.name), {})[habit.id] = habit
+        self["rollups"] = load_rollups(self.get("rollups"), self["habits"])
+
+    def replace(self, other):
+        """Take over the contents and indexes of other, e.g. a copy just reloaded from storage."""
+        self.clear()
+        self.update(other)
+        self.by_id = other.by_id
+        self.by_name = other.by_name
+
+    @property
+    def rollups(self):
+        return self["rollups"]
+
+    def add(self, habit):
+        self["habits"].append(habit)
+        self.by_id[habit.id] = habit
+        self.by_name.setdefault(name_key(habit.name), {})[habit.id] = habit
+        self.rollups.add_habit(habit)
+
+    def remove(self, habit):
+        habits = self["habits"]
+
+        # Habits are appended with increasing IDs, so the list is sorted by ID
+        # and the position can be found by binary search instead of a scan.
+        pos = bisect_left(habits, habit.id, key=lambda h: h.id)
+        if pos < len(habits) and habits[pos] is habit:
+            del habits[pos]
+        else:
+            habits.remove(habit)
+
+        del self.by_id[habit.id]
+        self._unindex_name(habit)
+        self.rollups.remove_habit(habit)
+
+    def rename(self, habit, name):
+        self._unindex_name(habit)
+        habit.name = name
+        self.by_name.setdefault(name_key(name), {})[habit.id] = habit
+
+    def completion_added(self, habit, ordinal):
+        """Update the rollups after a day was added to habit.completed_days."""
+        self.rollups.add_day(habit, ordinal)
+
+    def _unindex_name(self, habit):
+        key = name_key(habit.name)
+        same_name = self.by_name.get(key)
+        if same_name is not None:
+            same_name.pop(habit.id, None)
+            if not same_name:
+                del self.by_name[key]
+
+
+def load_rollups(stored, habits):
+    """Use the stored rollups if they still match the habits (total, current week and month), otherwise rebuild them."""
+    if isinstance(stored, dict):
+        try:
+            if stored["total"] == sum(len(h.completed_days) for h in habits):
+                rollups = Rollups.from_dict(stored, habits)
+                if current_windows_match(rollups, habits):
+                    return rollups
+        except (KeyError, ValueError, AttributeError):
+            pass
+    return Rollups.build(habits)
+
+def current_windows_match(rollups, habits, today=None):
+    """Check the rollups' current week and month against the habits' own day sets."""
+    today = today or date.today()
+    week = sum(h.completed_days.count_week(today) for h in habits)
+    month = sum(h.completed_days.count_month(today.year, today.month) for h in habits)
+    return (
+        rollups.weeks.get(week_key(today.toordinal()), 0) == week
+        and rollups.months.get(month_key(today), 0) == month
+    )
@@ -0,0 +1,161 @@
+import heapq
+from collections import Counter
+from datetime import date
+
+from habit_tracker.analysis.aggregate import aggregate, month_key, week_key
+
+# Dataset-wide totals, kept up to date on every write and stored with the data.
+
+
+class Rollups:
+    """
+    Completion totals over all habits:
+
+    - total:   number of completions
+    - weeks:   completions per ISO week key
+    - months:  completions per month key (see analysis.aggregate)
+    - counts:  completions per habit ID, ranked by two heaps for the most
+               and least completed habit
+
+    total, weeks and months are persisted; the counts are rebuilt from the
+    habits' own (O(1)) lengths on load. The completions per week and habit
+    behind the weekly summary are built on first use (see habit_weeks) and
+    kept up to date from then on.
+    """
+
+    __slots__ = ("total", "weeks", "months", "counts", "_most", "_least", "_week_habits")
+
+    def __init__(self, total=0, weeks=None, months=None, counts=None):
+        self.total = total
+        self.weeks = weeks if weeks is not None else Counter()
+        self.months = months if months is not None else Counter()
+        self.counts = counts if counts is not None else {}
+        self._week_habits = None
+        self._rerank()
+
+    def __eq__(self, other):
+        if not isinstance(other, Rollups):
+            return NotImplemented
+        return self.to_dict() == other.to_dict() and self.counts == other.counts
+
+    __hash__ = None
+
+    @classmethod
+    def build(cls, habits):
+        """Compute the rollups from scratch, one aggregation pass per habit."""
+        rollups = cls(counts={h.id: len(h.completed_days) for h in habits})
+        for habit in habits:
+            counts = aggregate(habit)
+            rollups.total += len(habit.completed_days)
+            rollups.weeks.update(counts.weeks)
+            rollups.months.update(counts.months)
+        return rollups
+
+    # ----- Maintenance -----
+
+    def add_habit(self, habit):
+        self._rank(habit.id, len(habit.completed_days))
+        if habit.completed_days:
+            counts = aggregate(habit)
+            self.total += len(habit.completed_days)
+            self.weeks.update(counts.weeks)
+            self.months.update(counts.months)
+            if self._week_habits is not None:
+                for week, count in counts.weeks.items():
+                    self._week_habits.setdefault(week, {})[habit.id] = count
+
+    def remove_habit(self, habit):
+        self.counts.pop(habit.id, None)     # its heap entries are skipped from now on
+        if habit.completed_days:
+            counts = aggregate(habit)
+            self.total -= len(habit.completed_days)
+            self.weeks.subtract(counts.weeks)
+            self.months.subtract(counts.months)
+            self.weeks = +self.weeks            # drop periods that fell to zero
+            self.months = +self.months
+            if self._week_habits is not None:
+                for week in counts.weeks:
+                    in_week = self._week_habits[week]
+                    del in_week[habit.id]
+                    if not in_week:
+                        del self._week_habits[week]
+
+    def add_day(self, habit, ordinal):
+        """Account for a day just added to habit.completed_days."""
+        self._rank(habit.id, len(habit.completed_days))
+
+        week = week_key(ordinal)
+        self.total += 1
+        self.weeks[week] += 1
+        self.months[month_key(date.fromordinal(ordinal))] += 1
+        if self._week_habits is not None:
+            in_week = self._week_habits.setdefault(week, {})
+            in_week[habit.id] = in_week.get(habit.id, 0) + 1
+
+    # ----- Ranking -----
+    # Lazy heaps: a changed count is pushed again and the outdated entries
+    # are dropped when they reach the top, so a check-in is O(log n).
+
+    def _rank(self, habit_id, count):
+        self.counts[habit_id] = count
+        heapq.heappush(self._most, (-count, -habit_id))
+        heapq.heappush(self._least, (count, habit_id))
+        if len(self._least) > 2 * len(self.counts) + 64:
+            self._rerank()
+
+    def _rerank(self):
+        self._most = [(-count, -habit_id) for habit_id, count in self.counts.items()]
+        self._least = [(count, habit_id) for habit_id, count in self.counts.items()]
+        heapq.heapify(self._most)
+        heapq.heapify(self._least)
+
+    def _is_current(self, habit_id, count):
+        return self.counts.get(habit_id) == count
+
+    # ----- Lookups -----
+
+    def most_completed(self):
+        """ID of the habit with the most completions (the highest ID on a tie), or None."""
+        most = self._most
+        while most and not self._is_current(-most[0][1], -most[0][0]):
+            heapq.heappop(most)
+        return -most[0][1] if most else None
+
+    def least_completed(self):
+        """ID of the habit with the fewest completions (the lowest ID on a tie), or None."""
+        least = self._least
+        while least and not self._is_current(least[0][1], least[0][0]):
+            heapq.heappop(least)
+        return least[0][1] if least else None
+
+    def habit_weeks(self, habits):
+        """
+        {week key: {habit ID: completions}} for the weeks with any completion,
+        built from habits (one aggregation pass each) on the first call.
+        """
+        if self._week_habits is None:
+            week_habits = {}
+            for habit in habits:
+                for week, count in aggregate(habit).weeks.items():
+                    week_habits.setdefault(week, {})[habit.id] = count
+            self._week_habits = week_habits
+        return self._week_habits
+
+    # ----- JSON codec -----
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "weeks": {str(key): count for key, count in sorted(self.weeks.items())},
+            "months": {str(key): count for key, count in sorted(self.months.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, d, habits):
+        """Restore persisted rollups; the per-habit counts come from habits."""
+        return cls(
+            d["total"],
+            Counter({int(key): count for key, count in d["weeks"].items()}),
+            Counter({int(key): count for key, count in d["months"].items()}),
+            {h.id: len(h.completed_days) for h in habits},
+        )
@@ -0,0 +1,128 @@
+from habit_tracker.analysis import numpy_engine
+from habit_tracker.analysis.aggregate import aggregate, period_key
+
+# Persisted, incrementally maintained streak state of a habit.
+
+
+class StreakState:
+    """
+    Running streak totals for one habit, stored with the habit so streaks
+    don't need a pass over its whole history.
+
+    - period:          latest period (day/week/month key) with any completion
+    - period_count:    completions in that period
+    - run:             length of the qualifying run ending at last_qualifying
+    - last_qualifying: latest period that reached the required count
+    - best:            longest qualifying run
+    - count:           completions covered, to spot a state that is out of date
+
+    Appending a completion in the latest period or a later one is O(1).
+    Anything earlier (a back-dated check-in) can change past runs, so the
+    state has to be rebuilt with compute().
+    """
+
+    __slots__ = ("period", "period_count", "run", "last_qualifying", "best", "count")
+
+    def __init__(self, period=None, period_count=0, run=0, last_qualifying=None, best=0, count=0):
+        self.period = period
+        self.period_count = period_count
+        self.run = run
+        self.last_qualifying = last_qualifying
+        self.best = best
+        self.count = count
+
+    def __repr__(self):
+        return f"StreakState(current={self.current}, best={self.best}, count={self.count})"
+
+    @property
+    def current(self):
+        """Qualifying run ending at the latest period with any completion."""
+        if self.period is None or self.last_qualifying != self.period:
+            return 0
+        return self.run
+
+    def record(self, ordinal, frequency):
+        """
+        Account for a newly added completion day.
+
+        Returns False, leaving the state untouched, if the day falls before
+        the latest period; the caller must then rebuild the state.
+        """
+        key = period_key(ordinal, frequency.type)
+
+        if self.period is None or key > self.period:
+            self.period = key
+            self.period_count = 1
+        elif key == self.period:
+            self.period_count += 1
+        else:
+            return False
+
+        self.count += 1
+
+        if self.period_count == frequency.times:
+            # This period just qualified; it can only extend the run before it
+            self.run = self.run + 1 if self.last_qualifying == key - 1 else 1
+            self.last_qualifying = key
+            self.best = max(self.best, self.run)
+        return True
+
+    @classmethod
+    def compute(cls, habit):
+        """Build the state from a habit's full completion history."""
+        if numpy_engine.enabled():
+            return cls(*numpy_engine.streak_fields(habit), count=len(habit.completed_days))
+
+        counts = aggregate(habit).for_type(habit.frequency.type)
+        state = cls(count=len(habit.completed_days))
+        if not counts:
+            return state
+
+        state.period = max(counts)
+        state.period_count = counts[state.period]
+
+        previous = None
+        for key in sorted(k for k, n in counts.items() if n >= habit.frequency.times):
+            state.run = state.run + 1 if previous is not None and key == previous + 1 else 1
+            state.best = max(state.best, state.run)
+            previous = key
+        state.last_qualifying = previous
+
+        return state
+
+    def to_dict(self):
+        return {
+            "period": self.period,
+            "period_count": self.period_count,
+            "run": self.run,
+            "last_qualifying": self.last_qualifying,
+            "best": self.best,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d.get("period"),
+            d.get("period_count", 0),
+            d.get("run", 0),
+            d.get("last_qualifying"),
+            d.get("best", 0),
+            d.get("count", 0),
+        )
+
+
+def streak_state(habit):
+    """Return the habit's streak state, rebuilding it if missing or out of date."""
+    state = habit.streak
+    if state is None or state.count != len(habit.completed_days):
+        state = habit.streak = StreakState.compute(habit)
+    return state
+
+def note_completion(habit, ordinal):
+    """Update the habit's streak state for a newly added day (O(1) unless back-dated)."""
+    state = habit.streak
+    if state is None:
+        return      # built lazily on the next streak_state() call
+    if state.count != len(habit.completed_days) - 1 or not state.record(ordinal, habit.frequency):
+        habit.streak = None
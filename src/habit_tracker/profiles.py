@@ -0,0 +1,121 @@
+import json
+import re
+from datetime import date
+
+from habit_tracker import config, data_store
+from habit_tracker.storage import atomic_write
+from habit_tracker.utils import logger
+
+"""Per-user profiles, each stored in its own shard under config.PROFILES_DIR.
+
+    data/profiles/<name>/habits.json      (+ habits.journal)   JSON backend
+    data/profiles/<name>/habits.db                             SQLite backend
+
+Selecting a profile points config.DATA_PATH, JOURNAL_PATH and SQLITE_PATH at
+its shard, so loading, saving and statistics only ever touch that user's
+data. config.PROFILES_MANIFEST lists the known profiles, so listing them or
+reporting over all of them doesn't have to open every shard.
+
+Without a profile the app keeps using the single files in config.
+"""
+
+MANIFEST_VERSION = 1
+
+NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+# =========================
+# Paths
+# =========================
+
+def validate_name(name):
+    """Return name if it is a valid profile name, else raise ValueError."""
+    if not isinstance(name, str) or not NAME_PATTERN.fullmatch(name):
+        raise ValueError(
+            f"Invalid profile name: {name!r} (use up to 64 letters, digits, '-' or '_')"
+        )
+    return name
+
+def profile_dir(name):
+    return config.PROFILES_DIR / validate_name(name)
+
+def profile_paths(name):
+    """Return (data_path, journal_path, sqlite_path) of a profile's shard."""
+    directory = profile_dir(name)
+    return directory / "habits.json", directory / "habits.journal", directory / "habits.db"
+
+def shard_path(name, backend=None):
+    """The file holding a profile's habits with the given (default: configured) backend."""
+    data_path, _, sqlite_path = profile_paths(name)
+    return sqlite_path if (backend or config.STORAGE_BACKEND) == "sqlite" else data_path
+
+# =========================
+# Selecting a profile
+# =========================
+
+def use_profile(name):
+    """
+    Point storage at the shard of profile name, registering it if new.
+
+    Call this at startup, before anything is loaded: data loaded or cached
+    for the previous profile is not carried over.
+    """
+    config.DATA_PATH, config.JOURNAL_PATH, config.SQLITE_PATH = profile_paths(name)
+    config.PROFILE = name
+    data_store.reset_backend()
+    register(name)
+    logger.debug("Using profile '%s'.", name)
+
+# =========================
+# Manifest
+# =========================
+# {"version": 1, "profiles": {"alice": {"created": "2024-01-31", "backend": "json"}}}
+
+def load_manifest():
+    """Return the manifest, rebuilding it from the profile directories if missing or unreadable."""
+    try:
+        manifest = json.loads(config.PROFILES_MANIFEST.read_text(encoding="utf-8"))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning("Profile manifest unreadable (%s). Rebuilding it.", e)
+    return scan_profiles()
+
+def save_manifest(manifest):
+    payload = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    atomic_write(config.PROFILES_MANIFEST, payload)
+
+def scan_profiles():
+    """Build a manifest from the shards found under PROFILES_DIR."""
+    profiles = {}
+    if config.PROFILES_DIR.is_dir():
+        for directory in sorted(config.PROFILES_DIR.iterdir()):
+            if not directory.is_dir() or not NAME_PATTERN.fullmatch(directory.name):
+                continue
+            backend = "sqlite" if (directory / "habits.db").exists() else "json"
+            created = date.fromtimestamp(directory.stat().st_mtime).isoformat()
+            profiles[directory.name] = {"created": created, "backend": backend}
+    return {"version": MANIFEST_VERSION, "profiles": profiles}
+
+def register(name):
+    """Add name to the manifest if it isn't listed yet."""
+    manifest = load_manifest()
+    if name in manifest["profiles"] and config.PROFILES_MANIFEST.exists():
+        return
+    manifest["profiles"][name] = {"created": date.today().isoformat(), "backend": config.STORAGE_BACKEND}
+    save_manifest(manifest)
+    logger.debug("Profile '%s' added to the manifest.", name)
+
+def list_profiles():
+    """Return [(name, entry)] for every known profile, sorted by name, with the shard path filled in."""
+    profiles = []
+    for name, entry in sorted(load_manifest()["profiles"].items()):
+        entry = dict(entry, path=str(shard_path(name, entry.get("backend"))))
+        profiles.append((name, entry))
+    return profiles
+
+def shard_paths():
+    """Existing shard files of all profiles, e.g. for batch.run_batch."""
+    paths = (shard_path(name, entry.get("backend")) for name, entry in load_manifest()["profiles"].items())
+    return [path for path in sorted(paths) if path.is_file()]
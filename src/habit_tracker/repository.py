@@ -0,0 +1,165 @@
+import atexit
+import signal
+import threading
+import time
+
+from habit_tracker import config, data_store
+from habit_tracker.utils import logger
+
+# Session-level cache of the loaded habit data. #
+# Menus and CRUD functions share one loaded copy instead of re-reading
+# storage on every loop. The copy is reloaded only when the storage
+# signature (file mtimes/sizes) changes behind our back.
+#
+# In write-behind mode (interactive sessions, see start_write_behind) changes
+# are applied to the copy right away but stored later, several in one write.
+# A timer thread stores them when the oldest has waited long enough, so they
+# don't wait for the next change while the menu sits at a prompt; _lock keeps
+# it from flushing in the middle of a get() or record().
+
+class HabitRepository:
+    def __init__(self):
+        self._data = None
+        self._signature = None
+        self.write_behind = False
+        self._pending = []              # events applied to _data but not stored yet
+        self._pending_since = None      # time.monotonic() of the oldest pending event
+        self._timer = None              # flushes once the oldest pending event is due
+        self._lock = threading.RLock()
+
+    def get(self):
+        """Return the session's habit data, reloading only if storage changed."""
+        with self._lock:
+            return self._get()
+
+    def _get(self):
+        signature = data_store.get_backend().signature()
+
+        if self._pending and (signature is None or signature != self._signature):
+            # Another process wrote: store our changes now so they are merged
+            # into its data (see data_store.rebase_events) rather than dropped
+            self.flush()
+            return self._data
+
+        if self._data is None or signature is None or signature != self._signature:
+            if self._data is not None:
+                logger.debug("Habit data changed on disk. Reloading.")
+            self._data = data_store.load_habits()
+            # Loading may create or compact files, so fingerprint afterwards
+            self._signature = data_store.get_backend().signature()
+
+        self._flush_if_due()
+        return self._data
+
+    def record(self, event):
+        """Apply and persist a single change to the session data."""
+        self.record_many([event])
+
+    def record_many(self, events):
+        """Apply and persist several changes in a single write (deferred in write-behind mode)."""
+        with self._lock:
+            self._record_many(events)
+
+    def _record_many(self, events):
+        data = self._get()
+
+        if not self.write_behind:
+            data_store.record_events(data, events)
+            self._signature = data_store.get_backend().signature()
+            return
+
+        # The events may have been built against the copy get() just replaced
+        events = data_store.rebase_events(data, events)
+        for event in events:
+            data_store.apply_event(data, event)
+        self._pending.extend(events)
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+            self._start_timer()
+        self._flush_if_due()
+
+    # ----- Write-behind -----
+
+    def start_write_behind(self):
+        """
+        Hold changes back and store them in batches: once WRITE_BEHIND_MAX_EVENTS
+        are pending or the oldest is WRITE_BEHIND_MAX_SECONDS old (from a timer
+        thread, so also while the session is idle), on flush(), at exit and on
+        SIGTERM/SIGHUP.
+        """
+        if self.write_behind:
+            return
+        self.write_behind = True
+        atexit.register(self.flush)
+        for name in ("SIGTERM", "SIGHUP"):
+            signum = getattr(signal, name, None)       # SIGHUP doesn't exist on Windows
+            if signum is not None:
+                signal.signal(signum, _exit_on_signal)
+
+    def flush(self):
+        """Store all pending changes in one write."""
+        with self._lock:
+            if not self._pending:
+                return
+
+            events = data_store.coalesce_events(self._pending)
+            logger.debug("Storing %d pending changes (%d after coalescing).", len(self._pending), len(events))
+            data_store.record_events(self._data, events, applied=True)
+
+            self._pending = []
+            self._pending_since = None
+            self._signature = data_store.get_backend().signature()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _flush_if_due(self):
+        if not self._pending:
+            return
+        if (len(self._pending) >= config.WRITE_BEHIND_MAX_EVENTS
+                or time.monotonic() - self._pending_since >= config.WRITE_BEHIND_MAX_SECONDS):
+            self.flush()
+
+    def _start_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(config.WRITE_BEHIND_MAX_SECONDS, self._flush_on_timer)
+        self._timer.daemon = True       # the exit hooks flush what is left
+        self._timer.start()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+            try:
+                self.flush()
+            except Exception as e:
+                # Still pending: try again later (or on the next change, flush() or exit)
+                logger.error("Failed to store pending changes: %s", e)
+                self._start_timer()
+
+    # ----- Whole data -----
+
+    def save(self):
+        """Persist the full session data."""
+        with self._lock:
+            if self._data is None:
+                return
+            self.flush()
+            data_store.save_habits(self._data)
+            self._signature = data_store.get_backend().signature()
+
+    def invalidate(self):
+        """Drop the cached copy (storing pending changes first) so the next get() reloads from storage."""
+        with self._lock:
+            self.flush()
+            self._data = None
+            self._signature = None
+
+
+def _exit_on_signal(signum, frame):
+    # SystemExit unwinds normally, so the atexit flush still runs
+    raise SystemExit(128 + signum)
+
+
+# Shared instance used by main, habit_crud and the statistics menus
+repository = HabitRepository()
@@ -0,0 +1,371 @@
+import asyncio
+import json
+import re
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from datetime import date
+from http import HTTPStatus
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from habit_tracker import config, data_store
+from habit_tracker.analysis import statistics
+from habit_tracker.cli import habit_summary
+from habit_tracker.habit_crud import build_habit
+from habit_tracker.repository import repository
+from habit_tracker.utils import logger
+from habit_tracker.utils.input_handler import parse_date
+
+"""Local HTTP/JSON API for dashboards and mobile clients (stdlib asyncio only).
+
+    GET    /habits                       list habits
+    POST   /habits                       {"name", "description", "type", "times"}
+    GET    /habits/<id>                  one habit, with its streaks
+    PATCH  /habits/<id>                  {"name", "description"}
+    DELETE /habits/<id>
+    POST   /habits/<id>/done             {"date": "YYYY-MM-DD"} (default: today)
+    GET    /habits/<id>/completions      ?from=YYYY-MM-DD&to=YYYY-MM-DD[&count=1]
+    GET    /stats/overview
+    GET    /stats/streaks
+    GET    /stats/weekly                 ?since=...&until=...&top=N
+
+The data stays loaded in memory (the shared repository only reloads it if
+another process changed the files). The event loop only handles connections:
+every read and write is a function of the data, run one at a time on a
+single storage thread. So the repository is never used from two threads,
+a reload or the file lock never blocks the event loop, and each write is
+validated against the data as left by the one before, so two clients can
+never create the same habit name or interleave half-applied changes.
+"""
+
+MAX_BODY = 64 * 1024
+MAX_HEADER = 16 * 1024
+
+# =========================
+# HTTP
+# =========================
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: dict
+    body: bytes
+    keep_alive: bool
+
+    def param(self, name):
+        values = self.query.get(name)
+        return values[-1] if values else None
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            payload = json.loads(self.body)
+        except ValueError:
+            raise HttpError(400, "Request body is not valid JSON") from None
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Request body must be a JSON object")
+        return payload
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def read_request(reader):
+    """Read one request from the connection, or return None once the client has closed it."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise HttpError(400, "Incomplete request") from None
+    except asyncio.LimitOverrunError:
+        raise HttpError(431, "Request headers too large") from None
+
+    request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError:
+        raise HttpError(400, "Malformed request line") from None
+
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length") from None
+    if length > MAX_BODY:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length > 0 else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+    url = urlsplit(target)
+    return Request(method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), body, keep_alive)
+
+def encode_response(status, payload, keep_alive):
+    body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n"
+    )
+    return head.encode("latin-1") + body
+
+# =========================
+# Server
+# =========================
+
+class HabitServer:
+    def __init__(self):
+        self._storage = ThreadPoolExecutor(max_workers=1, thread_name_prefix="habit-storage")
+        self._routes = [
+            ("GET", r"/habits", self.list_habits),
+            ("POST", r"/habits", self.create_habit),
+            ("GET", r"/habits/(\d+)", self.get_habit),
+            ("PATCH", r"/habits/(\d+)", self.edit_habit),
+            ("DELETE", r"/habits/(\d+)", self.delete_habit),
+            ("POST", r"/habits/(\d+)/done", self.mark_done),
+            ("GET", r"/habits/(\d+)/completions", self.completions),
+            ("GET", r"/stats/overview", self.stats_overview),
+            ("GET", r"/stats/streaks", self.stats_streaks),
+            ("GET", r"/stats/weekly", self.stats_weekly),
+        ]
+        self._routes = [(method, re.compile(pattern), handler) for method, pattern, handler in self._routes]
+
+    async def serve(self, host, port, ready=None):
+        """Serve until cancelled. ready, if given, is called with the bound (host, port)."""
+        await self._on_storage(repository.get)      # load once up front, not on the first request
+
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER)
+        address = server.sockets[0].getsockname()[:2]
+        logger.info("Serving habits on http://%s:%s", *address)
+        if ready is not None:
+            ready(address)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._storage.shutdown(wait=True)      # let a running write finish
+            statistics.save_stats_cache()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as e:
+                    writer.write(encode_response(e.status, {"error": e.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                status, payload = await self.dispatch(request)
+                writer.write(encode_response(status, payload, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass        # client went away mid-request
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def dispatch(self, request):
+        """Route a request and turn errors into JSON error responses."""
+        allowed = False
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            allowed = True
+            if method != request.method:
+                continue
+
+            try:
+                return await handler(request, *(int(group) for group in match.groups()))
+            except HttpError as e:
+                return e.status, {"error": e.message}
+            except (ValueError, TypeError) as e:
+                return 400, {"error": str(e)}
+            except Exception:
+                logger.error("Request %s %s failed:\n%s", request.method, request.path, traceback.format_exc())
+                return 500, {"error": "Internal server error"}
+
+        if allowed:
+            return 405, {"error": f"{request.method} not allowed on {request.path}"}
+        return 404, {"error": f"Not found: {request.path}"}
+
+    # ----- Storage thread -----
+    # A read is a function (data) -> result and a write a function
+    # (data) -> (events, result), both run on the storage thread against the
+    # current data, which the repository reloads there if another process
+    # changed the files. Raising ValueError or HttpError rejects a request.
+
+    async def _on_storage(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._storage, func, *args)
+
+    async def read(self, query):
+        return await self._on_storage(self._read, query)
+
+    async def write(self, change):
+        return await self._on_storage(self._apply, change)
+
+    def _read(self, query):
+        data = repository.get()
+        with data.lock:
+            return query(data)
+
+    def _apply(self, change):
+        data = repository.get()
+        with data.lock:
+            # Under the lock too: a change may take a new habit ID from data
+            events, result = change(data)
+        if events:
+            repository.record_many(events)
+        return result
+
+    # ----- Habits -----
+
+    async def list_habits(self, request):
+        return 200, await self.read(lambda data: [habit_summary(h) for h in data["habits"]])
+
+    async def get_habit(self, request, habit_id):
+        def query(data):
+            habit = find_habit(data, habit_id)
+            current, best = statistics.habit_streaks(habit)
+            return dict(
+                habit_summary(habit), current_streak=current, best_streak=best,
+                this_period=statistics.period_count(habit),
+            )
+
+        return 200, await self.read(query)
+
+    async def create_habit(self, request):
+        body = request.json()
+
+        def change(data):
+            habit = build_habit(
+                data,
+                str(body.get("name", "")),
+                str(body.get("description", "")),
+                body.get("type", "daily"),
+                int(body.get("times", 1)),
+            )
+            return [{"op": "add", "habit": habit}], habit
+
+        habit = await self.write(change)
+        return 201, habit_summary(habit)
+
+    async def edit_habit(self, request, habit_id):
+        body = request.json()
+
+        def change(data):
+            habit = find_habit(data, habit_id)
+            name = str(body.get("name", habit.name)).strip()
+            if not name:
+                raise ValueError("Input cannot be empty!")
+            if any(other is not habit for other in data_store.find_habits_by_name(data, name)):
+                raise ValueError(f"A habit named '{name}' already exists.")
+            description = str(body.get("description", habit.description)).strip()
+            return [{"op": "edit", "id": habit_id, "name": name, "description": description}], habit
+
+        habit = await self.write(change)
+        return 200, habit_summary(habit)
+
+    async def delete_habit(self, request, habit_id):
+        def change(data):
+            find_habit(data, habit_id)
+            return [{"op": "delete", "id": habit_id}], None
+
+        await self.write(change)
+        return 200, {"deleted": habit_id}
+
+    async def mark_done(self, request, habit_id):
+        body = request.json()
+        value = body.get("date")
+        if value is not None and not isinstance(value, str):
+            raise HttpError(400, "'date' must be a YYYY-MM-DD string")
+        day = parse_date(value) if value else date.today().isoformat()
+
+        def change(data):
+            habit = find_habit(data, habit_id)
+            if day in habit.completed_days:
+                return [], "already_done"
+            return [{"op": "done", "id": habit_id, "day": day}], "marked"
+
+        status = await self.write(change)
+        return 200, {"id": habit_id, "date": day, "status": status}
+
+    async def completions(self, request, habit_id):
+        first, last = optional_date(request.param("from")), optional_date(request.param("to"))
+        count = bool(request.param("count"))
+
+        def query(data):
+            days = find_habit(data, habit_id).completed_days
+            if count:
+                return {"id": habit_id, "count": days.count_between(first or date.min, last or date.max)}
+            return list(days.between(first, last))
+
+        return 200, await self.read(query)
+
+    # ----- Statistics -----
+
+    async def stats_overview(self, request):
+        return 200, await self.read(statistics.overview)
+
+    async def stats_streaks(self, request):
+        def query(data):
+            rows = []
+            for habit in data["habits"]:
+                current, best = statistics.habit_streaks(habit)
+                rows.append({
+                    "id": habit.id, "name": habit.name, "current": current, "best": best,
+                    "this_period": statistics.period_count(habit),
+                })
+            return rows
+
+        return 200, await self.read(query)
+
+    async def stats_weekly(self, request):
+        since, until = optional_date(request.param("since")), optional_date(request.param("until"))
+        top = int(request.param("top")) if request.param("top") else None
+        return 200, await self.read(lambda data: statistics.weekly_summary(data, since, until, top))
+
+# ----- Helpers -----
+
+def find_habit(data, habit_id):
+    habit = data_store.find_habit_by_id(data, habit_id)
+    if habit is None:
+        raise HttpError(404, f"Habit {habit_id} not found")
+    return habit
+
+def optional_date(value):
+    return parse_date(value) if value else None
+
+# =========================
+# Entry point
+# =========================
+
+def run(host=None, port=None):
+    """Serve on host:port (default: config.SERVER_HOST / SERVER_PORT) until interrupted."""
+    host = host or config.SERVER_HOST
+    port = config.SERVER_PORT if port is None else port
+    try:
+        asyncio.run(HabitServer().serve(host, port))
+    except KeyboardInterrupt:
+        logger.info("Server stopped.")
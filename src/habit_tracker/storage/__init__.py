@@ -0,0 +1,194 @@
+# Storage backends used by data_store
+import os
+
+try:
+    import fcntl
+except ImportError:     # not on Windows: writes there are not guarded between processes
+    fcntl = None
+
+class StorageBackend:
+    """
+    Interface every storage backend implements.
+
+    Backends work on the same in-memory structure as the rest of the app:
+    a HabitData {"next_id": int, "habits": [Habit, ...], "version": int}. Single
+    changes go through record_event so backends can persist them without a
+    full rewrite.
+
+    "version" counts the changes ever committed. Several processes may write
+    the same store: a write made with data older than what is stored (a
+    lower version) is merged into the stored data by record_events (see
+    data_store.rebase_events), and refused by save with StaleDataError.
+    """
+
+    def load(self):
+        """Return the full data structure."""
+        raise NotImplementedError
+
+    def save(self, data):
+        """
+        Persist the full data structure, replacing what is stored. Raises
+        StaleDataError if another process changed the store since data was loaded.
+        """
+        raise NotImplementedError
+
+    def record_event(self, data, event):
+        """Apply a single change (see data_store.apply_event) and persist it."""
+        raise NotImplementedError
+
+    def signature(self):
+        """
+        Return a cheap fingerprint of what is stored (e.g. file mtimes and sizes).
+
+        It changes whenever the stored data changes, letting callers keep a loaded
+        copy until someone else writes. None means "unknown, always reload".
+        """
+        return None
+
+    def record_events(self, data, events, applied=False):
+        """
+        Apply and persist several changes; backends batch the write where they
+        can. With applied=True the events are already applied to data.
+
+        This default only handles applied=False, one record_event per event.
+        Backends must override it to support applied=True, which the
+        repository's write-behind mode (and the importer) rely on.
+        """
+        if applied:
+            raise NotImplementedError(f"{type(self).__name__} can't store events that are already applied")
+        for event in events:
+            self.record_event(data, event)
+
+    # ----- Single-habit queries -----
+    # For callers that need one habit rather than the whole data, e.g. the
+    # command line's show. This default loads everything; the SQLite backend
+    # answers them from its indexes.
+
+    def load_habit(self, habit_id):
+        """Return one Habit by ID, or None."""
+        from habit_tracker.data_store import find_habit_by_id
+        return find_habit_by_id(self.load(), habit_id)
+
+    def completions_between(self, habit_id, start, end):
+        """Return sorted ISO dates completed for habit_id with start <= day <= end (ISO strings)."""
+        habit = self.load_habit(habit_id)
+        if habit is None:
+            return []
+        return list(habit.completed_days.between(start, end))
+
+    def count_between(self, habit_id, start, end):
+        """Number of days completed for habit_id with start <= day <= end (ISO strings)."""
+        habit = self.load_habit(habit_id)
+        if habit is None:
+            return 0
+        return habit.completed_days.count_between(start, end)
+
+
+class StaleDataError(RuntimeError):
+    """A full save was attempted with data older than what is stored."""
+
+
+class FileLock:
+    """
+    Exclusive advisory lock (fcntl.flock) on path, used as a with block. The
+    lock file is created on first use and kept open between uses (reopened
+    in a forked child, which must not share the parent's lock). Not reentrant.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._pid = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        if self._file is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a")
+            self._pid = os.getpid()
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+
+def _create_temp(path):
+    """
+    Create a new temp file next to path; returns (fd, name). Same as
+    tempfile.mkstemp, which would add tempfile (and random, shutil) to the
+    imports of every command that writes.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        name = path.parent / f".{path.name}.{os.urandom(6).hex()}.tmp"
+        try:
+            return os.open(name, flags, 0o600), name
+        except FileExistsError:
+            continue
+
+
+def atomic_write(path, payload):
+    """
+    Replace path with payload (bytes) atomically.
+
+    The bytes go to a temp file in the same directory, are fsynced, and the
+    temp file is renamed over path, so readers and crashes only ever see the
+    old or the new content.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    # Persist the rename itself (not supported on every platform)
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def file_signature(*paths):
+    """Return (mtime_ns, size, inode) for each path, or None for missing files."""
+    signature = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            # The inode changes on every atomic replace, even within one mtime tick
+            signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(signature)
+
+
+def create_backend(name):
+    """Create the backend selected by config.STORAGE_BACKEND."""
+    from habit_tracker import config
+
+    if name == "json":
+        from habit_tracker.storage.json_backend import JsonBackend
+        return JsonBackend(config.DATA_PATH, config.JOURNAL_PATH)
+    if name == "sqlite":
+        from habit_tracker.storage.sqlite_backend import SqliteBackend
+        return SqliteBackend(config.SQLITE_PATH, config.DATA_PATH, config.JOURNAL_PATH)
+
+    raise ValueError(f"Unknown storage backend: {name}")
@@ -0,0 +1,261 @@
+import gzip
+import json
+from habit_tracker import config
+from habit_tracker.data_store import apply_event, habit_from_dict, rebase_events
+from habit_tracker.models.day_set import DaySet
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData
+from habit_tracker.models.rollups import Rollups
+from habit_tracker.storage import FileLock, StaleDataError, StorageBackend, atomic_write, file_signature
+from habit_tracker.utils import logger
+
+# JSON snapshot + append-only journal backend. #
+# Every read and write holds an exclusive lock on <data file>.lock, so other
+# processes never see a half-done compaction or interleave their writes.
+
+class JsonBackend(StorageBackend):
+    def __init__(self, data_path, journal_path):
+        self.data_path = data_path
+        self.journal_path = journal_path
+        self.lock = FileLock(data_path.with_name(data_path.name + ".lock"))
+        # Number of journal events written since the last snapshot
+        self.journal_events = 0
+        # (signature, version) of the files when this process last read or wrote them
+        self._seen = None
+
+    # ----- JSON / Data helpers -----
+
+    def load(self):
+        with self.lock:
+            data = self._read()
+            self._remember(data)
+        return data
+
+    def _read(self):
+        if not self.data_path.exists():
+            logger.warning("Habits file not found. Creating new file.")
+
+            self.data_path.parent.mkdir(parents=True, exist_ok=True)
+
+            initial_data = {"next_id": 1, "habits": [], "version": 0}
+            atomic_write(self.data_path, encode_document(initial_data))
+
+            return self.replay_journal(HabitData(initial_data))
+
+        try:
+            if self.data_path.stat().st_size == 0:
+                logger.warning("Habits file is empty. Reinitializing.")
+
+                initial_data = {"next_id": 1, "habits": [], "version": 0}
+                atomic_write(self.data_path, encode_document(initial_data))
+
+                return self.replay_journal(HabitData(initial_data))
+
+            json_data = decode_document(self.data_path.read_bytes())
+            logger.debug("Loaded %d habits from %s", len(json_data.get("habits", [])), self.data_path)
+
+            # ----- Backward compatibility -----
+            if "habits" not in json_data:
+                json_data["habits"] = []
+                logger.warning("Missing 'habits' key. Initialized empty list.")
+
+            if "next_id" not in json_data:
+                max_id = max((h["id"] for h in json_data.get("habits", [])), default=0)
+                json_data["next_id"] = max_id + 1
+                logger.debug("Added missing next_id field (starting at %d)", json_data["next_id"])
+
+            # Files written before versioning count from 0
+            json_data.setdefault("version", 0)
+
+            json_data["habits"] = [habit_from_dict(h) for h in json_data["habits"]]
+
+            return self.replay_journal(HabitData(json_data))
+
+        except (json.JSONDecodeError, UnicodeDecodeError, gzip.BadGzipFile) as e:
+            logger.error("Habits file is corrupted: %s", e)                  ### Logger ERROR example - corrupted file ###
+            raise
+
+    def save(self, data):
+        with self.lock:
+            if self._newer_stored(data) is not None:
+                raise StaleDataError(
+                    f"{self.data_path} was changed by another process since these habits were loaded"
+                )
+            data["version"] = data.get("version", 0) + 1
+            self._write_snapshot(data)
+            self._remember(data)
+
+    def _write_snapshot(self, data):
+        try:
+            # Ensure data directory exists
+            self.data_path.parent.mkdir(parents=True, exist_ok=True)
+
+            logger.debug("Saving %d habits to %s", len(data["habits"]), self.data_path)
+
+            # Written to a temp file and renamed over the old one, so a crash
+            # leaves either the old or the new snapshot, never a truncated one
+            atomic_write(self.data_path, encode_document(data))
+
+            # The snapshot now contains every journaled change
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self.journal_events = 0
+
+            logger.info("Habits saved successfully.")
+
+        except Exception as e:
+            logger.error("Failed to save habits: %s", e)
+            raise
+
+    def signature(self):
+        return file_signature(self.data_path, self.journal_path)
+
+    # ----- Versions -----
+    # Only called with the lock held.
+
+    def _remember(self, data):
+        self._seen = (self.signature(), data.get("version", 0))
+
+    def _newer_stored(self, data):
+        """
+        Return the stored data if it is newer than data, else None. Cheap when
+        nothing changed: the files are only re-read if their signature differs
+        from what this process last saw.
+        """
+        if self._seen == (self.signature(), data.get("version", 0)):
+            return None
+        if not self.data_path.exists() and not self.journal_path.exists():
+            return None     # nothing stored yet, e.g. the first save to a new path
+
+        stored = self._read()
+        self._remember(stored)
+        if stored["version"] == data.get("version", 0):
+            return None     # e.g. another process only compacted the journal
+        return stored
+
+    # ----- Journal -----
+    # Small changes are appended to journal_path as one JSON event per line
+    # instead of rewriting the whole snapshot. load replays the journal on
+    # top of the snapshot, and save folds it back in (compaction).
+
+    def replay_journal(self, data):
+        """Apply every event in the journal to data and return it."""
+        self.journal_events = 0
+
+        if not self.journal_path.exists():
+            return data
+
+        torn = False
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves at most one torn trailing line
+                    logger.warning("Skipping unreadable journal entry.")
+                    torn = True
+                    continue
+                apply_event(data, event, replay=True)
+                self.journal_events += 1
+
+        logger.debug("Replayed %d journal events.", self.journal_events)
+        data["version"] += self.journal_events
+
+        # Compact a torn journal right away so new events never land on a partial line
+        if torn or self.journal_events >= config.JOURNAL_COMPACT_EVERY:
+            self.compact(data)
+
+        return data
+
+    def record_event(self, data, event):
+        """Apply event to data and persist it, appending to the journal when enabled."""
+        self.record_events(data, [event])
+
+    def record_events(self, data, events, applied=False):
+        """
+        Apply events to data (unless already applied) and append them to the
+        journal in a single write. If another process wrote since data was
+        loaded, data is first brought up to date and the events are merged
+        into it (see data_store.rebase_events).
+        """
+        if not events:
+            return
+
+        with self.lock:
+            stored = self._newer_stored(data)
+            with data.lock:
+                if stored is not None:
+                    logger.debug("Habits changed in another process (version %d -> %d). Merging.",
+                                 data.get("version", 0), stored["version"])
+                    data.replace(stored)
+                    applied = False
+
+                if not applied:
+                    events = rebase_events(data, events)
+                    for event in events:
+                        apply_event(data, event)
+                data["version"] = data.get("version", 0) + len(events)
+
+            self._append(data, events)
+            self._remember(data)
+
+    def _append(self, data, events):
+        if not config.JOURNAL_ENABLED:
+            self._write_snapshot(data)
+            return
+
+        if self.journal_events + len(events) >= config.JOURNAL_COMPACT_EVERY:
+            # It would be compacted right away (e.g. a bulk import): skip the journal
+            self.compact(data)
+            return
+
+        lines = "".join(
+            json.dumps(event, separators=(",", ":"), default=encode_value) + "\n"
+            for event in events
+        )
+
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        self.journal_events += len(events)
+
+    def compact(self, data):
+        """Write a fresh snapshot and discard the journal (the version stays the same)."""
+        logger.debug("Compacting %d journal events into %s", self.journal_events, self.data_path)
+        self._write_snapshot(data)
+
+
+# ----- Encoding -----
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+def encode_document(data):
+    """Serialize data using config.JSON_INDENT and config.GZIP_DATA."""
+    if config.JSON_INDENT is None:
+        text = json.dumps(data, separators=(",", ":"), default=encode_value)
+    else:
+        text = json.dumps(data, indent=config.JSON_INDENT, default=encode_value)
+
+    payload = text.encode("utf-8")
+    if config.GZIP_DATA:
+        payload = gzip.compress(payload, compresslevel=6, mtime=0)
+    return payload
+
+def decode_document(payload):
+    """Parse a document written by encode_document, detecting gzip automatically."""
+    if payload.startswith(GZIP_MAGIC):
+        payload = gzip.decompress(payload)
+    return json.loads(payload.decode("utf-8"))
+
+def encode_value(value):
+    """json.dump hook for values the json module can't serialize on its own."""
+    if isinstance(value, DaySet):
+        return value.to_json(compact=config.COMPACT_COMPLETIONS)
+    if isinstance(value, Habit):
+        return value.to_dict()
+    if isinstance(value, Rollups):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,355 @@
+import json
+import sqlite3
+from datetime import date
+
+from habit_tracker.analysis.aggregate import month_key, week_key
+from habit_tracker.data_store import apply_event, habit_from_dict, rebase_events
+from habit_tracker.models.day_set import DaySet, to_ordinal
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData
+from habit_tracker.models.streak_state import StreakState
+from habit_tracker.storage import StaleDataError, StorageBackend, file_signature
+from habit_tracker.utils import logger
+
+# SQLite backend: one row per habit and one row per completion. #
+# Writes start with BEGIN IMMEDIATE, which takes SQLite's own write lock
+# before the version in meta is checked, so no file lock is needed.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS habits (
+    id              INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL,
+    description     TEXT NOT NULL DEFAULT '',
+    frequency_type  TEXT NOT NULL,
+    frequency_times INTEGER NOT NULL,
+    streak          TEXT,
+    revision        INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS completions (
+    habit_id INTEGER NOT NULL REFERENCES habits(id) ON DELETE CASCADE,
+    day      TEXT NOT NULL,
+    PRIMARY KEY (habit_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    period TEXT NOT NULL,           -- 'weeks' or 'months'
+    key    INTEGER NOT NULL,
+    count  INTEGER NOT NULL,
+    PRIMARY KEY (period, key)
+) WITHOUT ROWID;
+"""
+# The rollups' total is the 'completions' row of meta; without it (databases
+# from older versions) the rollups are rebuilt and stored on the next load.
+
+class SqliteBackend(StorageBackend):
+    def __init__(self, db_path, legacy_json_path=None, legacy_journal_path=None):
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self.legacy_journal_path = legacy_journal_path
+        self._conn = None
+
+    # ----- Connection -----
+
+    def connect(self):
+        if self._conn is None:
+            new_db = not self.db_path.exists()
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Used from more than one thread, though never at once: e.g. opened
+            # on the main thread and used by the server's storage thread or the
+            # write-behind timer
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+            self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('next_id', 1)")
+            self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+            self._conn.commit()
+
+            if new_db:
+                self._import_legacy_json()
+
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _migrate(self):
+        """Bring databases created by older versions up to the current schema."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(habits)")}
+        if "streak" not in columns:
+            self._conn.execute("ALTER TABLE habits ADD COLUMN streak TEXT")
+        if "revision" not in columns:
+            self._conn.execute("ALTER TABLE habits ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+
+    def _import_legacy_json(self):
+        """Seed a brand new database from an existing JSON habits file."""
+        path = self.legacy_json_path
+        if path is None or not path.exists() or path.stat().st_size == 0:
+            return
+
+        from habit_tracker.storage.json_backend import JsonBackend
+        logger.info("Importing habits from %s into %s", path, self.db_path)
+        data = JsonBackend(path, self.legacy_journal_path).load()
+        with self._conn:
+            self._replace_all(self._conn, data)
+
+    # ----- Full load / save -----
+
+    def load(self):
+        conn = self.connect()
+
+        next_id = conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()[0]
+        version = _stored_version(conn)
+
+        habits = []
+        by_id = {}
+        for habit_id, name, description, freq_type, freq_times, streak, revision in conn.execute(
+            "SELECT id, name, description, frequency_type, frequency_times, streak, revision FROM habits ORDER BY id"
+        ):
+            habit = Habit(habit_id, name, description, freq_type, freq_times, streak=_load_streak(streak), revision=revision)
+            habits.append(habit)
+            by_id[habit_id] = habit
+
+        for habit_id, day in conn.execute("SELECT habit_id, day FROM completions ORDER BY habit_id, day"):
+            by_id[habit_id].completed_days.add(day)
+
+        stored = _load_rollups(conn)
+        data = HabitData({"next_id": next_id, "habits": habits, "version": version, "rollups": stored})
+        if stored != data.rollups.to_dict():
+            # Rebuilt by HabitData: store them, within the caller's transaction if there is one
+            in_transaction = conn.in_transaction
+            _store_rollups(conn, data.rollups)
+            if not in_transaction:
+                conn.commit()
+
+        logger.debug("Loaded %d habits from %s", len(habits), self.db_path)
+        return data
+
+    def save(self, data):
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if _stored_version(conn) != data.get("version", 0):
+                    raise StaleDataError(
+                        f"{self.db_path} was changed by another process since these habits were loaded"
+                    )
+                data["version"] = data.get("version", 0) + 1
+                self._replace_all(conn, data)
+
+            logger.info("Habits saved successfully.")
+
+        except sqlite3.Error as e:
+            logger.error("Failed to save habits: %s", e)
+            raise
+
+    def _replace_all(self, conn, data):
+        conn.execute("DELETE FROM completions")
+        conn.execute("DELETE FROM habits")
+        conn.executemany(
+            "INSERT INTO habits (id, name, description, frequency_type, frequency_times, streak, revision) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (_habit_row(h) for h in data["habits"]),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+            ((h.id, d) for h in data["habits"] for d in h.completed_days),
+        )
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (data["next_id"],))
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'version'", (data.get("version", 0),))
+        _store_rollups(conn, data.rollups)
+
+    def signature(self):
+        # Without WAL every committed write goes straight to the database file
+        return file_signature(self.db_path)
+
+    # ----- Single changes -----
+
+    def record_event(self, data, event):
+        """Apply event to data and persist it as a single small transaction."""
+        self.record_events(data, [event])
+
+    def record_events(self, data, events, applied=False):
+        """
+        Apply events to data (unless already applied) and persist them in one
+        transaction. If another process wrote since data was loaded, data is
+        first reloaded and the events are merged into it (see data_store.rebase_events).
+        """
+        if not events:
+            return
+        conn = self.connect()
+
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            stored = _stored_version(conn)
+            fresh = self.load() if stored != data.get("version", 0) else None
+
+            with data.lock:
+                if fresh is not None:
+                    logger.debug("Habits changed in another process (version %d -> %d). Merging.",
+                                 data.get("version", 0), stored)
+                    data.replace(fresh)
+                    applied = False
+
+                if not applied:
+                    events = rebase_events(data, events)
+                    for event in events:
+                        apply_event(data, event)
+                data["version"] = stored + len(events)
+
+            # Rows are written from the final state of each habit
+            for event in events:
+                self._store_event(conn, data, event)
+
+            # Adds and deletes change many periods; a check-in changes one week and one month
+            if any(event["op"] in ("add", "delete") for event in events):
+                _store_rollups(conn, data.rollups)
+            else:
+                _update_rollups(conn, data.rollups, [event["day"] for event in events if event["op"] == "done"])
+
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'version'", (data["version"],))
+
+    def _store_event(self, conn, data, event):
+        op = event["op"]
+
+        if op == "add":
+            h = event["habit"]
+            if not isinstance(h, Habit):
+                h = habit_from_dict(h)
+            conn.execute(
+                "INSERT OR IGNORE INTO habits (id, name, description, frequency_type, frequency_times, streak, revision) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                _habit_row(h),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+                ((h.id, d) for d in h.completed_days),
+            )
+            conn.execute(
+                "UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'", (data["next_id"],)
+            )
+        elif op == "edit":
+            habit = data.by_id.get(event["id"])
+            conn.execute(
+                "UPDATE habits SET name = ?, description = ?, revision = ? WHERE id = ?",
+                (event["name"], event["description"], habit.revision if habit else 0, event["id"]),
+            )
+        elif op == "delete":
+            conn.execute("DELETE FROM habits WHERE id = ?", (event["id"],))
+        elif op == "reserve":
+            conn.execute(
+                "UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'", (event["next_id"],)
+            )
+        elif op == "done":
+            habit = data.by_id.get(event["id"])
+            if habit is not None:       # else deleted, and the event dropped by apply_event
+                conn.execute(
+                    "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+                    (event["id"], event["day"]),
+                )
+                conn.execute(
+                    "UPDATE habits SET streak = ?, revision = ? WHERE id = ?",
+                    (_dump_streak(habit.streak), habit.revision, habit.id),
+                )
+        else:
+            logger.warning("Unknown event '%s' not stored.", op)
+
+    # ----- Indexed queries -----
+    # One habit is read by its primary key and its completions through the
+    # (habit_id, day) key of the completions table, without loading the rest.
+
+    def load_habit(self, habit_id):
+        conn = self.connect()
+
+        row = conn.execute(
+            "SELECT id, name, description, frequency_type, frequency_times, streak, revision FROM habits WHERE id = ?",
+            (habit_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        habit = Habit(*row[:5], streak=_load_streak(row[5]), revision=row[6])
+        habit.completed_days = DaySet(
+            day for (day,) in conn.execute(
+                "SELECT day FROM completions WHERE habit_id = ?", (habit_id,)
+            )
+        )
+        return habit
+
+    def completions_between(self, habit_id, start, end):
+        conn = self.connect()
+        return [
+            day for (day,) in conn.execute(
+                "SELECT day FROM completions WHERE habit_id = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (habit_id, start, end),
+            )
+        ]
+
+    def count_between(self, habit_id, start, end):
+        conn = self.connect()
+        return conn.execute(
+            "SELECT COUNT(*) FROM completions WHERE habit_id = ? AND day BETWEEN ? AND ?",
+            (habit_id, start, end),
+        ).fetchone()[0]
+
+
+def _stored_version(conn):
+    return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+def _habit_row(habit):
+    return (
+        habit.id, habit.name, habit.description,
+        habit.frequency.type, habit.frequency.times, _dump_streak(habit.streak), habit.revision,
+    )
+
+def _dump_streak(state):
+    return json.dumps(state.to_dict(), separators=(",", ":")) if state is not None else None
+
+def _load_streak(text):
+    return StreakState.from_dict(json.loads(text)) if text else None
+
+# ----- Rollups -----
+
+def _load_rollups(conn):
+    """The stored rollups in Rollups.to_dict() form, or None if there are none."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'completions'").fetchone()
+    if row is None:
+        return None
+
+    stored = {"total": row[0], "weeks": {}, "months": {}}
+    for period, key, count in conn.execute("SELECT period, key, count FROM rollups ORDER BY period, key"):
+        stored[period][str(key)] = count
+    return stored
+
+def _store_rollups(conn, rollups):
+    conn.execute("DELETE FROM rollups")
+    conn.executemany(
+        "INSERT INTO rollups (period, key, count) VALUES (?, ?, ?)",
+        [("weeks", key, count) for key, count in rollups.weeks.items()]
+        + [("months", key, count) for key, count in rollups.months.items()],
+    )
+    _store_total(conn, rollups)
+
+def _update_rollups(conn, rollups, days):
+    """Store the week and month counts of the given days (ISO strings or ordinals)."""
+    rows = set()
+    for day in days:
+        ordinal = to_ordinal(day)
+        rows.add(("weeks", week_key(ordinal)))
+        rows.add(("months", month_key(date.fromordinal(ordinal))))
+
+    counts = {"weeks": rollups.weeks, "months": rollups.months}
+    for period, key in sorted(rows):
+        count = counts[period].get(key, 0)
+        if count:
+            conn.execute("INSERT OR REPLACE INTO rollups (period, key, count) VALUES (?, ?, ?)", (period, key, count))
+        else:
+            conn.execute("DELETE FROM rollups WHERE period = ? AND key = ?", (period, key))
+    _store_total(conn, rollups)
+
+def _store_total(conn, rollups):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('completions', ?)", (rollups.total,))
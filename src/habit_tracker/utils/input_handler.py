@@ -1,7 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from habit_tracker.data_store import(find_habit_by_id)
 from habit_tracker.utils import logger
-from colorama import Fore, Style
 
 def get_non_empty_string(prompt):
     value = input(prompt).strip()
@@ -18,14 +17,56 @@ def get_int(prompt):
 def get_optional_string(prompt):
     return input(prompt).strip()
 
+def parse_date(value):
+    """Return value as an ISO date string (YYYY-MM-DD). Raises ValueError if it isn't one."""
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValueError("Please enter date as YYYY-MM-DD") from None
+
+def parse_month(value):
+    """Return value (YYYY-MM) as a (year, month) tuple. Raises ValueError if it isn't one."""
+    try:
+        d = datetime.strptime(value.strip(), "%Y-%m")
+    except ValueError:
+        raise ValueError("Please enter month as YYYY-MM") from None
+    return d.year, d.month
+
+def prompt_for_month_range():
+    """Ask for a first and last month. Returns two (year, month) tuples, oldest first."""
+    while True:
+        try:
+            first = parse_month(input("   From month (YYYY-MM): "))
+            last_input = input("   To month (YYYY-MM, Enter for this month): ").strip()
+            today = date.today()
+            last = parse_month(last_input) if last_input else (today.year, today.month)
+        except ValueError as e:
+            print(f"   {e}")
+            continue
+
+        if first > last:
+            print("   The first month can't be after the last one.")
+            continue
+        return first, last
+
 def get_valid_date(prompt):
     while True:
         user_input = input(prompt).strip()
         try:
-            parsed = datetime.strptime(user_input, "%Y-%m-%d")
-            return parsed.date().isoformat()
-        except ValueError:
-            print("Please enter date as YYYY-MM-DD")
+            return parse_date(user_input)
+        except ValueError as e:
+            print(e)
+
+def get_optional_date(prompt):
+    """Like get_valid_date, but an empty answer returns None."""
+    while True:
+        user_input = input(prompt).strip()
+        if not user_input:
+            return None
+        try:
+            return parse_date(user_input)
+        except ValueError as e:
+            print(e)
 
 def prompt_for_existing_habit(data, prompt):
     """Prompt user for habit ID and return habit. Returns None if users choose 0 (Go back)"""
@@ -81,6 +122,7 @@ def prompt_for_frequency():
 
 def confirm_action(prompt):
     """Ask the user to confirm an action. Returns True for YES, False for NO. Keeps prompting until valid input is given."""
+    from colorama import Fore, Style     # not imported at module level: the CLI uses parse_date from here
     while True:
         answer = input(f"\n   {Fore.RED}{Style.BRIGHT}ATTENTION!{Style.RESET_ALL} {prompt} (YES/NO): ").strip().upper()
 
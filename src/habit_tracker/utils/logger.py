@@ -1,6 +1,9 @@
+import atexit
 import logging
+import os
+import queue
 import sys
-from pathlib import Path
+import threading
 from datetime import datetime
 from .. import config
 
@@ -14,13 +17,14 @@ def _setup_logger():
     - Adding multiple handlers (console + file)
     - Setting different log levels
     - Custom formatting with datetime
+    - Handing file writes to a background thread
+    - Deferring the file setup until the first record (_DeferredFileHandler)
 
     Returns:
         Configured logger instance
     """
     # Create logger with specific name
     logger = logging.getLogger('HabitTracker')
-    logger.setLevel(logging.DEBUG)  # Capture all levels
 
     # Prevent duplicate handlers if called multiple times
     if logger.handlers:
@@ -38,7 +42,101 @@ def _setup_logger():
     logger.addHandler(console_handler)
 
     # === FILE HANDLER ===
-    # This writes to file - for debugging and audit trail
+    # This writes to file - for debugging and audit trail.
+    # Nothing is set up here: see _DeferredFileHandler.
+    logger.addHandler(_file_handler)
+
+    # The logger itself only lets through what some handler wants, so
+    # debug(...) calls return at once unless LOG_LEVEL is "DEBUG"
+    _update_logger_level(logger)
+
+    return logger
+
+
+def _update_logger_level(logger):
+    logger.setLevel(min(handler.level for handler in logger.handlers))
+
+
+class _DeferredFileHandler(logging.Handler):
+    """
+    Queues records for the log file, which is only set up on the first record.
+
+    Importing the logger happens on every start of the program, so it must not
+    create the logs directory or open the file. The first record starts a
+    thread that does both and then writes the queue to the file
+    (_write_to_file); records logged meanwhile simply wait in the queue.
+
+    Records are queued as they are and formatted by that thread, so the
+    calling thread never pays for the file format.
+
+    A forked child (e.g. a ProcessPool worker) has no copy of the writer
+    thread, and may end with os._exit before a new one has written anything,
+    so there records are written straight away instead (after_fork).
+    """
+
+    def __init__(self, level):
+        super().__init__(level)
+        self.queue = queue.SimpleQueue()
+        self._writer = None
+        self._direct = False        # write in the calling thread (forked child)
+        self._file = None           # the FileHandler used when _direct
+
+    def emit(self, record):
+        if self._direct:
+            self._write_now(record)
+            return
+        if self._writer is None:
+            # A daemon thread: the interpreter waits for the others before
+            # running exit handlers, so stop() would never get to end it
+            self._writer = threading.Thread(target=_write_to_file, args=(self,), name="HabitTracker log writer", daemon=True)
+            self._writer.start()
+        self.queue.put(record)
+
+    def stop(self):
+        """Write the remaining records and stop the writer thread (registered with atexit)."""
+        if self._writer is not None:
+            self.queue.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def after_fork(self):
+        """Forget the parent's queue and writer thread (registered with os.register_at_fork)."""
+        self.queue = queue.SimpleQueue()
+        self._writer = None
+        self._file = None
+        self._direct = True
+
+    def _write_now(self, record):
+        if self._file is None:
+            self._file = _open_log_file(self)
+            if self._file is None:
+                return
+        self._file.handle(record)
+
+
+def _write_to_file(handler):
+    """Create the log file and write handler's queue to it until stop() (runs in a background thread)."""
+    file_handler = _open_log_file(handler)
+    if file_handler is None:
+        return
+
+    # This thread formats the queued records and does the actual (blocking)
+    # file writes; the handler's level already filtered them
+    try:
+        while True:
+            record = handler.queue.get()
+            if record is None:
+                break
+            file_handler.handle(record)
+    finally:
+        file_handler.close()
+
+
+def _open_log_file(handler):
+    """Return a FileHandler for today's log file, or None (and drop handler) if it can't be set up."""
     try:
         # Create logs directory if needed
         log_dir = config.PROJECT_ROOT / 'logs'
@@ -49,7 +147,7 @@ def _setup_logger():
         log_file = log_dir / log_filename
 
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)  # Everything to file
+        file_handler.setLevel(handler.level)
 
         # Detailed format for file (includes timestamps, level, line numbers)
         file_format = logging.Formatter(
@@ -57,14 +155,21 @@ def _setup_logger():
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-
-        logger.addHandler(file_handler)
+        return file_handler
     except Exception as e:
         # If file logging fails, continue with console only
-        logger.warning(f"Could not setup file logging: {e}")
+        _logger.removeHandler(handler)
+        _update_logger_level(_logger)
+        _logger.warning(f"Could not setup file logging: {e}")
+        return None
 
-    return logger
 
+# Registered before anything else can register an exit handler, so it runs
+# last and records logged by the others still reach the file
+_file_handler = _DeferredFileHandler(config.LOG_LEVEL)  # Level from config: INFO, or DEBUG for everything
+atexit.register(_file_handler.stop)
+if hasattr(os, "register_at_fork"):     # not on Windows, which has no fork
+    os.register_at_fork(after_in_child=_file_handler.after_fork)
 
 # Create module-level logger instance
 _logger = _setup_logger()
@@ -73,64 +178,101 @@ _logger = _setup_logger()
 # === PUBLIC API FUNCTIONS ===
 # These provide a simple interface for other modules to use
 
-def log(msg):
+def log(msg, *args):
     """
     Log an info message (backward compatible with old utils.log).
 
     Args:
         msg: Message to log
+        *args: Optional %-style arguments, only formatted if the message is emitted
     """
-    _logger.info(msg)
+    _logger.info(msg, *args, stacklevel=2)
 
 
-def debug(msg):
+def debug(msg, *args):
     """
     Log a debug message (detailed info for developers).
 
     Args:
         msg: Debug message
+        *args: Optional %-style arguments, only formatted if the message is emitted
     """
-    _logger.debug(msg)
+    _logger.debug(msg, *args, stacklevel=2)
 
 
-def info(msg):
+def info(msg, *args):
     """
     Log an info message (normal operation).
 
     Args:
         msg: Info message
+        *args: Optional %-style arguments, only formatted if the message is emitted
     """
-    _logger.info(msg)
+    _logger.info(msg, *args, stacklevel=2)
 
 
-def warning(msg):
+def warning(msg, *args):
     """
     Log a warning message (something unexpected but not critical).
 
     Args:
         msg: Warning message
+        *args: Optional %-style arguments, only formatted if the message is emitted
     """
-    _logger.warning(msg)
+    _logger.warning(msg, *args, stacklevel=2)
 
 
-def error(msg):
+def error(msg, *args):
     """
     Log an error message (something failed).
 
     Args:
         msg: Error message
+        *args: Optional %-style arguments, only formatted if the message is emitted
     """
-    _logger.error(msg)
+    _logger.error(msg, *args, stacklevel=2)
 
 
-def critical(msg):
+def critical(msg, *args):
     """
     Log a critical message (severe error, possible shutdown).
 
     Args:
         msg: Critical error message
+        *args: Optional %-style arguments, only formatted if the message is emitted
+    """
+    _logger.critical(msg, *args, stacklevel=2)
+
+
+def is_enabled_for(level):
+    """
+    Check whether a message at this level would go anywhere.
+
+    Use it to skip building expensive debug output entirely:
+        if logger.is_enabled_for(logging.DEBUG): ...
+
+    Args:
+        level: A logging level such as logging.DEBUG
+    """
+    return _logger.isEnabledFor(level)
+
+
+def configure_console(level=None, stream=None):
+    """
+    Adjust the console handler, e.g. for the command-line mode where stdout
+    carries machine-readable output.
+
+    Args:
+        level: New minimum level for console messages (None keeps the current one)
+        stream: New stream such as sys.stderr (None keeps the current one)
     """
-    _logger.critical(msg)
+    for handler in _logger.handlers:
+        if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+            if level is not None:
+                handler.setLevel(level)
+            if stream is not None:
+                handler.setStream(stream)
+    _update_logger_level(_logger)
 
 
 # === DEMONSTRATION FUNCTION ===
@@ -139,11 +281,11 @@ def demo_logging_levels():
     Demonstrate different log levels.
 
     Notice:
-    - DEBUG won't appear in console (only in file)
+    - DEBUG won't appear in console (only in file, with config.LOG_LEVEL = "DEBUG")
     - INFO and above appear in both console and file
     """
     print("\n=== Logging Levels Demo ===\n")
-    print("Note: DEBUG messages only go to log file, not console\n")
+    print("Note: DEBUG messages only go to log file (with LOG_LEVEL = \"DEBUG\"), not console\n")
 
     debug("This is DEBUG - detailed developer info (file only)")
     info("This is INFO - normal operation message")
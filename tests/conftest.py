@@ -0,0 +1,87 @@
+import io
+import logging
+from contextlib import redirect_stderr, redirect_stdout
+
+import pytest
+
+from habit_tracker import cli, config, data_store
+from habit_tracker.storage import create_backend
+from habit_tracker.utils import logger
+
+# Tests that touch storage get an empty store of each backend in their own
+# temp directory, never the project's data/ directory.
+
+@pytest.fixture(scope="session", autouse=True)
+def log_dir(tmp_path_factory):
+    """Keep the log file out of the project: it goes to PROJECT_ROOT/logs, set up by the first record."""
+    root, config.PROJECT_ROOT = config.PROJECT_ROOT, tmp_path_factory.mktemp("project")
+    yield config.PROJECT_ROOT / "logs"
+    config.PROJECT_ROOT = root
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path, monkeypatch):
+    """Point config at an empty store in tmp_path; yields the backend name."""
+    monkeypatch.setattr(config, "DATA_PATH", tmp_path / "habits.json")
+    monkeypatch.setattr(config, "JOURNAL_PATH", tmp_path / "habits.journal")
+    monkeypatch.setattr(config, "SQLITE_PATH", tmp_path / "habits.db")
+    monkeypatch.setattr(config, "STORAGE_BACKEND", request.param)
+    data_store.reset_backend()
+
+    yield request.param
+
+    _close(data_store.get_backend())
+    data_store.reset_backend()
+
+
+@pytest.fixture
+def other_process(store):
+    """
+    Return a function opening another backend on the store, standing in for
+    a second process: it keeps its own view of what is stored.
+    """
+    backends = []
+
+    def open_backend():
+        backend = create_backend(config.STORAGE_BACKEND)
+        backends.append(backend)
+        return backend
+
+    yield open_backend
+
+    for backend in backends:
+        _close(backend)
+
+
+@pytest.fixture
+def load_stored(other_process):
+    """Return a function loading the store the way a freshly started process would."""
+    return lambda: other_process().load()
+
+
+@pytest.fixture
+def run_cli():
+    """
+    Return a function running the command line with the given arguments;
+    it returns (exit status, stdout). The console log handler, which the
+    command line moves to stderr, is put back after every call.
+    """
+    console = next(h for h in logging.getLogger("HabitTracker").handlers if type(h) is logging.StreamHandler)
+    level, stream = console.level, console.stream
+
+    def run(*args):
+        out = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(io.StringIO()):
+            try:
+                status = cli.main([str(arg) for arg in args])
+            finally:
+                logger.configure_console(level, stream)
+        return status, out.getvalue()
+
+    return run
+
+
+def _close(backend):
+    close = getattr(backend, "close", None)
+    if close is not None:
+        close()
@@ -0,0 +1,74 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from habit_tracker import data_store
+from habit_tracker.analysis import numpy_engine, statistics
+from habit_tracker.analysis.aggregate import aggregate, best_run, current_run, month_key, week_key, week_label
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData
+from habit_tracker.models.streak_state import StreakState, streak_state
+
+def make_habit(days, frequency_type="daily", times=1):
+    habit = Habit(1, "Run", frequency_type=frequency_type, frequency_times=times)
+    data = HabitData({"next_id": 2, "habits": [habit], "version": 0})
+    for day in days:
+        data_store.add_completion(data, habit, day)
+        streak_state(habit)     # so later completions update it instead of rebuilding it
+    return habit
+
+# ----- Counts -----
+
+def test_counts_per_period_across_a_year_end():
+    habit = make_habit(["2024-12-29", "2024-12-30", "2024-12-31", "2025-01-01", "2025-02-03"])
+
+    counts = aggregate(habit)
+
+    assert sum(counts.days.values()) == 5
+    # Weeks start on Monday: 2024-12-30 is in 2025-W01
+    assert {week_label(k): n for k, n in counts.weeks.items()} == {"2024-W52": 1, "2025-W01": 3, "2025-W06": 1}
+    assert counts.months == {month_key(date(2024, 12, 1)): 3, month_key(date(2025, 1, 1)): 1, month_key(date(2025, 2, 1)): 1}
+
+def test_runs_need_consecutive_qualifying_periods():
+    counts = {1: 2, 2: 1, 3: 2, 4: 2, 6: 2}
+
+    assert best_run(counts, 2) == 2
+    assert current_run(counts, 2) == 1
+    assert current_run({1: 2, 2: 1}, 2) == 0
+    assert best_run({}, 1) == current_run({}, 1) == 0
+
+# ----- Engines -----
+# The shared aggregation, the streak state kept up to date per completion
+# and the NumPy engine must agree on every frequency.
+
+def random_days(seed):
+    rng = random.Random(seed)
+    start = date(2023, 12, 20)
+    return [(start + timedelta(days=offset)).isoformat() for offset in range(120) if rng.random() < 0.6]
+
+@pytest.mark.parametrize("frequency_type, times", [("daily", 1), ("weekly", 1), ("weekly", 3), ("monthly", 10)])
+@pytest.mark.parametrize("seed", range(5))
+def test_engines_agree(frequency_type, times, seed):
+    habit = make_habit(random_days(seed), frequency_type, times)
+    counts = aggregate(habit)
+    expected = (statistics.current_streak(habit, counts), statistics.best_streak(habit, counts))
+
+    assert (habit.streak.current, habit.streak.best) == expected          # kept up to date by add_completion
+    rebuilt = StreakState.compute(habit)
+    assert (rebuilt.current, rebuilt.best) == expected
+    if numpy_engine.available():
+        assert numpy_engine.streaks(habit) == expected
+
+def test_weekly_summary_engines_agree(monkeypatch):
+    habits = [make_habit(random_days(seed)) for seed in range(3)]
+    for habit_id, habit in enumerate(habits, start=1):
+        habit.id = habit_id
+    data = HabitData({"next_id": 4, "habits": habits, "version": 0})
+
+    python = list(statistics.iter_weekly_summary(data, "2024-01-01", "2024-02-29"))
+    assert python and all(week_key(date(2024, 1, 1).toordinal()) <= week for week, _ in python)
+
+    if numpy_engine.available():
+        monkeypatch.setattr(statistics.config, "STATS_ENGINE", "numpy")
+        assert list(statistics.iter_weekly_summary(data, "2024-01-01", "2024-02-29")) == python
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from habit_tracker import config, data_store, storage
+from habit_tracker.models.habit import Habit
+from habit_tracker.storage import atomic_write
+from habit_tracker.storage.json_backend import GZIP_MAGIC
+
+# The JSON backend only: atomic snapshot writes and the on-disk encodings.
+json_store = pytest.mark.parametrize("store", ["json"], indirect=True)
+
+def setup_habits(*names):
+    data = data_store.load_habits()
+    data_store.record_events(data, [{"op": "add", "habit": Habit(data_store.get_new_id(data), n)} for n in names])
+    return data
+
+def summary(data):
+    return data["version"], data["next_id"], [(h.id, h.name, list(h.completed_days)) for h in data["habits"]]
+
+# ----- Atomic writes -----
+
+def test_a_failed_write_leaves_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "habits.json"
+    atomic_write(path, b"old")
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(storage.os, "replace", fail)
+
+    with pytest.raises(OSError):
+        atomic_write(path, b"new")
+
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["habits.json"]      # the temp file is removed
+
+@json_store
+def test_a_failed_save_leaves_the_old_snapshot(store, load_stored, monkeypatch):
+    data = setup_habits("Run")
+    data_store.save_habits(data)
+    before = summary(load_stored())
+
+    def fail(fd):
+        raise OSError("I/O error")
+    data.rename(data.by_id[1], "Jog")
+
+    with monkeypatch.context() as m, pytest.raises(OSError):
+        m.setattr(storage.os, "fsync", fail)
+        data_store.save_habits(data)
+
+    assert summary(load_stored()) == before
+
+# ----- Encodings -----
+
+@json_store
+@pytest.mark.parametrize("gzip_data, compact", [(True, False), (False, True), (True, True)])
+def test_encodings_round_trip(store, load_stored, monkeypatch, gzip_data, compact):
+    data = setup_habits("Run", "Read")
+    for day in ("2024-12-31", "2025-01-01", "2025-03-15"):
+        data_store.record_events(data, [{"op": "done", "id": 2, "day": day}])
+
+    monkeypatch.setattr(config, "GZIP_DATA", gzip_data)
+    monkeypatch.setattr(config, "COMPACT_COMPLETIONS", compact)
+    data_store.save_habits(data)
+    assert config.DATA_PATH.read_bytes().startswith(GZIP_MAGIC) == gzip_data
+
+    # Read back with the default settings: gzip is detected, bitmaps are decoded
+    monkeypatch.setattr(config, "GZIP_DATA", False)
+    monkeypatch.setattr(config, "COMPACT_COMPLETIONS", False)
+    assert summary(load_stored()) == summary(data)
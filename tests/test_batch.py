@@ -0,0 +1,62 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from habit_tracker import batch
+from habit_tracker.analysis import statistics
+from habit_tracker.models.habit import Habit
+from habit_tracker.storage.json_backend import JsonBackend
+from habit_tracker.storage.sqlite_backend import SqliteBackend
+
+def make_file(path, seed, habits=6):
+    """Write a habits file with random completions; SQLite if path ends in .db."""
+    rng = random.Random(seed)
+    backend = SqliteBackend(path) if path.suffix == ".db" else JsonBackend(path, path.with_suffix(".journal"))
+    data = backend.load()
+    backend.record_events(data, [
+        {"op": "add", "habit": Habit(n, f"habit {n}", frequency_type=rng.choice(["daily", "weekly"]))}
+        for n in range(1, habits + 1)
+    ])
+    start = date(2025, 1, 1)
+    backend.record_events(data, [
+        {"op": "done", "id": rng.randint(1, habits), "day": (start + timedelta(days=rng.randrange(60))).isoformat()}
+        for _ in range(40)
+    ])
+    if path.suffix == ".db":
+        backend.close()
+    return path
+
+@pytest.fixture
+def files(tmp_path):
+    return [make_file(tmp_path / f"user{n}.json", n) for n in range(5)] + [make_file(tmp_path / "user5.db", 5)]
+
+# ----- Pool versus serial -----
+
+def test_pool_matches_the_serial_path(files):
+    serial = batch.run_batch(files, workers=1)
+
+    assert batch.run_batch(files, workers=3) == serial
+    assert batch.run_batch(files, workers=2, chunk_size=4) == serial
+    assert [r["path"] for r in serial] == [str(p) for p in files]
+
+def test_habits_of_one_file_are_split_across_workers(files):
+    serial = batch.run_batch(files[:1], workers=1)
+
+    assert batch.run_batch(files[:1], workers=3, chunk_size=2) == serial
+    report = serial[0]
+    data = JsonBackend(files[0], files[0].with_suffix(".journal")).load()
+    assert [h["id"] for h in report["habits"]] == [h.id for h in data["habits"]]
+    assert report["overview"]["total_completions"] == sum(len(h.completed_days) for h in data["habits"])
+
+def test_a_missing_file_is_an_error(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        batch.run_batch([tmp_path / "missing.json", tmp_path / "other.json"], workers=2)
+    assert not (tmp_path / "missing.json").exists()
+
+def test_overview_matches_the_app(files):
+    report = batch.run_batch(files[1:2], workers=1)[0]
+    data = JsonBackend(files[1], files[1].with_suffix(".journal")).load()
+
+    expected = {key: value for key, value in statistics.overview(data).items() if key in report["overview"]}
+    assert report["overview"] == expected
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+# ----- Commands and exit codes -----
+
+def test_add_done_and_list(store, run_cli, load_stored):
+    status, out = run_cli("add", "Run", "--type", "weekly", "--times", "2", "--json")
+    assert status == 0 and json.loads(out)["id"] == 1
+
+    assert run_cli("done", 1, "--date", "2025-01-06") == (0, "Habit 1 marked on 2025-01-06\n")
+    assert run_cli("done", 1, "--date", "2025-01-06") == (0, "Habit 1 already done on 2025-01-06\n")
+
+    status, out = run_cli("list", "--json")
+    listed = json.loads(out)
+    assert status == 0 and [(h["name"], h["completions"]) for h in listed] == [("Run", 1)]
+    assert list(load_stored().by_id[1].completed_days) == ["2025-01-06"]
+
+def test_errors_exit_with_1(store, run_cli):
+    run_cli("add", "Run")
+
+    assert run_cli("add", "run")[0] == 1                    # duplicate name
+    assert run_cli("done", 9)[0] == 1                       # unknown habit
+    assert run_cli("done", 1, "--date", "06/01/2025")[0] == 1
+
+def test_usage_errors_exit_with_2(store, run_cli):
+    for args in [("done", "one"), ("add", "Run", "--type", "hourly"), ("frobnicate",)]:
+        with pytest.raises(SystemExit) as exit:
+            run_cli(*args)
+        assert exit.value.code == 2
+
+def test_done_batch(store, run_cli, tmp_path, load_stored):
+    run_cli("add", "Run")
+    run_cli("add", "Read")
+    lines = tmp_path / "done.txt"
+    lines.write_text("# id date\n1 2025-01-06\n2, 2025-01-06\n1 2025-01-06\n", encoding="utf-8")
+
+    status, out = run_cli("done-batch", lines, "--json")
+    assert status == 0 and json.loads(out) == {"marked": 2, "already_done": 1, "errors": []}
+
+    lines.write_text("1 2025-01-07\n9 2025-01-07\nx\n", encoding="utf-8")
+    status, out = run_cli("done-batch", lines, "--json")
+    assert status == 1 and json.loads(out)["marked"] == 1 and len(json.loads(out)["errors"]) == 2
+    assert [len(h.completed_days) for h in load_stored()["habits"]] == [2, 1]
+
+def test_stats(store, run_cli):
+    run_cli("add", "Run")
+    run_cli("done", 1, "--date", "2025-01-06")
+
+    status, out = run_cli("stats", "overview", "--json")
+    assert status == 0 and json.loads(out)["total_completions"] == 1
+
+    status, out = run_cli("stats", "weekly", "--since", "2025-01-01", "--json")
+    assert status == 0 and json.loads(out) == {"2025-W02": {"1": 1}}
+    assert run_cli("stats", "weekly", "--since", "yesterday")[0] == 1
@@ -0,0 +1,76 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from habit_tracker.analysis import statistics
+from habit_tracker.models.day_set import DaySet
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import current_windows_match
+from habit_tracker.models.rollups import Rollups
+
+def random_set(seed, start=date(2024, 12, 1), span=90):
+    rng = random.Random(seed)
+    days = [start + timedelta(days=offset) for offset in range(span) if rng.random() < 0.5]
+    return DaySet(d.isoformat() for d in days), days
+
+# ----- Window counts -----
+
+@pytest.mark.parametrize("seed", range(5))
+def test_count_between_matches_a_scan(seed):
+    days, listed = random_set(seed)
+    start = date(2024, 11, 25).toordinal()
+    # Every window of up to 20 days, so the edges fall on every bit of a byte
+    for first in range(start, start + 110, 3):
+        for length in range(20):
+            last = first + length
+            expected = sum(first <= d.toordinal() <= last for d in listed)
+            assert days.count_between(first, last) == expected
+
+def test_count_between_empty_and_reversed():
+    assert DaySet().count_between("2025-01-01", "2025-12-31") == 0
+    assert DaySet(["2025-01-05"]).count_between("2025-01-06", "2025-01-04") == 0
+    assert DaySet(["2025-01-05"]).count_between(date(2025, 1, 5), "2025-01-05") == 1
+
+def test_count_week_across_a_year_end():
+    # 2024-12-30 (Monday) to 2025-01-05 (Sunday) is 2025-W01
+    days = DaySet(["2024-12-29", "2024-12-30", "2025-01-01", "2025-01-05", "2025-01-06"])
+
+    assert days.count_week("2025-01-02") == 3
+    assert days.count_week("2024-12-29") == 1
+    assert days.count_week("2025-01-12") == 1
+
+def test_count_month_in_december():
+    days = DaySet(["2024-11-30", "2024-12-01", "2024-12-31", "2025-01-01"])
+
+    assert days.count_month(2024, 12) == 2
+    assert days.count_month(2025, 1) == 1
+    assert days.count_month(2025, 2) == 0
+
+# ----- Uses -----
+
+@pytest.mark.parametrize("frequency_type, expected", [("daily", 1), ("weekly", 2), ("monthly", 3)])
+def test_period_count(frequency_type, expected):
+    habit = Habit(1, "Run", frequency_type=frequency_type, frequency_times=2)
+    habit.completed_days = DaySet(["2024-12-31", "2025-01-06", "2025-01-08", "2025-01-20"])
+
+    assert statistics.period_count(habit, "2025-01-08") == expected
+
+def test_current_windows_of_stale_rollups_are_detected():
+    habit = Habit(1, "Run")
+    habit.completed_days = DaySet(["2025-01-06", "2025-01-07"])
+    rollups = Rollups.build([habit])
+    today = date(2025, 1, 8)
+    assert current_windows_match(rollups, [habit], today)
+
+    # Same total, but a day moved out of the current week
+    habit.completed_days = DaySet(["2024-12-06", "2025-01-07"])
+    assert not current_windows_match(rollups, [habit], today)
+
+def test_streaks_report_the_current_period(store, run_cli):
+    run_cli("add", "Run", "--type", "weekly", "--times", "2")
+    run_cli("done", 1)
+
+    status, out = run_cli("stats", "streaks", "--json")
+
+    assert status == 0 and '"this_period": 1' in out
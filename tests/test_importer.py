@@ -0,0 +1,45 @@
+from habit_tracker import data_store, importer
+from habit_tracker.models.habit import Habit
+
+def setup_habits(*names):
+    data = data_store.load_habits()
+    data_store.record_events(data, [{"op": "add", "habit": Habit(data_store.get_new_id(data), n)} for n in names])
+    return data_store.load_habits()
+
+def days(habit):
+    return sorted(habit.completed_days)
+
+def test_import_reports_duplicates_and_errors(store, load_stored):
+    data = setup_habits("Run", "Read")
+    rows = [
+        (2, "run", "2025-01-01"),
+        (3, 2, "2025-01-01"),
+        (4, "1", "2025-01-01"),         # same habit and day as line 2
+        (5, "swim", "2025-01-01"),
+        (6, "run", "01/02/2025"),
+    ]
+
+    report = importer.import_completions(data, rows)
+
+    assert (report["imported"], report["duplicates"], report["errors"]) == (2, 1, 2)
+    assert [days(h) for h in load_stored()["habits"]] == [days(h) for h in data["habits"]]
+
+def test_chunks_after_a_merge_reach_the_current_habits(store, other_process, load_stored):
+    data = setup_habits("Run")
+
+    def rows():
+        yield 2, "run", "2025-01-01"
+        yield 3, "run", "2025-01-02"
+        # The first chunk is stored; now another process checks the habit off
+        other = other_process()
+        theirs = other.load()
+        other.record_events(theirs, [{"op": "done", "id": 1, "day": "2025-02-01"}])
+        yield 4, "run", "2025-01-03"
+        yield 5, "run", "2025-01-04"
+        yield 6, "run", "2025-01-05"
+
+    report = importer.import_completions(data, rows(), chunk_size=2)
+
+    assert report["imported"] == 5
+    assert len(data.by_id[1].completed_days) == 6
+    assert days(load_stored().by_id[1]) == days(data.by_id[1])
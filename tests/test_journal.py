@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from habit_tracker import config, data_store
+from habit_tracker.models.habit import Habit
+
+# The JSON backend only: changes are appended to a journal, replayed on load
+# and folded back into the snapshot.
+json_store = pytest.mark.parametrize("store", ["json"], indirect=True)
+
+def setup_habits(*names):
+    data = data_store.load_habits()
+    data_store.record_events(data, [{"op": "add", "habit": Habit(data_store.get_new_id(data), n)} for n in names])
+    return data
+
+def summary(data):
+    return data["version"], data["next_id"], [(h.id, h.name, list(h.completed_days)) for h in data["habits"]]
+
+def journal_lines():
+    return config.JOURNAL_PATH.read_text(encoding="utf-8").splitlines() if config.JOURNAL_PATH.exists() else []
+
+# ----- Journal -----
+
+@json_store
+def test_changes_are_journaled_and_replayed(store, load_stored):
+    data = setup_habits("Run")
+    snapshot = config.DATA_PATH.read_bytes()
+
+    data_store.record_events(data, [{"op": "done", "id": 1, "day": "2025-01-06"}])
+    data_store.record_events(data, [{"op": "edit", "id": 1, "name": "Jog", "description": ""}])
+
+    assert config.DATA_PATH.read_bytes() == snapshot        # only the journal grew
+    assert [json.loads(line)["op"] for line in journal_lines()] == ["add", "done", "edit"]
+    assert summary(load_stored()) == summary(data)
+
+@json_store
+def test_journal_is_compacted_every_so_many_events(store, load_stored, monkeypatch):
+    monkeypatch.setattr(config, "JOURNAL_COMPACT_EVERY", 4)
+    data = setup_habits("Run")
+    for day in ("2025-01-06", "2025-01-07"):
+        data_store.record_events(data, [{"op": "done", "id": 1, "day": day}])
+    assert len(journal_lines()) == 3
+
+    data_store.record_events(data, [{"op": "done", "id": 1, "day": "2025-01-08"}])
+
+    assert journal_lines() == []
+    assert len(json.loads(config.DATA_PATH.read_bytes())["habits"][0]["completed_days"]) == 3
+    assert summary(load_stored()) == summary(data)
+
+@json_store
+def test_a_long_journal_is_compacted_on_load(store, load_stored, monkeypatch):
+    data = setup_habits("Run", "Read", "Swim")
+    assert len(journal_lines()) == 3
+
+    monkeypatch.setattr(config, "JOURNAL_COMPACT_EVERY", 3)
+    loaded = load_stored()
+
+    assert journal_lines() == []
+    assert summary(loaded) == summary(data) == summary(load_stored())
+
+@json_store
+def test_a_torn_last_line_is_skipped_and_compacted(store, load_stored):
+    data = setup_habits("Run")
+    data_store.record_events(data, [{"op": "done", "id": 1, "day": "2025-01-06"}])
+    with open(config.JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write('{"op":"done","id":1,"da')      # a crash mid-append
+
+    loaded = load_stored()
+
+    assert summary(loaded) == summary(data)
+    assert journal_lines() == []                # new events never land on the partial line
+    data_store.reset_backend()
+    data = data_store.load_habits()
+    data_store.record_events(data, [{"op": "done", "id": 1, "day": "2025-01-07"}])
+    assert list(load_stored().by_id[1].completed_days) == ["2025-01-06", "2025-01-07"]
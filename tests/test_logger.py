@@ -0,0 +1,24 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from habit_tracker.utils import logger
+
+def log_in_worker(message):
+    logger.warning("%s from pid %d", message, os.getpid())
+    return os.getpid()
+
+def logged(log_dir):
+    return "".join(path.read_text(encoding="utf-8") for path in log_dir.glob("*.log"))
+
+@pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="needs fork")
+def test_records_of_forked_workers_reach_the_log_file(log_dir):
+    logger.warning("parent starts the writer thread")      # inherited by the workers below
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork")) as pool:
+        pids = set(pool.map(log_in_worker, ["forked worker"] * 4))
+
+    text = logged(log_dir)
+    assert all(f"forked worker from pid {pid}" in text for pid in pids)
@@ -0,0 +1,130 @@
+import pytest
+
+from habit_tracker import data_store
+from habit_tracker.habit_crud import build_habit
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData
+from habit_tracker.repository import HabitRepository
+from habit_tracker.storage import StaleDataError
+
+# ----- rebase_events -----
+
+def make_data(*names):
+    habits = [Habit(i, name) for i, name in enumerate(names, start=1)]
+    return HabitData({"next_id": len(habits) + 1, "habits": habits, "version": 0})
+
+def test_rebase_moves_a_new_habit_off_a_taken_id():
+    data = make_data("Run")
+    events = [
+        {"op": "add", "habit": Habit(1, "Read")},
+        {"op": "done", "id": 1, "day": "2025-01-02"},
+        {"op": "edit", "id": 1, "name": "Read more", "description": ""},
+    ]
+
+    rebased = data_store.rebase_events(data, events)
+
+    assert rebased[0]["habit"].id == 2
+    assert [e["id"] for e in rebased[1:]] == [2, 2]
+    assert data["next_id"] == 3
+
+def test_rebase_keeps_free_ids_and_events_for_existing_habits():
+    data = make_data("Run")
+    events = [
+        {"op": "add", "habit": {"id": 5, "name": "Read"}},
+        {"op": "done", "id": 1, "day": "2025-01-02"},
+    ]
+
+    rebased = data_store.rebase_events(data, events)
+
+    assert isinstance(rebased[0]["habit"], Habit)
+    assert rebased[0]["habit"].id == 5
+    assert rebased[1] == events[1]
+    assert data["next_id"] == 2
+
+def test_add_with_a_taken_id_is_refused_outside_replay():
+    data = make_data("Run")
+
+    with pytest.raises(ValueError):
+        data_store.apply_event(data, {"op": "add", "habit": Habit(1, "Read")})
+    data_store.apply_event(data, {"op": "add", "habit": {"id": 1, "name": "Run"}}, replay=True)
+
+    assert [h.name for h in data["habits"]] == ["Run"]
+
+# ----- Stale writes -----
+# Two copies loaded from the same store; the other one writes first.
+
+def add_event(data, name):
+    return {"op": "add", "habit": Habit(data_store.get_new_id(data), name)}
+
+def summary(data):
+    return data["version"], data["next_id"], [(h.id, h.name, list(h.completed_days)) for h in data["habits"]]
+
+def test_stale_write_is_merged_and_renumbered(store, other_process, load_stored):
+    mine = data_store.load_habits()
+    other = other_process()
+    theirs = other.load()
+
+    other.record_events(theirs, [add_event(theirs, "Run")])
+    data_store.record_events(mine, [add_event(mine, "Read"), {"op": "done", "id": 1, "day": "2025-01-02"}])
+
+    assert [(h.id, h.name) for h in mine["habits"]] == [(1, "Run"), (2, "Read")]
+    assert list(mine.by_id[2].completed_days) and not list(mine.by_id[1].completed_days)
+    assert mine["version"] == 3
+    assert summary(load_stored()) == summary(mine)
+
+def test_stale_write_for_a_deleted_habit_is_dropped(store, other_process, load_stored):
+    data = data_store.load_habits()
+    data_store.record_events(data, [add_event(data, "Run")])
+    mine = data_store.load_habits()
+    other = other_process()
+    theirs = other.load()
+
+    other.record_events(theirs, [{"op": "delete", "id": 1}])
+    data_store.record_events(mine, [{"op": "done", "id": 1, "day": "2025-01-02"}])
+
+    assert mine["habits"] == []
+    assert summary(load_stored()) == summary(mine)
+
+def test_stale_edits_keep_the_later_one(store, other_process, load_stored):
+    data = data_store.load_habits()
+    data_store.record_events(data, [add_event(data, "Run")])
+    mine = data_store.load_habits()
+    other = other_process()
+    theirs = other.load()
+
+    other.record_events(theirs, [{"op": "edit", "id": 1, "name": "Jog", "description": "theirs"}])
+    data_store.record_events(mine, [{"op": "edit", "id": 1, "name": "Sprint", "description": "mine"}])
+
+    assert (mine.by_id[1].name, mine.by_id[1].description) == ("Sprint", "mine")
+    assert [h.id for h in mine.by_name["sprint"].values()] == [1]
+    assert summary(load_stored()) == summary(mine)
+
+def test_stale_save_is_refused(store, other_process):
+    mine = data_store.load_habits()
+    other = other_process()
+    theirs = other.load()
+    other.record_events(theirs, [add_event(theirs, "Run")])
+
+    mine["next_id"] += 1
+    with pytest.raises(StaleDataError):
+        data_store.save_habits(mine)
+
+# ----- A session reloading between building and recording a change -----
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_habit_built_before_a_reload_is_renumbered(store, other_process, load_stored, write_behind):
+    session = HabitRepository()
+    session.write_behind = write_behind
+    habit = build_habit(session.get(), "Read")     # at the add prompt, with ID 1 from the session copy
+
+    other = other_process()
+    theirs = other.load()
+    other.record_events(theirs, [add_event(theirs, "Run")])
+
+    session.record_many([{"op": "add", "habit": habit}, {"op": "done", "id": habit.id, "day": "2025-01-02"}])
+    session.flush()
+
+    assert habit.id == 2 and list(habit.completed_days)
+    assert [(h.id, h.name) for h in session.get()["habits"]] == [(1, "Run"), (2, "Read")]
+    assert summary(load_stored()) == summary(session.get())
+    session.invalidate()
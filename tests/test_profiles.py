@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from habit_tracker import config, data_store, profiles
+from habit_tracker.models.habit import Habit
+
+@pytest.fixture
+def profiles_dir(store, tmp_path, monkeypatch):
+    """Profiles under tmp_path; use_profile's changes to config are undone afterwards."""
+    monkeypatch.setattr(config, "PROFILES_DIR", tmp_path / "profiles")
+    monkeypatch.setattr(config, "PROFILES_MANIFEST", tmp_path / "profiles.json")
+    monkeypatch.setattr(config, "PROFILE", None)
+    return config.PROFILES_DIR
+
+def add_habit(name):
+    data = data_store.load_habits()
+    data_store.record_events(data, [{"op": "add", "habit": Habit(data_store.get_new_id(data), name)}])
+
+def manifest():
+    return json.loads(config.PROFILES_MANIFEST.read_text(encoding="utf-8"))
+
+# ----- Shards -----
+
+def test_each_profile_has_its_own_shard(profiles_dir, store):
+    profiles.use_profile("alice")
+    add_habit("Run")
+    profiles.use_profile("bob")
+    add_habit("Read")
+
+    shard = "habits.db" if store == "sqlite" else "habits.json"
+    assert config.PROFILE == "bob"
+    assert profiles.shard_paths() == [profiles_dir / "alice" / shard, profiles_dir / "bob" / shard]
+    assert [h.name for h in data_store.load_habits()["habits"]] == ["Read"]
+    profiles.use_profile("alice")
+    assert [h.name for h in data_store.load_habits()["habits"]] == ["Run"]
+
+def test_invalid_names_are_refused(profiles_dir):
+    for name in ("../etc", "", "a b", "-x", "x" * 65):
+        with pytest.raises(ValueError):
+            profiles.use_profile(name)
+    assert not config.PROFILES_MANIFEST.exists()
+
+# ----- Manifest -----
+
+def test_new_profiles_are_added_to_the_manifest(profiles_dir, store):
+    profiles.use_profile("alice")
+    profiles.use_profile("bob")
+    profiles.use_profile("alice")
+
+    listed = manifest()
+    assert listed["version"] == profiles.MANIFEST_VERSION
+    assert sorted(listed["profiles"]) == ["alice", "bob"]
+    assert listed["profiles"]["alice"]["backend"] == store
+
+def test_an_unreadable_manifest_is_rebuilt_from_the_shards(profiles_dir, store):
+    profiles.use_profile("alice")
+    add_habit("Run")
+    config.PROFILES_MANIFEST.write_text("{not json", encoding="utf-8")
+
+    profiles.use_profile("bob")
+
+    assert sorted(manifest()["profiles"]) == ["alice", "bob"]
+    assert [name for name, _ in profiles.list_profiles()] == ["alice", "bob"]
+
+def test_cli_profile_option(profiles_dir, run_cli):
+    assert run_cli("--profile", "carol", "add", "Swim")[0] == 0
+
+    status, out = run_cli("profiles", "--json")
+    assert status == 0 and [p["name"] for p in json.loads(out)] == ["carol"]
+    assert run_cli("--profile", "../carol", "list")[0] == 1
@@ -0,0 +1,57 @@
+import json
+
+from habit_tracker import data_store
+from habit_tracker.models.habit import Habit
+
+def setup_habits(*names):
+    data = data_store.load_habits()
+    data_store.record_events(data, [{"op": "add", "habit": Habit(data_store.get_new_id(data), n)} for n in names])
+    data_store.record_events(data, [
+        {"op": "done", "id": 1, "day": day} for day in ("2025-01-31", "2025-02-01", "2025-02-14", "2025-03-01")
+    ] + [{"op": "done", "id": 2, "day": "2025-02-02"}])
+    return data
+
+# ----- Single-habit queries -----
+
+def test_load_habit(store):
+    data = setup_habits("Run", "Read")
+    data_store.reset_backend()      # a new process: nothing loaded yet
+
+    habit = data_store.load_habit(1)
+
+    assert habit == data.by_id[1]
+    assert habit.revision == data.by_id[1].revision
+    assert data_store.load_habit(9) is None
+
+def test_completions_between(store):
+    setup_habits("Run", "Read")
+    data_store.reset_backend()
+
+    assert data_store.completions_between(1, "2025-02-01", "2025-02-28") == ["2025-02-01", "2025-02-14"]
+    assert data_store.completions_between(1, "2025-03-01", "2025-03-01") == ["2025-03-01"]
+    assert data_store.completions_between(1, "2025-04-01", "2025-12-31") == []
+    assert data_store.completions_between(9, "2025-01-01", "2025-12-31") == []
+
+def test_count_between(store):
+    setup_habits("Run", "Read")
+    data_store.reset_backend()
+
+    assert data_store.count_between(1, "2025-02-01", "2025-02-28") == 2
+    assert data_store.count_between(1, "2025-03-01", "2025-03-01") == 1
+    assert data_store.count_between(2, "2025-01-01", "2025-12-31") == 1
+    assert data_store.count_between(1, "2025-04-01", "2025-12-31") == 0
+    assert data_store.count_between(9, "2025-01-01", "2025-12-31") == 0
+
+def test_cli_show(store, run_cli):
+    setup_habits("Run", "Read")
+    data_store.reset_backend()
+
+    status, out = run_cli("show", 1, "--since", "2025-02-01", "--until", "2025-02-28", "--json")
+    shown = json.loads(out)
+    assert status == 0
+    assert (shown["name"], shown["completions"], shown["completed_days"]) == ("Run", 4, ["2025-02-01", "2025-02-14"])
+
+    assert run_cli("show", 9)[0] == 1
+
+    status, out = run_cli("show", 1, "--since", "2025-02-01", "--count", "--json")
+    assert status == 0 and json.loads(out)["completions_in_range"] == 3
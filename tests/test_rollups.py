@@ -0,0 +1,79 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from habit_tracker import data_store
+from habit_tracker.analysis import statistics
+from habit_tracker.analysis.aggregate import week_key
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData
+from habit_tracker.models.rollups import Rollups
+
+def random_data(seed, habits=6):
+    rng = random.Random(seed)
+    data = HabitData({"next_id": habits + 1, "habits": [Habit(i, f"H{i}") for i in range(1, habits + 1)], "version": 0})
+    start = date(2024, 12, 20)
+    for _ in range(80):
+        habit = data.by_id[rng.randint(1, habits)]
+        data_store.add_completion(data, habit, start + timedelta(days=rng.randrange(40)))
+    return data
+
+# ----- Ranking -----
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ranking_matches_a_sort(seed):
+    data = random_data(seed)
+    data.remove(data.by_id[2])
+    ranked = sorted((len(h.completed_days), h.id) for h in data["habits"])
+
+    assert data.rollups.most_completed() == ranked[-1][1]
+    assert data.rollups.least_completed() == ranked[0][1]
+    assert data.rollups == Rollups.build(data["habits"])
+
+def test_ranking_of_no_habits():
+    rollups = Rollups.build([])
+    assert rollups.most_completed() is rollups.least_completed() is None
+
+# ----- Weekly summary -----
+
+def scanned_weekly_summary(data, first=None, last=None):
+    weeks = {}
+    for habit in data["habits"]:
+        for ordinal in habit.completed_days.ordinals(first, last):
+            in_week = weeks.setdefault(week_key(ordinal), {})
+            in_week[habit.id] = in_week.get(habit.id, 0) + 1
+    return [(week, dict(sorted(weeks[week].items()))) for week in sorted(weeks)]
+
+@pytest.mark.parametrize("since, until", [(None, None), ("2024-12-25", "2025-01-15"), ("2025-01-06", "2025-01-12")])
+def test_weekly_summary_from_the_rollups(since, until):
+    data = random_data(0)
+    first = date.fromisoformat(since).toordinal() if since else None
+    last = date.fromisoformat(until).toordinal() if until else None
+
+    assert list(statistics.rollup_weeks(data, first, last)) == scanned_weekly_summary(data, first, last)
+
+    # Kept up to date once built
+    data_store.add_completion(data, data.by_id[1], "2025-03-03")
+    data.remove(data.by_id[3])
+    data.add(Habit(7, "New"))
+    data_store.add_completion(data, data.by_id[7], "2025-01-07")
+
+    assert list(statistics.rollup_weeks(data, first, last)) == scanned_weekly_summary(data, first, last)
+
+# ----- Storage -----
+
+def test_stored_rollups_are_not_rebuilt_on_load(store, other_process, monkeypatch):
+    data = data_store.load_habits()
+    data_store.record_events(data, [{"op": "add", "habit": Habit(1, "Run")}, {"op": "add", "habit": Habit(2, "Read")}])
+    data_store.record_events(data, [{"op": "done", "id": 1, "day": "2025-01-06"}, {"op": "done", "id": 2, "day": "2025-02-01"}])
+    data_store.record_events(data, [{"op": "delete", "id": 2}, {"op": "done", "id": 1, "day": "2025-01-07"}])
+
+    build = Rollups.build.__func__
+
+    def no_rebuild(cls, habits):
+        assert not habits, "rollups rebuilt on load"      # the JSON journal starts from an empty snapshot
+        return build(cls, habits)
+    monkeypatch.setattr(Rollups, "build", classmethod(no_rebuild))
+
+    assert other_process().load().rollups == data.rollups
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from habit_tracker.analysis import statistics
+from habit_tracker.repository import repository
+from habit_tracker.server import HabitServer
+
+@pytest.fixture
+def serve(store, monkeypatch):
+    """Return a function running test(server, request) against a server on a free port."""
+    monkeypatch.setattr(statistics, "_stats_cache", None)
+    repository.invalidate()
+
+    def run(test):
+        async def main():
+            server = HabitServer()
+            ready = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(server.serve("127.0.0.1", 0, ready.set_result))
+            host, port = await ready
+            try:
+                await test(server, lambda *args, **kwargs: request(host, port, *args, **kwargs))
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        asyncio.run(main())
+
+    yield run
+    repository.invalidate()
+
+async def request(host, port, method, path, body=None):
+    """Send one request; returns (status, decoded JSON body)."""
+    payload = b"" if body is None else json.dumps(body).encode("utf-8")
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+        + payload
+    )
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ")[1]), json.loads(body) if body else None
+
+# ----- Requests -----
+
+def test_habit_lifecycle(serve, load_stored):
+    async def test(server, request):
+        status, habit = await request("POST", "/habits", {"name": "Run", "type": "weekly", "times": 2})
+        assert status == 201 and habit["id"] == 1
+
+        assert (await request("POST", "/habits/1/done", {"date": "2025-01-06"}))[1]["status"] == "marked"
+        assert (await request("POST", "/habits/1/done", {"date": "2025-01-06"}))[1]["status"] == "already_done"
+        assert (await request("PATCH", "/habits/1", {"name": "Jog"}))[1]["name"] == "Jog"
+
+        status, habits = await request("GET", "/habits")
+        assert status == 200 and [h["name"] for h in habits] == ["Jog"]
+        assert (await request("GET", "/habits/1/completions"))[1] == ["2025-01-06"]
+        assert (await request("GET", "/habits/1/completions?from=2025-01-07&count=1"))[1] == {"id": 1, "count": 0}
+
+        assert await request("DELETE", "/habits/1") == (200, {"deleted": 1})
+
+    serve(test)
+    assert load_stored()["habits"] == []
+
+def test_errors(serve):
+    async def test(server, request):
+        await request("POST", "/habits", {"name": "Run"})
+
+        assert (await request("GET", "/habits/9"))[0] == 404
+        assert (await request("POST", "/habits", {"name": "run"}))[0] == 400
+        assert (await request("POST", "/habits/1/done", {"date": "06/01/2025"}))[0] == 400
+        assert (await request("POST", "/habits/1/done", {"date": 20250106}))[0] == 400
+        assert (await request("POST", "/habits/1/done", {"date": ["2025-01-06"]}))[0] == 400
+        assert (await request("PUT", "/habits"))[0] == 405
+        assert (await request("GET", "/nothing"))[0] == 404
+
+    serve(test)
+
+# ----- Storage thread -----
+
+def test_reads_wait_for_a_running_write(serve):
+    async def test(server, request):
+        await request("POST", "/habits", {"name": "Run"})
+        gate = threading.Event()
+
+        def slow_change(data):
+            gate.wait(5)        # e.g. waiting for the file lock held by another process
+            return [{"op": "done", "id": 1, "day": "2025-01-06"}], None
+
+        write = asyncio.create_task(server.write(slow_change))
+        await asyncio.sleep(0.05)
+        read = asyncio.create_task(request("GET", "/habits/1/completions"))
+        await asyncio.sleep(0.05)
+        assert not write.done() and not read.done()     # the event loop is free, the storage thread is not
+
+        gate.set()
+        await write
+        assert (await asyncio.wait_for(read, timeout=2))[1] == ["2025-01-06"]
+
+    serve(test)
+
+def test_data_is_only_used_on_the_storage_thread(serve, monkeypatch):
+    threads = set()
+    get = repository.get
+
+    def recording_get():
+        threads.add(threading.current_thread().name)
+        return get()
+    monkeypatch.setattr(repository, "get", recording_get)
+
+    async def test(server, request):
+        await request("POST", "/habits", {"name": "Run"})
+        await request("POST", "/habits/1/done", {"date": "2025-01-06"})
+        for path in ("/habits", "/habits/1", "/stats/overview", "/stats/streaks", "/stats/weekly"):
+            assert (await request("GET", path))[0] == 200
+
+    serve(test)
+    assert len(threads) == 1 and threads.pop().startswith("habit-storage")
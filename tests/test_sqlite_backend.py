@@ -0,0 +1,72 @@
+import sqlite3
+
+from habit_tracker import data_store
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.streak_state import streak_state
+from habit_tracker.storage.json_backend import JsonBackend
+from habit_tracker.storage.sqlite_backend import SqliteBackend
+
+def summary(data):
+    return data["next_id"], [(h.id, h.name, h.frequency.to_dict(), list(h.completed_days)) for h in data["habits"]]
+
+# ----- Migration -----
+
+OLD_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE habits (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, description TEXT NOT NULL DEFAULT '',
+    frequency_type TEXT NOT NULL, frequency_times INTEGER NOT NULL
+);
+CREATE TABLE completions (
+    habit_id INTEGER NOT NULL REFERENCES habits(id) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    PRIMARY KEY (habit_id, day)
+) WITHOUT ROWID;
+INSERT INTO meta VALUES ('next_id', 3), ('version', 7);
+INSERT INTO habits VALUES (1, 'Run', '', 'daily', 1), (2, 'Read', 'books', 'weekly', 2);
+INSERT INTO completions VALUES (1, '2025-01-06'), (1, '2025-01-07'), (2, '2025-01-08');
+"""
+
+def test_a_database_from_before_streaks_and_revisions_is_migrated(tmp_path):
+    path = tmp_path / "habits.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SCHEMA)
+    conn.close()
+
+    backend = SqliteBackend(path)
+    data = backend.load()
+
+    assert summary(data) == (3, [
+        (1, "Run", {"type": "daily", "times": 1}, ["2025-01-06", "2025-01-07"]),
+        (2, "Read", {"type": "weekly", "times": 2}, ["2025-01-08"]),
+    ])
+    assert data["version"] == 7 and data.by_id[1].revision == 0
+
+    backend.record_events(data, [{"op": "done", "id": 1, "day": "2025-01-08"}])
+    backend.close()
+
+    reopened = SqliteBackend(path)
+    again = reopened.load()
+    columns = {row[1] for row in reopened.connect().execute("PRAGMA table_info(habits)")}
+    reopened.close()
+    assert {"streak", "revision"} <= columns
+    assert summary(again) == summary(data) and streak_state(again.by_id[1]).current == 3
+
+# ----- Legacy JSON import -----
+
+def test_a_new_database_imports_the_json_habits(tmp_path):
+    json_path, journal_path = tmp_path / "habits.json", tmp_path / "habits.journal"
+    legacy = JsonBackend(json_path, journal_path)
+    data = legacy.load()
+    legacy.record_events(data, [{"op": "add", "habit": Habit(1, "Run")}, {"op": "add", "habit": Habit(2, "Read")}])
+    legacy.record_events(data, [{"op": "done", "id": 2, "day": "2025-01-06"}])    # still in the journal
+
+    backend = SqliteBackend(tmp_path / "habits.db", json_path, journal_path)
+    assert summary(backend.load()) == summary(data)
+    backend.close()
+
+    # Only a brand new database is seeded
+    legacy.record_events(data, [{"op": "add", "habit": Habit(data_store.get_new_id(data), "Swim")}])
+    backend = SqliteBackend(tmp_path / "habits.db", json_path, journal_path)
+    assert [h.name for h in backend.load()["habits"]] == ["Run", "Read"]
+    backend.close()
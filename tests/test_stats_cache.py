@@ -0,0 +1,95 @@
+import pytest
+
+from habit_tracker import data_store
+from habit_tracker.analysis import statistics
+from habit_tracker.analysis.cache import StatsCache, data_key, habit_key
+from habit_tracker.models.habit import Habit
+from habit_tracker.models.habit_data import HabitData
+
+@pytest.fixture
+def data():
+    habits = [Habit(1, "Run"), Habit(2, "Read")]
+    return HabitData({"next_id": 3, "habits": habits, "version": 0})
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh in-memory cache used by the statistics functions."""
+    cache = StatsCache(max_entries=16)
+    monkeypatch.setattr(statistics, "_stats_cache", cache)
+    return cache
+
+# ----- Keys -----
+
+def test_habit_key_changes_with_the_habit(data):
+    habit = data.by_id[1]
+    before = habit_key("streaks", habit)
+
+    data_store.add_completion(data, habit, "2025-01-02")
+
+    assert habit_key("streaks", habit) != before
+    assert habit_key("streaks", data.by_id[2]) == habit_key("streaks", data.by_id[2])
+
+def test_data_key_changes_with_any_habit(data):
+    keys = {data_key("weekly", data)}
+
+    data_store.add_completion(data, data.by_id[2], "2025-01-02")
+    keys.add(data_key("weekly", data))
+    data.add(Habit(3, "Swim"))
+    keys.add(data_key("weekly", data))
+    data.remove(data.by_id[1])
+    keys.add(data_key("weekly", data))
+
+    assert len(keys) == 4
+
+# ----- Cache -----
+
+def test_lru_evicts_the_least_recently_used():
+    cache = StatsCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+def test_get_or_compute_only_computes_on_a_miss():
+    cache = StatsCache()
+    calls = []
+    compute = lambda: calls.append(1) or [len(calls)]
+
+    assert cache.get_or_compute("k", compute) == [1]
+    assert cache.get_or_compute("k", compute) == [1]
+    assert cache.info()["hits"] == 1 and cache.info()["misses"] == 1
+
+def test_persisted_entries_survive_a_restart(tmp_path):
+    cache = StatsCache(path=tmp_path / "stats_cache.json")
+    cache.put("k", [1, 2])
+    cache.save()
+
+    restarted = StatsCache(path=tmp_path / "stats_cache.json")
+    restarted.load()
+    assert restarted.get("k") == [1, 2]
+
+# ----- Statistics through the cache -----
+
+def test_streaks_are_recomputed_after_a_completion(data, cache):
+    habit = data.by_id[1]
+    data_store.add_completion(data, habit, "2025-01-02")
+    assert statistics.habit_streaks(habit)[1] == 1
+    assert statistics.habit_streaks(habit)[1] == 1
+    assert cache.info()["hits"] == 1
+
+    data_store.add_completion(data, habit, "2025-01-03")
+
+    assert statistics.habit_streaks(habit)[1] == 2
+
+def test_weekly_summary_is_recomputed_after_a_completion(data, cache):
+    data_store.add_completion(data, data.by_id[1], "2025-01-06")
+    first = statistics.weekly_summary(data)
+    assert statistics.weekly_summary(data) == first
+    assert cache.info()["hits"] == 1
+
+    data_store.add_completion(data, data.by_id[2], "2025-01-07")
+
+    assert statistics.weekly_summary(data) == {label: {1: 1, 2: 1} for label in first}
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from habit_tracker import config, data_store
+from habit_tracker.models.habit import Habit
+from habit_tracker.repository import HabitRepository
+
+@pytest.fixture
+def repository(store):
+    """A repository in write-behind mode (without the exit and signal hooks of start_write_behind)."""
+    repository = HabitRepository()
+    repository.write_behind = True
+    yield repository
+    repository.invalidate()
+
+def add_event(data, name):
+    return {"op": "add", "habit": Habit(data_store.get_new_id(data), name)}
+
+def summary(data):
+    return data["version"], data["next_id"], [(h.id, h.name, h.description, list(h.completed_days)) for h in data["habits"]]
+
+# ----- Pending changes -----
+
+def test_changes_are_stored_on_flush(repository, load_stored):
+    data = repository.get()
+    repository.record(add_event(data, "Run"))
+    repository.record({"op": "done", "id": 1, "day": "2025-01-02"})
+
+    assert [h.name for h in data["habits"]] == ["Run"]      # applied in memory at once
+    assert load_stored()["habits"] == []
+
+    repository.flush()
+
+    assert summary(load_stored()) == summary(data)
+    assert data["version"] == 2
+
+def test_flush_when_enough_changes_are_pending(repository, load_stored, monkeypatch):
+    monkeypatch.setattr(config, "WRITE_BEHIND_MAX_EVENTS", 3)
+    data = repository.get()
+    repository.record(add_event(data, "Run"))
+    repository.record({"op": "done", "id": 1, "day": "2025-01-02"})
+    assert load_stored()["habits"] == []
+
+    repository.record({"op": "done", "id": 1, "day": "2025-01-03"})
+
+    assert summary(load_stored()) == summary(data)
+
+def test_flush_when_the_oldest_change_is_due_while_idle(repository, load_stored, monkeypatch):
+    monkeypatch.setattr(config, "WRITE_BEHIND_MAX_SECONDS", 0.05)
+    data = repository.get()
+    repository.record(add_event(data, "Run"))
+
+    # No further get() or record(): the timer stores it
+    deadline = time.monotonic() + 5
+    while not load_stored()["habits"] and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert summary(load_stored()) == summary(data)
+
+def test_redundant_changes_are_coalesced(repository, load_stored):
+    data = repository.get()
+    repository.record_many([
+        add_event(data, "Run"),
+        {"op": "edit", "id": 1, "name": "Jog", "description": "first"},
+        {"op": "edit", "id": 1, "name": "Walk", "description": "second"},
+        add_event(data, "Read"),
+        {"op": "done", "id": 2, "day": "2025-01-02"},
+        {"op": "delete", "id": 2},
+    ])
+    repository.flush()
+
+    # The add and the last edit of habit 1; of habit 2 only that its ID was used
+    assert data["version"] == 3
+    assert [(h.id, h.name, h.description) for h in data["habits"]] == [(1, "Walk", "second")]
+    assert summary(load_stored()) == summary(data)
+    assert data["next_id"] == 3
+
+def test_coalesce_keeps_the_order_of_what_remains():
+    events = [
+        {"op": "add", "habit": {"id": 1, "name": "Run"}},
+        {"op": "edit", "id": 1, "name": "Jog", "description": ""},
+        {"op": "done", "id": 1, "day": "2025-01-02"},
+        {"op": "edit", "id": 1, "name": "Walk", "description": ""},
+    ]
+    assert data_store.coalesce_events(events) == [events[0], events[2], events[3]]
+
+    events.append({"op": "delete", "id": 1})
+    assert data_store.coalesce_events(events) == [{"op": "reserve", "next_id": 2}]
+
+# ----- Another process writing meanwhile -----
+
+def test_flush_merges_and_renumbers(repository, other_process, load_stored):
+    data = repository.get()
+    repository.record(add_event(data, "Read"))
+    repository.record({"op": "done", "id": 1, "day": "2025-01-02"})
+
+    other = other_process()
+    theirs = other.load()
+    other.record_events(theirs, [add_event(theirs, "Run")])
+
+    repository.flush()
+
+    assert [(h.id, h.name) for h in data["habits"]] == [(1, "Run"), (2, "Read")]
+    assert list(data.by_id[2].completed_days) and not list(data.by_id[1].completed_days)
+    assert data["next_id"] == 3
+    assert summary(load_stored()) == summary(data)
+
+def test_get_stores_pending_changes_before_taking_in_other_writes(repository, other_process, load_stored):
+    data = repository.get()
+    repository.record(add_event(data, "Read"))
+
+    other = other_process()
+    theirs = other.load()
+    other.record_events(theirs, [add_event(theirs, "Run")])
+
+    assert repository.get() is data
+    assert [(h.id, h.name) for h in data["habits"]] == [(1, "Run"), (2, "Read")]
+    assert summary(load_stored()) == summary(data)
+
+    # Nothing is left pending, so the next flush stores nothing again
+    version = data["version"]
+    repository.flush()
+    assert load_stored()["version"] == version